@@ -0,0 +1 @@
+"""Offline benchmarks for parts of Cozy."""
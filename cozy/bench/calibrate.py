@@ -0,0 +1,276 @@
+"""Measure the constant factors of the cost model on this machine.
+
+Usage:
+
+    python3 -m cozy.bench.calibrate [-o FILE] [--size N] [--scan-cost K]
+
+The cost model (cozy.cost_model.rt) charges a fixed amount for each kind of
+primitive operation: evaluating an expression node, visiting an element of a
+collection, hashing a map key, and so on.  This tool measures how long those
+primitives actually take.  It builds one small data structure whose queries
+each exercise one primitive (a vector scan, a filter, a map lookup, a heap
+peek, ...), generates code for it with the same code generator that Cozy
+uses for real specifications, and times each query.
+
+Since `rt` is a sum of (known) counts times (unknown) constants, each
+measured query pins down one more constant.  The constants are reported in
+units where visiting one element of a collection costs K (--scan-cost), and
+are written as a JSON file that can be passed to Cozy with --cost-calibration.
+Simple expression nodes often compile to nearly nothing, so every node is
+charged at least 1.  The "extreme" constant is the cost of building a map of
+N (--size) elements at runtime.
+
+C++ kernels are compiled with --cxx (default: g++) and also determine the
+storage sizes of primitive types.
+"""
+
+import argparse
+from collections import defaultdict
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from cozy import codegen
+from cozy import cost_model
+from cozy.desugar import desugar
+from cozy.evaluation import eval
+from cozy.parse import parse_spec
+from cozy.structures.heaps import TMinHeap, EMakeMinHeap, EHeapPeek2
+from cozy.syntax_tools import mk_lambda, unpack_representation, inline_calls
+from cozy.synthesis.impls import construct_initial_implementation
+from cozy.target_syntax import *
+from cozy.typecheck import typecheck
+from cozy.value_types import Bag
+
+KERNEL_SPEC = """
+Kernels:
+    state xs : Bag<Int>
+    query node(x : Int)
+        x + 1
+    query scan(x : Int)
+        sum xs
+    query map(x : Int)
+        sum [y + 1 | y <- xs]
+    query filter(x : Int)
+        len [y | y <- xs, y == x]
+    query lookup(x : Int)
+        x
+    query peek(x : Int)
+        x
+    query build(x : Int)
+        x
+"""
+
+# Each kernel, in order, with the constant it measures.  The cost of each
+# kernel may only depend on constants measured by earlier kernels.
+KERNELS = (
+    ("node",   "node"),
+    ("scan",   "scan"),
+    ("map",    "iteration"),
+    ("filter", "comparison"),
+    ("lookup", "hash"),
+    ("peek",   "heap"),
+    ("build",  "extreme"))
+
+RUNTIME_CONSTANTS = tuple(c for (k, c) in KERNELS)
+
+def kernel_expressions(xs : EVar, x : EVar) -> {str : Exp}:
+    """The body of each kernel as it would appear in a synthesized query."""
+    sxs = EStateVar(xs).with_type(xs.type)
+    y = EVar("y").with_type(INT)
+    m = EMakeMap2(xs, mk_lambda(INT, lambda k: k)).with_type(TMap(INT, INT))
+    h = EMakeMinHeap(xs, mk_lambda(INT, lambda k: k)).with_type(TMinHeap(INT, INT))
+    return {
+        "node"   : EBinOp(x, "+", ONE).with_type(INT),
+        "scan"   : EUnaryOp(UOp.Sum, sxs).with_type(INT),
+        "map"    : EUnaryOp(UOp.Sum, EMap(sxs, ELambda(y, EBinOp(y, "+", ONE).with_type(INT))).with_type(INT_BAG)).with_type(INT),
+        "filter" : ELen(EFilter(sxs, ELambda(y, EEq(y, x))).with_type(INT_BAG)),
+        "lookup" : EMapGet(EStateVar(m).with_type(m.type), x).with_type(INT),
+        "peek"   : EHeapPeek2(EStateVar(h).with_type(h.type), EStateVar(ELen(xs)).with_type(INT)).with_type(INT),
+        "build"  : EMapGet(EMakeMap2(sxs, mk_lambda(INT, lambda k: k)).with_type(m.type), x).with_type(INT) }
+
+def kernel_implementation():
+    """Build the Implementation whose queries are the kernels."""
+    spec = parse_spec(KERNEL_SPEC)
+    errs = typecheck(spec)
+    assert not errs, errs
+    spec = desugar(spec)
+    impl = construct_initial_implementation(spec)
+    xs = impl.abstract_state[0]
+    x = EVar("x").with_type(INT)
+    exps = kernel_expressions(xs, x)
+    for q in impl.query_specs:
+        rep, ret = unpack_representation(exps[q.name])
+        impl.set_impl(q, rep, ret)
+    return impl, exps
+
+def generate_code(impl) -> str:
+    out = io.StringIO()
+    printer = codegen.CxxPrinter(out=out)
+    printer.visit(inline_calls(impl.code), impl.concretization_functions, defaultdict(list), abstract_state=impl.spec.statevars)
+    return out.getvalue()
+
+CXX_HARNESS = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <string>
+#include <vector>
+#include "kernels.h"
+
+enum CalibrationEnum { A, B, C };
+
+static std::vector<int> inputs;
+static volatile long sink;
+
+template <class F>
+static double time_per_call(F f, double min_seconds) {
+    for (long calls = 1; ; calls *= 2) {
+        long acc = 0;
+        auto start = std::chrono::steady_clock::now();
+        for (long i = 0; i < calls; ++i) acc += f(inputs[i & 1023]);
+        double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+        sink = acc;
+        if (elapsed >= min_seconds) return elapsed * 1e9 / calls;
+    }
+}
+
+template <class F>
+static void report(const char* name, F f, int repeat, double min_seconds) {
+    double best = time_per_call(f, min_seconds);
+    for (int i = 1; i < repeat; ++i) {
+        double t = time_per_call(f, min_seconds);
+        if (t < best) best = t;
+    }
+    std::printf("time %s %f\\n", name, best);
+}
+
+int main(int argc, char** argv) {
+    int n = std::atoi(argv[1]);
+    int repeat = std::atoi(argv[2]);
+    double min_seconds = std::atof(argv[3]);
+    std::vector<int> xs;
+    for (int i = 0; i < n; ++i) xs.push_back(i);
+    for (int i = 0; i < 1024; ++i) inputs.push_back((int)((i * 7919L) % n));
+    Kernels k(xs);
+    std::printf("size bool_size %zu\\n", sizeof(bool));
+    std::printf("size int_size %zu\\n", sizeof(int));
+    std::printf("size enum_size %zu\\n", sizeof(CalibrationEnum));
+    std::printf("size string_size %zu\\n", sizeof(std::string));
+    std::printf("size pointer_size %zu\\n", sizeof(void*));
+    std::printf("size collection_size %zu\\n", sizeof(std::vector<int>));
+    report("baseline", [&](int x) { return (long)x; }, repeat, min_seconds);
+$CALLS
+    return 0;
+}
+"""
+
+def run_cxx(code : str, size : int, repeat : int, min_seconds : float, cxx : str = "g++") -> str:
+    """Compile and run the C++ timing harness; return its output."""
+    calls = "\n".join(
+        "    report(\"{k}\", [&](int x) {{ return (long)k.{k}(x); }}, repeat, min_seconds);".format(k=k)
+        for (k, c) in KERNELS)
+    with tempfile.TemporaryDirectory() as d:
+        with open(os.path.join(d, "kernels.h"), "w") as f:
+            f.write(code)
+        with open(os.path.join(d, "main.cpp"), "w") as f:
+            f.write(CXX_HARNESS.replace("$CALLS", calls))
+        exe = os.path.join(d, "main")
+        subprocess.run([cxx, "-std=c++11", "-O2", "-o", exe, os.path.join(d, "main.cpp")], check=True)
+        return subprocess.run([exe, str(size), str(repeat), str(min_seconds)], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+def parse_output(output : str) -> ({str : float}, {str : int}):
+    """Split the harness output into times (ns per call) and storage sizes."""
+    times = { }
+    sizes = { }
+    for line in output.splitlines():
+        words = line.split()
+        if len(words) != 3:
+            continue
+        if words[0] == "time":
+            times[words[1]] = float(words[2])
+        elif words[0] == "size":
+            sizes[words[1]] = int(words[2])
+    return times, sizes
+
+def cost_coefficients(exps : {str : Exp}, xs : EVar, size : int, sizes : {str : int}) -> {str : {str : int}}:
+    """Find how much each constant contributes to the predicted cost of each kernel.
+
+    Returns a map from kernel name to constant name to the number of times
+    `rt` charges that constant for the kernel, when the kernel runs on a
+    collection of the given size.
+    """
+    env = { xs.id : Bag(range(size)), "x" : 0 }
+    res = defaultdict(dict)
+    for c in RUNTIME_CONSTANTS:
+        basis = { c2 : 1 if c2 == c else 0 for c2 in RUNTIME_CONSTANTS }
+        basis.update(sizes)
+        with cost_model.calibrated(basis):
+            for k, e in exps.items():
+                res[k][c] = eval(cost_model.rt(e), env)
+    return res
+
+def solve(times : {str : float}, coefficients : {str : {str : int}}) -> {str : float}:
+    """Compute the cost (in ns) of each constant from the kernel timings.
+
+    Each kernel in KERNELS determines one constant, using the values of the
+    constants determined before it.
+    """
+    res = { }
+    for k, c in KERNELS:
+        coefs = coefficients[k]
+        for c2, n in coefs.items():
+            if n and c2 not in res and c2 != c:
+                raise ValueError("kernel {} depends on {} before it is measured".format(k, c2))
+        if not coefs[c]:
+            raise ValueError("kernel {} does not measure {}".format(k, c))
+        known = sum(n * res[c2] for (c2, n) in coefs.items() if c2 in res)
+        res[c] = max(0.0, (times[k] - times.get("baseline", 0.0) - known) / coefs[c])
+    return res
+
+def to_calibration(ns : {str : float}, sizes : {str : int}, scan_cost : int) -> {str : int}:
+    """Scale constants so that visiting one element costs `scan_cost`."""
+    unit = ns["scan"] / scan_cost if ns["scan"] > 0 else 1.0
+    res = { c : int(round(t / unit)) for (c, t) in ns.items() }
+    res["scan"] = scan_cost
+    res["node"] = max(res["node"], 1)
+    res["extreme"] = max(res["extreme"], 1)
+    res.update(sizes)
+    return res
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the constant factors of Cozy's cost model.")
+    parser.add_argument("-o", "--output", metavar="FILE", default="cost-calibration.json", help="Where to write the calibration; default=cost-calibration.json")
+    parser.add_argument("--cxx", metavar="CXX", default="g++", help="C++ compiler to use; default=g++")
+    parser.add_argument("--size", metavar="N", type=int, default=1000, help="Number of elements in the measured collections; default=1000")
+    parser.add_argument("--repeat", metavar="R", type=int, default=5, help="Time each kernel R times and keep the fastest; default=5")
+    parser.add_argument("--min-time", metavar="SECONDS", type=float, default=0.05, help="Minimum duration of each timing run; default=0.05")
+    parser.add_argument("--scan-cost", metavar="K", type=int, default=10, help="Cost of visiting one element of a collection in the output; default=10")
+    args = parser.parse_args(argv)
+
+    if shutil.which(args.cxx) is None:
+        parser.error("C++ compiler {!r} not found".format(args.cxx))
+
+    impl, exps = kernel_implementation()
+    code = generate_code(impl)
+    output = run_cxx(code, args.size, args.repeat, args.min_time, cxx=args.cxx)
+    times, sizes = parse_output(output)
+
+    coefficients = cost_coefficients(exps, impl.abstract_state[0], args.size, sizes)
+    ns = solve(times, coefficients)
+    res = to_calibration(ns, sizes, args.scan_cost)
+
+    for k, c in KERNELS:
+        print("  {:8}{:12.1f} ns/call  {:12}{:.2f} ns = {}".format(k, times[k], c, ns[c], res[c]))
+    with open(args.output, "w") as f:
+        json.dump(res, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print("Wrote {}".format(args.output))
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Re-run a corpus of solver queries captured with --solver-trace.
+
+Usage:
+
+    python3 -m cozy.bench.solver_replay [--smtlib] [--top N] DIR...
+
+By default each query is re-encoded from its Cozy formula with the current
+version of cozy.solver, so the effect of changes to ToZ3 can be measured
+without running synthesis.  Cozy's internal options (e.g.
+--collection-depth) are accepted and affect the encoding.  With --smtlib the
+captured SMT-LIB text is handed to Z3 directly instead, which measures Z3
+alone.
+
+The tool reports the total time taken, the slowest queries, and any query
+whose answer differs from the one in the trace.
+"""
+
+import argparse
+import time
+
+import z3
+
+from cozy import opts
+from cozy import solver
+from cozy.solver_trace import load_records, load_query, load_smtlib
+
+def replay_smtlib(directory : str, record : dict) -> (str, float, float):
+    """Check the captured SMT-LIB text of a query.
+
+    Returns the result ("sat", "unsat", or "unknown"), the time taken to
+    parse the query, and the time taken to solve it.
+    """
+    ctx = z3.Context()
+    logic = record.get("logic")
+    s = z3.Solver(ctx=ctx) if logic is None else z3.SolverFor(logic, ctx=ctx)
+    if record.get("timeout") is not None:
+        s.set("timeout", int(record["timeout"] * 1000))
+    text = load_smtlib(directory, record)
+    start = time.perf_counter()
+    s.from_string(text)
+    parsed = time.perf_counter()
+    res = s.check()
+    done = time.perf_counter()
+    return (str(res), parsed - start, done - parsed)
+
+def replay_query(directory : str, record : dict) -> (str, float, float):
+    """Encode and check a query with the current solver.
+
+    Returns the result ("sat", "unsat", or "unknown"), the time taken to
+    encode the query, and the time taken to solve it.
+    """
+    query = load_query(directory, record)
+    s = solver.IncrementalSolver(
+        vars             = query["vars"],
+        funcs            = query["funcs"],
+        collection_depth = record["collection_depth"],
+        logic            = record.get("logic"),
+        timeout          = record.get("timeout"),
+        validate_model   = False)
+    for a in query["assumptions"]:
+        s.add_assumption(a)
+    start = time.perf_counter()
+    a = s._convert(query["formula"])
+    encoded = time.perf_counter()
+    s.z3_solver.add(a)
+    res = s.z3_solver.check()
+    done = time.perf_counter()
+    return (str(res), encoded - start, done - encoded)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay solver queries captured with --solver-trace.")
+    parser.add_argument("--smtlib", action="store_true", help="Replay the captured SMT-LIB text instead of re-encoding each query")
+    parser.add_argument("--top", metavar="N", type=int, default=10, help="Number of slowest queries to list; default=10")
+    opts.setup(parser.add_argument_group("Internal parameters"))
+    parser.add_argument("dirs", metavar="DIR", nargs="+", help="Trace directories")
+    args = parser.parse_args(argv)
+    opts.read(args)
+
+    replay = replay_smtlib if args.smtlib else replay_query
+    rows = []
+    mismatches = 0
+    for directory in args.dirs:
+        for record in load_records(directory):
+            res, encode_time, solve_time = replay(directory, record)
+            if res != record["result"] and "unknown" not in (res, record["result"]):
+                print("MISMATCH: {} was {}, now {}".format(record["id"], record["result"], res))
+                mismatches += 1
+            rows.append((encode_time + solve_time, encode_time, solve_time, res, record))
+
+    recorded = sum(r["encode_time"] + r["solve_time"] for (_, _, _, _, r) in rows)
+    replayed = sum(total for (total, _, _, _, _) in rows)
+    print("Replayed {} queries in {:.3f}s (recorded: {:.3f}s)".format(len(rows), replayed, recorded))
+    print("  {:8}{:.3f}s".format("parse:" if args.smtlib else "encode:", sum(encode_time for (_, encode_time, _, _, _) in rows)))
+    print("  {:8}{:.3f}s".format("solve:", sum(solve_time for (_, _, solve_time, _, _) in rows)))
+    print("Slowest queries:")
+    for (total, encode_time, solve_time, res, record) in sorted(rows, key=lambda row: row[0], reverse=True)[:args.top]:
+        print("  {:8.3f}s  {:16} {:7} size={} cse_size={} [{}]".format(
+            total, record["id"], res, record["size"], record["cse_size"],
+            ", ".join(record["tasks"])))
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
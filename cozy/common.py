@@ -127,6 +127,10 @@ def _size(x):
         x = wq.pop()
         res += 1
         if isinstance(x, ADT):
+            cached = x._cached_size
+            if cached is not None:
+                res += cached - 1
+                continue
             wq.extend(x.children())
         elif isinstance(x, list) or isinstance(x, tuple):
             wq.extend(x)
@@ -207,8 +211,22 @@ class ADT(object):
 
     See also:
         - Visitor
+        - syntax_tools.hash_cons, which produces shared ("interned") ADTs
+          that remember their size and free variables
     """
 
+    # Interned ADTs must never be modified.  These attributes are set on them
+    # by `syntax_tools.hash_cons`.
+    _interned = False
+    _cached_size = None
+    _cached_free_vars = None
+
+    # Memoized by `syntax_tools.alpha_hash`.
+    _alpha_hash = None
+
+    # Costs of interned ADTs, memoized by `cost_model`.
+    _cost_cache = None
+
     def children(self):
         return ()
     def size(self):
@@ -245,8 +263,9 @@ class ADT(object):
         return self._hash
     def __getstate__(self):
         d = dict(self.__dict__)
-        if "_hash" in d:
-            del d["_hash"]
+        for a in ("_hash", "_alpha_hash", "_cost_cache", "_interned", "_cached_size", "_cached_free_vars"):
+            if a in d:
+                del d[a]
         if hasattr(self, "__slots__"):
             for a in self.__slots__:
                 d[a] = getattr(self, a)
@@ -256,7 +275,10 @@ class ADT(object):
             setattr(self, k, v)
     def __eq__(self, other):
         if self is other: return True
-        return type(self) is type(other) and self.children() == other.children()
+        if type(self) is not type(other): return False
+        # interned ADTs have cached hashes, so this check is cheap
+        if self._interned and other._interned and hash(self) != hash(other): return False
+        return self.children() == other.children()
     def __ne__(self, other):
         return not self.__eq__(other)
     def __lt__(self, other):
@@ -294,6 +316,10 @@ class FrozenDict(_FrozenDict):
     def __repr__(self):
         return "FrozenDict({!r})".format(list(self.items()))
 
+    def __reduce__(self):
+        # the underlying implementation is not pickle-able on its own
+        return (type(self), (list(self.items()),))
+
 _name_counter = Value(ctypes.c_uint64, 0)
 
 def fresh_name(hint : str = "name", omit : {str} = ()) -> str:
@@ -1,9 +1,13 @@
 """Static cost model to order expressions."""
 
 from collections import OrderedDict
+from contextlib import contextmanager
 from enum import Enum
+from functools import wraps
+import itertools
+import json
 
-from cozy.common import OrderedSet
+from cozy.common import OrderedSet, FrozenDict
 from cozy.target_syntax import *
 from cozy.syntax_tools import pprint, fresh_var, free_vars, free_funcs, all_exps, alpha_equivalent, mk_lambda, map_value_func
 from cozy.contexts import Context
@@ -12,6 +16,7 @@ from cozy.pools import Pool, RUNTIME_POOL
 from cozy.solver import ModelCachingSolver
 from cozy.evaluation import eval, eval_bulk
 from cozy.structures import extension_handler
+from cozy.structures.heaps import EHeapPeek, EHeapPeek2
 from cozy.logging import task, event
 from cozy.state_maintenance import mutate
 from cozy.polynomials import Polynomial, DominantTerm
@@ -23,7 +28,17 @@ cost_model_selection = Option("cost-model", int, 2,
         + "0: optimize for expression size.  "
         + "1: optimize for asymptotic runtime.  "
         + "2: optimize for a mix of asymptotic runtime, storage size, and exact runtime.  "
-        + "3: optimize for a mix of asymptotic runtime and state maintenance cost.")
+        + "3: optimize for a mix of asymptotic runtime and state maintenance cost.  "
+        + "4: optimize for expected cost per call under the workload profile (see --workload).")
+memoize_costs = Option("memoize-costs", bool, True,
+    description="Remember the costs computed for interned expressions.")
+sample_costs = Option("cost-model-sampling", bool, True,
+    description="Compare costs on cached examples and random inputs before asking the solver.")
+comparison_cache_size = Option("cost-comparison-cache-size", int, 100000, metavar="N",
+    description="Number of cost comparisons each cost model remembers (0 to disable).")
+cost_calibration = Option("cost-calibration", str, "", metavar="FILE",
+    description="JSON file of measured constant factors for the cost model "
+        + "(see cozy.bench.calibrate). Leave empty to use the built-in estimates.")
 
 class Order(Enum):
     EQUAL     = "="
@@ -117,7 +132,9 @@ class CostModel(object):
             examples                = (),
             funcs                   = (),
             freebies        : [Exp] = [],
-            ops             : [Op]  = []):
+            ops             : [Op]  = [],
+            frequencies     : {str:int} = {},
+            query           : str   = None):
         """
         assumptions : assumed to be true when comparing expressions
         examples    : initial examples (the right set of examples can speed up
@@ -127,6 +144,10 @@ class CostModel(object):
         freebies    : state variables that can be used for free
         ops         : mutators which are used to determine how expensive it is
                       to maintain a state variable
+        frequencies : how often each query and op is called (methods that are
+                      missing are called once; see cozy.workload)
+        query       : the name of the query whose implementations are being
+                      compared, for looking up its frequency
         """
         self.solver = ModelCachingSolver(vars=(), funcs=funcs, examples=examples, assumptions=assumptions)
         self.assumptions = assumptions
@@ -134,14 +155,22 @@ class CostModel(object):
         self.funcs = OrderedDict(funcs)
         self.ops = ops
         self.freebies = freebies
+        self.frequencies = dict(frequencies)
+        self.query = query
+        self._orders = { }       # (e1, e2, context, pool, selection, calibration) -> Order
+        self._order_graph = { }  # (context, pool, selection, calibration) -> e1 -> e2 -> Order
+        self.order_cache_hits = 0
+        self.order_inferences = 0
 
     def __repr__(self):
-        return "CostModel(assumptions={!r}, examples={!r}, funcs={!r}, freebies={!r}, ops={!r})".format(
+        return "CostModel(assumptions={!r}, examples={!r}, funcs={!r}, freebies={!r}, ops={!r}, frequencies={!r}, query={!r})".format(
             self.assumptions,
             self.examples,
             self.funcs,
             self.freebies,
-            self.ops)
+            self.ops,
+            self.frequencies,
+            self.query)
 
     @property
     def examples(self):
@@ -160,8 +189,24 @@ class CostModel(object):
             return Order.EQUAL
 
         path_condition = EAll(context.path_conditions())
-        always_le = self.solver.valid(EImplies(path_condition, ELe(e1, e2)))
-        always_ge = self.solver.valid(EImplies(path_condition, EGe(e1, e2)))
+        le = EImplies(path_condition, ELe(e1, e2))
+        ge = EImplies(path_condition, EGe(e1, e2))
+        always_le = always_ge = None
+        if sample_costs.value:
+            # A single input where e1 costs more (or less) than e2 settles
+            # that half of the comparison without a proof.
+            if self.solver.satisfy_cheaply(ENot(le)) is not None:
+                always_le = False
+            if self.solver.satisfy_cheaply(ENot(ge)) is not None:
+                always_ge = False
+            if always_le is False and always_ge is False:
+                event("sampled inputs show the costs are incomparable")
+                return Order.AMBIGUOUS
+        results = iter(self.solver.valid_all([f for (f, known) in ((le, always_le), (ge, always_ge)) if known is None]))
+        if always_le is None:
+            always_le = next(results)
+        if always_ge is None:
+            always_ge = next(results)
 
         if always_le and always_ge:
             return Order.EQUAL
@@ -172,74 +217,313 @@ class CostModel(object):
         return Order.AMBIGUOUS
 
     def compare(self, e1 : Exp, e2 : Exp, context : Context, pool : Pool) -> Order:
+        """Compare the costs of two expressions.
+
+        Results are remembered.  Since costs are partially ordered, a new
+        comparison can often be answered by chaining together known ones
+        (e.g. e1 < e2 and e2 = e3 imply e1 < e3) without calling the solver.
+        """
         with task("compare costs", context=context):
-            selection = cost_model_selection.value
-            if selection == 0:
+            if comparison_cache_size.value <= 0:
+                return self._compare_costs(e1, e2, context, pool)
+            cls = (context, pool, cost_model_selection.value, calibration())
+            key = (e1, e2) + cls
+            res = self._orders.get(key)
+            if res is not None:
+                self.order_cache_hits += 1
+                return res
+            res = self._infer_order(e1, e2, cls)
+            if res is not None:
+                self.order_inferences += 1
+                event("inferred cost ordering {} by transitivity".format(res.value))
+            else:
+                res = self._compare_costs(e1, e2, context, pool)
+            if len(self._orders) > comparison_cache_size.value:
+                self._orders.clear()
+                self._order_graph.clear()
+            self._orders[key] = res
+            self._orders[(e2, e1) + cls] = Order.flip(res)
+            if res != Order.AMBIGUOUS:
+                graph = self._order_graph.setdefault(cls, { })
+                graph.setdefault(e1, { })[e2] = res
+                graph.setdefault(e2, { })[e1] = Order.flip(res)
+            return res
+
+    # Bound on the number of known comparisons to look at when inferring an
+    # ordering.
+    _MAX_INFERENCE_STEPS = 1000
+
+    def _infer_order(self, e1 : Exp, e2 : Exp, cls) -> Order:
+        """Derive the ordering of e1 and e2 from known comparisons.
+
+        Returns None if the known comparisons do not determine it.
+        """
+        graph = self._order_graph.get(cls)
+        if graph is None or e1 not in graph or e2 not in graph:
+            return None
+        # If e1 reaches e2 through known "=" edges, they are equal.  If it
+        # reaches e2 through "<" and "=" edges, one of them must be "<".
+        for follow, result in (
+                ((Order.EQUAL,),          Order.EQUAL),
+                ((Order.LT, Order.EQUAL), Order.LT),
+                ((Order.GT, Order.EQUAL), Order.GT)):
+            seen = { e1 }
+            stk = [e1]
+            while stk and len(seen) < self._MAX_INFERENCE_STEPS:
+                x = stk.pop()
+                for y, order in graph[x].items():
+                    if order in follow and y not in seen:
+                        if y == e2:
+                            return result
+                        seen.add(y)
+                        stk.append(y)
+        return None
+
+    def _compare_costs(self, e1 : Exp, e2 : Exp, context : Context, pool : Pool) -> Order:
+        selection = cost_model_selection.value
+        if selection == 0:
+            return order_objects(e1.size(), e2.size())
+        if selection == 1:
+            if pool == RUNTIME_POOL:
+                return prioritized_order(
+                    lambda: order_objects(polynomial_runtime(e1), polynomial_runtime(e2)),
+                    lambda: order_objects(e1.size(), e2.size()))
+            else:
                 return order_objects(e1.size(), e2.size())
-            if selection == 1:
-                if pool == RUNTIME_POOL:
-                    return prioritized_order(
-                        lambda: order_objects(polynomial_runtime(e1), polynomial_runtime(e2)),
-                        lambda: order_objects(e1.size(), e2.size()))
-                else:
-                    return order_objects(e1.size(), e2.size())
-            if selection == 2:
-                if pool == RUNTIME_POOL:
-                    return prioritized_order(
-                        lambda: order_objects(asymptotic_runtime(e1), asymptotic_runtime(e2)),
-                        lambda: self._compare(max_storage_size(e1, self.freebies), max_storage_size(e2, self.freebies), context),
-                        lambda: self._compare(rt(e1), rt(e2), context),
-                        lambda: order_objects(e1.size(), e2.size()))
-                else:
-                    return prioritized_order(
-                        lambda: self._compare(storage_size(e1, self.freebies), storage_size(e2, self.freebies), context),
-                        lambda: order_objects(e1.size(), e2.size()))
-            if selection == 3:
-                if pool == RUNTIME_POOL:
-                    return prioritized_order(
-                        lambda: order_objects(asymptotic_runtime(e1), asymptotic_runtime(e2)),
-                        lambda: unprioritized_order(
-                            lambda: prioritized_order(
-                                lambda: self._compare(
-                                    max_storage_size(e1, self.freebies),
-                                    max_storage_size(e2, self.freebies), context),
-                                lambda: self._compare(rt(e1), rt(e2), context)),
-                            *[lambda op=op: self._compare(
-                                maintenance_cost(e1, op, self.freebies),
-                                maintenance_cost(e2, op, self.freebies),
-                                context) for op in self.ops]),
-                        lambda: order_objects(e1.size(), e2.size()))
-                else:
-                    return prioritized_order(
-                        lambda: self._compare(storage_size(e1, self.freebies), storage_size(e2, self.freebies), context),
-                        lambda: order_objects(e1.size(), e2.size()))
-            raise ValueError("illegal value for --{}: {}".format(cost_model_selection.name, selection))
+        if selection == 2:
+            if pool == RUNTIME_POOL:
+                return prioritized_order(
+                    lambda: order_objects(asymptotic_runtime(e1), asymptotic_runtime(e2)),
+                    lambda: self._compare(max_storage_size(e1, self.freebies), max_storage_size(e2, self.freebies), context),
+                    lambda: self._compare(rt(e1), rt(e2), context),
+                    lambda: order_objects(e1.size(), e2.size()))
+            else:
+                return prioritized_order(
+                    lambda: self._compare(storage_size(e1, self.freebies), storage_size(e2, self.freebies), context),
+                    lambda: order_objects(e1.size(), e2.size()))
+        if selection == 3:
+            if pool == RUNTIME_POOL:
+                return prioritized_order(
+                    lambda: order_objects(asymptotic_runtime(e1), asymptotic_runtime(e2)),
+                    lambda: unprioritized_order(
+                        lambda: prioritized_order(
+                            lambda: self._compare(
+                                max_storage_size(e1, self.freebies),
+                                max_storage_size(e2, self.freebies), context),
+                            lambda: self._compare(rt(e1), rt(e2), context)),
+                        *[lambda op=op: self._compare(
+                            maintenance_cost(e1, op, self.freebies),
+                            maintenance_cost(e2, op, self.freebies),
+                            context) for op in self.ops]),
+                    lambda: order_objects(e1.size(), e2.size()))
+            else:
+                return prioritized_order(
+                    lambda: self._compare(storage_size(e1, self.freebies), storage_size(e2, self.freebies), context),
+                    lambda: order_objects(e1.size(), e2.size()))
+        if selection == 4:
+            if pool == RUNTIME_POOL:
+                return prioritized_order(
+                    lambda: self._compare(self.expected_cost(e1), self.expected_cost(e2), context),
+                    lambda: order_objects(asymptotic_runtime(e1), asymptotic_runtime(e2)),
+                    lambda: self._compare(max_storage_size(e1, self.freebies), max_storage_size(e2, self.freebies), context),
+                    lambda: order_objects(e1.size(), e2.size()))
+            else:
+                return prioritized_order(
+                    lambda: self._compare(storage_size(e1, self.freebies), storage_size(e2, self.freebies), context),
+                    lambda: order_objects(e1.size(), e2.size()))
+        raise ValueError("illegal value for --{}: {}".format(cost_model_selection.name, selection))
+
+    def expected_cost(self, e : Exp) -> Exp:
+        """The total cost of a workload using `e` to implement the query.
+
+        Each call to the query costs `rt(e)` and each call to an op costs the
+        maintenance cost of the state that `e` uses.  Dividing by the number
+        of calls would give the expected cost per call, but that does not
+        change how implementations are ordered.
+        """
+        terms = []
+        for name, cost in itertools.chain(
+                [(self.query, lambda: rt(e))],
+                [(op.name, lambda op=op: maintenance_cost(e, op, self.freebies)) for op in self.ops]):
+            weight = self.frequencies.get(name, 1)
+            if weight == 1:
+                terms.append(cost())
+            elif weight > 0:
+                terms.append(EBinOp(ENum(weight).with_type(INT), "*", cost()).with_type(INT))
+        return ESum(terms)
+
+class MemoStats(object):
+    """Hit and miss counts for the memoized cost functions."""
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    def __repr__(self):
+        return "MemoStats(hits={}, misses={})".format(self.hits, self.misses)
+
+memo_stats = MemoStats()
+
+class _Identity(object):
+    """Wraps an unhashable object so that it can be part of a memo key."""
+    __slots__ = ("obj",)
+    def __init__(self, obj):
+        self.obj = obj
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and self.obj is other.obj
+    def __hash__(self):
+        return id(self.obj)
+
+def _freeze(x):
+    if isinstance(x, (list, tuple, OrderedSet)):
+        return tuple(_freeze(y) for y in x)
+    if isinstance(x, Op):
+        return _Identity(x)
+    return x
+
+def _memoized_on_node(f):
+    """Memoize a cost function on the expression it is given.
+
+    Results are stored on the expression itself, but only if it is interned
+    (see `syntax_tools.hash_cons`): interned expressions are never modified,
+    and equal interned expressions are the same object.  The other arguments
+    (e.g. the list of freebies) and the calibration constants are part of
+    the key.
+    """
+    name = f.__name__
+    @wraps(f)
+    def g(e, *args, **kwargs):
+        if not getattr(e, "_interned", False) or not memoize_costs.value:
+            return f(e, *args, **kwargs)
+        key = (name, calibration(), _freeze(args), _freeze(sorted(kwargs.items())))
+        cache = e._cost_cache
+        if cache is None:
+            cache = e._cost_cache = { }
+        else:
+            res = cache.get(key, cache)
+            if res is not cache:
+                memo_stats.hits += 1
+                return res
+        memo_stats.misses += 1
+        res = f(e, *args, **kwargs)
+        cache[key] = res
+        return res
+    return g
+
+# Some kinds of expressions have a massive penalty associated with them if they
+# appear at runtime.
+EXTREME_COST = 1000
+
+# Constant factors used by `rt` and `storage_size`.  These defaults are
+# estimates; cozy.bench.calibrate measures them for the generated code.
+DEFAULT_CALIBRATION = FrozenDict([
+    # runtime costs
+    ("node",            1),            # evaluating one expression node
+    ("extreme",         EXTREME_COST), # building a map or bag difference at runtime
+    ("scan",            1),            # visiting one element in a linear-time operation
+    ("iteration",       0),            # loop overhead per element of a filter, map, or argmin
+    ("hash",            1),            # multiplier on the cost of hashing a map key
+    ("comparison",      1),            # multiplier on the cost of comparing two values
+    ("heap",            0),            # extra cost of reading the top of a heap
+    # storage sizes, in bytes
+    ("bool_size",       1),
+    ("int_size",        4),
+    ("enum_size",       2),
+    ("string_size",     20),
+    ("pointer_size",    4),            # handles and native types
+    ("collection_size", 4)])           # overhead of a collection or map
+
+def make_calibration(constants : {str : int}, source : str = "calibration") -> FrozenDict:
+    """Fill in the constants missing from `constants` with their defaults.
+
+    Every value must be a non-negative integer for one of the keys of
+    DEFAULT_CALIBRATION.  Raises ValueError otherwise, mentioning `source`.
+    """
+    if not isinstance(constants, dict):
+        raise ValueError("{}: expected an object mapping constant names to values".format(source))
+    for k, v in constants.items():
+        if k not in DEFAULT_CALIBRATION:
+            raise ValueError("{}: unknown constant {!r}".format(source, k))
+        if not isinstance(v, int) or isinstance(v, bool) or v < 0:
+            raise ValueError("{}: {!r} should be a non-negative integer, not {!r}".format(source, k, v))
+    res = dict(DEFAULT_CALIBRATION)
+    res.update(constants)
+    return FrozenDict(res)
+
+def read_calibration(path : str) -> FrozenDict:
+    """Read a calibration file written by cozy.bench.calibrate.
+
+    The file holds a JSON object with a non-negative integer for some of the
+    keys of DEFAULT_CALIBRATION; missing keys keep their default values.
+    """
+    with open(path) as f:
+        return make_calibration(json.load(f), source=path)
+
+_calibration_override = None
+_calibration_file = None # (path, constants) of the last file read
+
+def calibration() -> FrozenDict:
+    """Get the constant factors currently in effect.
+
+    These are the ones given to `calibrated`, if it is active, or else the
+    ones in the file named by --cost-calibration.  The file is read once,
+    the first time it is needed; it is read again only if the option is
+    set to a different path.
+    """
+    global _calibration_file
+    if _calibration_override is not None:
+        return _calibration_override
+    path = cost_calibration.value
+    if not path:
+        return DEFAULT_CALIBRATION
+    loaded = _calibration_file
+    if loaded is None or loaded[0] != path:
+        loaded = _calibration_file = (path, read_calibration(path))
+    return loaded[1]
+
+@contextmanager
+def calibrated(constants : {str : int}):
+    """Use the given constants instead of --cost-calibration within a `with` block.
+
+    Constants missing from `constants` keep their default values.
+    """
+    global _calibration_override
+    old = _calibration_override
+    _calibration_override = make_calibration(constants)
+    try:
+        yield
+    finally:
+        _calibration_override = old
+
+def _scaled(k : int, e : Exp) -> Exp:
+    if k == 1:
+        return e
+    return EBinOp(ENum(k).with_type(INT), "*", e).with_type(INT)
 
 def cardinality(e : Exp) -> Exp:
     assert is_collection(e.type)
     return ELen(e)
 
-TWO   = ENum(2).with_type(INT)
-FOUR  = ENum(4).with_type(INT)
-EIGHT = ENum(8).with_type(INT)
-TWENTY = ENum(20).with_type(INT)
+@_memoized_on_node
 def storage_size(e, freebies : [Exp] = []):
     h = extension_handler(type(e.type))
     if h is not None:
         return h.storage_size(e, storage_size=storage_size)
 
+    c = calibration()
     if e in freebies:
         return ZERO
     elif e.type == BOOL:
-        return ONE
-    elif is_numeric(e.type) or isinstance(e.type, THandle):
-        return FOUR
+        return ENum(c["bool_size"]).with_type(INT)
+    elif is_numeric(e.type):
+        return ENum(c["int_size"]).with_type(INT)
     elif isinstance(e.type, TEnum):
-        return TWO
-    elif isinstance(e.type, TNative):
-        return FOUR
+        return ENum(c["enum_size"]).with_type(INT)
+    elif isinstance(e.type, THandle) or isinstance(e.type, TNative):
+        return ENum(c["pointer_size"]).with_type(INT)
     elif isinstance(e.type, TString):
-        return TWENTY
+        return ENum(c["string_size"]).with_type(INT)
     elif isinstance(e.type, TTuple):
         return ESum([storage_size(ETupleGet(e, n).with_type(t)) for (n, t) in enumerate(e.type.ts)])
     elif isinstance(e.type, TRecord):
@@ -247,12 +531,12 @@ def storage_size(e, freebies : [Exp] = []):
     elif is_collection(e.type):
         v = fresh_var(e.type.elem_type, omit=free_vars(e))
         return ESum([
-            FOUR,
+            ENum(c["collection_size"]).with_type(INT),
             EUnaryOp(UOp.Sum, EMap(e, ELambda(v, storage_size(v))).with_type(INT_BAG)).with_type(INT)])
     elif isinstance(e.type, TMap):
         k = fresh_var(e.type.k, omit=free_vars(e))
         return ESum([
-            FOUR,
+            ENum(c["collection_size"]).with_type(INT),
             EUnaryOp(UOp.Sum, EMap(
                 EMapKeys(e).with_type(TBag(e.type.k)),
                 ELambda(k, ESum([
@@ -261,6 +545,7 @@ def storage_size(e, freebies : [Exp] = []):
     else:
         raise NotImplementedError(e.type)
 
+@_memoized_on_node
 def max_storage_size(e, freebies : [Exp] = []):
     sizes = OrderedSet()
     for x in all_exps(e):
@@ -269,10 +554,10 @@ def max_storage_size(e, freebies : [Exp] = []):
     return max_of(*sizes, type=INT)
 
 def hash_cost(e):
-    return storage_size(e)
+    return _scaled(calibration()["hash"], storage_size(e))
 
 def comparison_cost(e1, e2):
-    return ESum([storage_size(e1), storage_size(e2)])
+    return _scaled(calibration()["comparison"], ESum([storage_size(e1), storage_size(e2)]))
 
 def worst_case_cardinality(e : Exp) -> Polynomial:
     assert is_collection(e.type)
@@ -362,6 +647,7 @@ def _maintenance_cost(e : Exp, op : Op, freebies : [Exp] = []):
     else:
         raise NotImplementedError(repr(e.type))
 
+@_memoized_on_node
 def maintenance_cost(e : Exp, op : Op, freebies : [Exp] = []):
     """This method calulates the result over all expressions that are EStateVar """
     return ESum([_maintenance_cost(e=x.e, op=op, freebies=freebies) for x in all_exps(e) if isinstance(x, EStateVar)])
@@ -374,6 +660,7 @@ LINEAR_TIME_UOPS = {
     UOp.All, UOp.Any,
     UOp.Reversed }
 
+@_memoized_on_node
 def polynomial_runtime(e : Exp) -> Polynomial:
     res = Polynomial.ZERO
     stk = [e]
@@ -420,6 +707,7 @@ def polynomial_runtime(e : Exp) -> Polynomial:
         stk.extend(e.children())
     return res
 
+@_memoized_on_node
 def asymptotic_runtime(e : Exp) -> DominantTerm:
     res = polynomial_runtime(e).largest_term()
     if res.exponent == 0:
@@ -429,10 +717,9 @@ def asymptotic_runtime(e : Exp) -> DominantTerm:
 def is_constant_time(e : Exp) -> bool:
     return asymptotic_runtime(e).exponent == 0
 
-# Some kinds of expressions have a massive penalty associated with them if they
-# appear at runtime.
-EXTREME_COST = 1000
+@_memoized_on_node
 def rt(e, account_for_constant_factors=True):
+    c = calibration()
     constant = 0
     terms = []
     stk = [e]
@@ -469,7 +756,7 @@ def rt(e, account_for_constant_factors=True):
             terms.append(ELet(e.e, ELambda(e.body_function.arg, rt(e.body_function.body))).with_type(INT))
             continue
 
-        constant += 1
+        constant += c["node"]
         if isinstance(e, EStateVar):
             continue
         if isinstance(e, Exp):
@@ -484,22 +771,27 @@ def rt(e, account_for_constant_factors=True):
         elif isinstance(e, EMap) or isinstance(e, EFlatMap):
             terms.append(EUnaryOp(UOp.Sum, EMap(e.e, ELambda(e.transform_function.arg, rt(e.transform_function.body))).with_type(INT_BAG)).with_type(INT))
         elif isinstance(e, EListSlice):
-            terms.append(max_of(ZERO, EBinOp(e.end, "-", e.start).with_type(INT)))
+            terms.append(_scaled(c["scan"], max_of(ZERO, EBinOp(e.end, "-", e.start).with_type(INT))))
         elif isinstance(e, EMakeMap2):
-            constant += EXTREME_COST
+            constant += c["extreme"]
             terms.append(EUnaryOp(UOp.Sum, EMap(e.e, ELambda(e.value_function.arg, rt(e.value_function.body))).with_type(INT_BAG)).with_type(INT))
         elif isinstance(e, EBinOp) and e.op == "-" and is_collection(e.type):
-            constant += EXTREME_COST
-            terms.append(cardinality(e.e1))
-            terms.append(cardinality(e.e2))
+            constant += c["extreme"]
+            terms.append(_scaled(c["scan"], cardinality(e.e1)))
+            terms.append(_scaled(c["scan"], cardinality(e.e2)))
         elif isinstance(e, EBinOp) and e.op in ("==", "!=", ">", "<", ">=", "<="):
             terms.append(comparison_cost(e.e1, e.e2))
         elif isinstance(e, EUnaryOp) and e.op in LINEAR_TIME_UOPS:
-            terms.append(cardinality(e.e))
+            terms.append(_scaled(c["scan"], cardinality(e.e)))
+        elif isinstance(e, EHeapPeek) or isinstance(e, EHeapPeek2):
+            constant += c["heap"]
         elif isinstance(e, EMapGet):
             terms.append(hash_cost(e.key))
             terms.append(comparison_cost(e.key, e.key))
 
+        if c["iteration"] and (isinstance(e, EFilter) or isinstance(e, EArgMin) or isinstance(e, EArgMax) or isinstance(e, EMap) or isinstance(e, EFlatMap) or isinstance(e, EMakeMap2)):
+            terms.append(_scaled(c["iteration"], cardinality(e.e)))
+
     terms.append(ENum(constant).with_type(INT))
     if not account_for_constant_factors:
         terms = [t for t in terms if not isinstance(t, ENum)]
@@ -3,18 +3,63 @@
 Important functions:
  - eval: execute an expression in an environment
  - eval_bulk: execute the same expression in many different environments
+
+There are two evaluation backends.  The first compiles each expression to a
+list of stack-manipulating closures and runs them in a loop; it handles every
+expression.  The second generates Python source code for the expression and
+compiles it with Python's own compiler, yielding straight-line code that is
+much faster to run but slower to build.  `eval_bulk` uses the second backend
+when it is enabled and the expression has a Python translation.
+
+Integer and boolean expressions over integer and boolean variables can also be
+evaluated column-wise with NumPy, if it is installed: each variable becomes
+one array holding its value in every environment, and each operator runs once
+over whole arrays.
+
+Compiled programs are kept in `program_cache`, so evaluating the same
+expression again only costs the time to run it.
 """
 
-from functools import cmp_to_key, lru_cache
+from collections import OrderedDict
+from functools import lru_cache
 import itertools
 from fractions import Fraction
+import threading
 
 from cozy.target_syntax import *
 from cozy.syntax_tools import pprint, free_vars, free_funcs, purify
-from cozy.common import FrozenDict, OrderedSet, extend, unique
+from cozy.common import ADT, FrozenDict, OrderedSet, extend, unique
 from cozy.typecheck import is_numeric, is_collection
 from cozy.structures import extension_handler
-from cozy.value_types import Map, Bag, Handle, compare_values, values_equal, LT, EQ, GT
+from cozy.value_types import (
+    Map, Bag, Handle, compare_values, LT, EQ, GT,
+    bag_contains, bag_difference, bag_distinct, bag_are_unique)
+from cozy.opts import Option
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+python_backend = Option("eval-python-backend", bool, True,
+    description="Evaluate expressions by compiling them to Python code. "
+        + "This is faster than the default interpreter when an expression is "
+        + "evaluated on many inputs.")
+python_backend_threshold = Option("eval-python-backend-threshold", int, 8,
+    metavar="N",
+    description="Only use the Python backend for expressions evaluated on at "
+        + "least N inputs at once; compiling is not worth it for fewer.")
+numpy_backend = Option("eval-numpy-backend", bool, True,
+    description="Evaluate integer and boolean expressions on many inputs at "
+        + "once using NumPy arrays.  Has no effect if NumPy is not installed.")
+numpy_backend_threshold = Option("eval-numpy-backend-threshold", int, 128,
+    metavar="N",
+    description="Only use NumPy for expressions evaluated on at least N "
+        + "inputs at once.")
+program_cache_size = Option("eval-cache-size", int, 10000,
+    metavar="N",
+    description="Number of compiled expressions to keep for reuse by the "
+        + "interpreter.")
 
 def eval(e : Exp, env : {str:object}, *args, **kwargs):
     """Evaluate an expression in an environment.
@@ -53,11 +98,16 @@ def eval_bulk(
     if not envs:
         return []
 
-    e = purify(e)
-    ops = []
-    types = { v.id : v.type for v in free_vars(e) }
-    vars = OrderedSet(itertools.chain(types.keys(), free_funcs(e).keys()))
-    vmap = { v : i for (i, v) in enumerate(vars) }
+    prog = program_cache.get(e)
+    types = prog.types
+    vars = prog.vars
+
+    if numpy_backend.value and len(envs) >= numpy_backend_threshold.value:
+        f = prog.numpy_function()
+        if f is not None:
+            res = f(envs, use_default_values_for_undefined_vars)
+            if res is not None:
+                return res
 
     try:
         envs = [ [(env.get(v, mkval(types[v])) if (use_default_values_for_undefined_vars and v in types) else env[v]) for v in vars] for env in envs ]
@@ -67,9 +117,130 @@ def eval_bulk(
         print("e = {}".format(pprint(e)), file=sys.stderr)
         print("eval_bulk({!r}, {!r}, use_default_values_for_undefined_vars={!r})".format(e, envs, use_default_values_for_undefined_vars), file=sys.stderr)
         raise
-    _compile(e, vmap, ops)
+    if python_backend.value and len(envs) >= python_backend_threshold.value:
+        f = prog.python_function()
+        if f is not None:
+            return f(envs)
+    ops = prog.ops()
     return [_eval_compiled(ops, env) for env in envs]
 
+class _Program(object):
+    """A purified expression together with its compiled forms.
+
+    Each backend compiles the expression the first time it is needed.
+    """
+
+    def __init__(self, e : Exp):
+        self.source = e
+        self.e = purify(e)
+        self.types = { v.id : v.type for v in free_vars(self.e) }
+        self.vars = tuple(OrderedSet(itertools.chain(self.types.keys(), free_funcs(self.e).keys())))
+        self._ops = None
+        self._python_function = None
+        self._python_function_compiled = False
+        self._numpy_function = None
+        self._numpy_function_compiled = False
+
+    def ops(self):
+        if self._ops is None:
+            ops = []
+            _compile(self.e, { v : i for (i, v) in enumerate(self.vars) }, ops)
+            self._ops = ops
+        return self._ops
+
+    def python_function(self):
+        if not self._python_function_compiled:
+            self._python_function = _compile_to_python(self.e, self.vars)
+            self._python_function_compiled = True
+        return self._python_function
+
+    def numpy_function(self):
+        if not self._numpy_function_compiled:
+            self._numpy_function = _compile_to_numpy(self.e, self.vars, self.types)
+            self._numpy_function_compiled = True
+        return self._numpy_function
+
+def _type_signature(e : Exp) -> tuple:
+    """The types of every subexpression of `e`, in a fixed order.
+
+    Expressions are compared without regard to their types, but two
+    expressions that differ only in their types may need different programs.
+    """
+    res = []
+    stk = [e]
+    while stk:
+        x = stk.pop()
+        if isinstance(x, Exp):
+            res.append(getattr(x, "type", None))
+        if isinstance(x, ADT):
+            stk.extend(x.children())
+        elif isinstance(x, tuple) or isinstance(x, list):
+            stk.extend(x)
+    return tuple(res)
+
+class ProgramCache(object):
+    """Least-recently-used cache of compiled programs for `eval_bulk`.
+
+    The `hits` and `misses` attributes count lookups since the cache was
+    created or last cleared.  The cache holds at most `--eval-cache-size`
+    programs.  It is safe to use from several threads.
+    """
+
+    def __init__(self):
+        self.programs = OrderedDict() # key (see `_key`) -> _Program
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.programs)
+
+    @staticmethod
+    def _key(e : Exp):
+        # An interned expression (see `hash_cons`) is the only interned
+        # expression with its structure and types, so its identity is a
+        # constant-time key.  Each program keeps its `source` alive, so the
+        # identity is not reused while the program is cached.
+        if e._interned:
+            return id(e)
+        return (e, _type_signature(e))
+
+    def get(self, e : Exp) -> _Program:
+        """Find or build the program for `e`.
+
+        Lookups for interned expressions take constant time; others have to
+        look at the whole expression.  Programs for unhashable expressions
+        (e.g. ones with list children) are built but not cached.
+        """
+        key = self._key(e)
+        with self._lock:
+            try:
+                prog = self.programs.get(key)
+            except TypeError:
+                self.misses += 1
+                return _Program(e)
+            if prog is not None:
+                self.hits += 1
+                self.programs.move_to_end(key)
+                return prog
+            self.misses += 1
+        # compile outside the lock; another thread may race us, but both
+        # programs are correct
+        prog = _Program(e)
+        with self._lock:
+            self.programs[key] = prog
+            while len(self.programs) > max(program_cache_size.value, 0):
+                self.programs.popitem(last=False)
+        return prog
+
+    def clear(self):
+        with self._lock:
+            self.programs.clear()
+            self.hits = 0
+            self.misses = 0
+
+program_cache = ProgramCache()
+
 @lru_cache(maxsize=None)
 def mkval(type : Type):
     """
@@ -201,12 +372,10 @@ def read_map(stk):
     m = stk.pop()
     stk.append(m[k])
 
-def has_key(key_type):
-    def _has_key(stk):
-        k = stk.pop()
-        m = stk.pop()
-        stk.append(any(values_equal(key_type, k, kk) for kk in m.keys()))
-    return _has_key
+def has_key(stk):
+    k = stk.pop()
+    m = stk.pop()
+    stk.append(k in m)
 
 def read_map_keys(stk):
     stk.append(Bag(stk.pop().keys()))
@@ -240,26 +409,14 @@ def binaryop_sub_bags(elem_type):
     def binaryop_sub_bags(stk):
         v2 = stk.pop()
         v1 = stk.pop()
-        elems = list(v1)
-        for x in v2:
-            for i in range(len(elems)):
-                if values_equal(elem_type, x, elems[i]):
-                    del elems[i]
-                    break
-        stk.append(Bag(elems))
+        stk.append(Bag(bag_difference(elem_type, v1, v2)))
     return binaryop_sub_bags
 
 def binaryop_sub_lists(elem_type):
     def binaryop_sub_lists(stk):
         v2 = stk.pop()
         v1 = stk.pop()
-        elems = list(v1)
-        for x in v2:
-            for i in range(len(elems)):
-                if values_equal(elem_type, x, elems[i]):
-                    del elems[i]
-                    break
-        stk.append(tuple(elems))
+        stk.append(tuple(bag_difference(elem_type, v1, v2)))
     return binaryop_sub_lists
 
 def binaryop_eq(t, deep=False):
@@ -308,7 +465,7 @@ def binaryop_in(elem_type):
     def binaryop_in(stk):
         v2 = stk.pop()
         v1 = stk.pop()
-        stk.append(any(values_equal(elem_type, v1, v2elem) for v2elem in v2))
+        stk.append(bag_contains(elem_type, v2, v1))
     return binaryop_in
 
 def unaryop_not(stk):
@@ -333,26 +490,13 @@ def unaryop_neg(stk):
     stk.append(-stk.pop())
 
 def unaryop_areunique(elem_type):
-    keyfunc = cmp_to_key(lambda v1, v2: compare_values(elem_type, v1, v2))
     def unaryop_areunique(stk):
-        v = stk.pop()
-        l = sorted(v, key=keyfunc)
-        res = True
-        for i in range(len(l) - 1):
-            if values_equal(elem_type, l[i], l[i+1]):
-                res = False
-                break
-        stk.append(res)
+        stk.append(bag_are_unique(elem_type, stk.pop()))
     return unaryop_areunique
 
 def unaryop_distinct(elem_type):
     def unaryop_distinct(stk):
-        v = stk.pop()
-        res = []
-        for x in v:
-            if not any(values_equal(elem_type, x, y) for y in res):
-                res.append(x)
-        stk.append(Bag(res))
+        stk.append(Bag(bag_distinct(elem_type, stk.pop())))
     return unaryop_distinct
 
 def unaryop_the(default):
@@ -690,7 +834,7 @@ def _compile(e, env : {str:int}, out):
     elif isinstance(e, EHasKey):
         _compile(e.map, env, out)
         _compile(e.key, env, out)
-        out.append(has_key(e.key.type))
+        out.append(has_key)
     elif isinstance(e, EMapKeys):
         _compile(e.e, env, out)
         out.append(read_map_keys)
@@ -724,3 +868,399 @@ def _compile(e, env : {str:int}, out):
             raise NotImplementedError(type(e))
     if hasattr(e, "type") and isinstance(e.type, TList):
         out.append(iterable_to_list)
+
+# The Python backend.
+#
+# `_PythonCompiler` translates an expression to the source code of a Python
+# expression.  Values that cannot be written as Python literals (types,
+# default values, helper functions) are passed to the generated code through
+# its global namespace.  The helpers below mirror the stack operations above,
+# but take and return values instead of manipulating a stack.
+
+def _py_the(v, default):
+    return v[0] if v else default
+
+def _py_list_index(l, i, default):
+    return l[i] if i >= 0 and i < len(l) else default
+
+def _py_list_slice(l, start, end):
+    return l[max(start, 0):max(end, 0)]
+
+def _py_arg_best(bag, key, better, default):
+    """Find the first element of `bag` whose key is not beaten by any other.
+
+    `better(k1, k2)` should return true if key k1 is strictly better than key
+    k2.  Returns `default` if the bag is empty.
+    """
+    it = iter(bag)
+    for best in it:
+        best_key = key(best)
+        for x in it:
+            k = key(x)
+            if better(k, best_key):
+                best = x
+                best_key = k
+        return best
+    return default
+
+def _is_simple_type(t : Type) -> bool:
+    """Can values of type `t` be compared with Python's built-in operators?"""
+    return (is_numeric(t) or t == BOOL or t == STRING) and extension_handler(type(t)) is None
+
+class _PythonCompiler(object):
+    def __init__(self):
+        self.consts = {
+            "Bag": Bag, "Map": Map, "Handle": Handle, "FrozenDict": FrozenDict,
+            "itertools": itertools, "unique": unique,
+            "compare_values": compare_values, "LT": LT, "EQ": EQ, "GT": GT,
+            "bag_contains": bag_contains, "bag_difference": bag_difference,
+            "bag_distinct": bag_distinct, "bag_are_unique": bag_are_unique,
+            "_py_the": _py_the,
+            "_py_list_index": _py_list_index, "_py_list_slice": _py_list_slice,
+            "_py_arg_best": _py_arg_best }
+        self.counter = 0
+
+    def fresh(self, hint):
+        self.counter += 1
+        return "_{}{}".format(hint, self.counter)
+
+    def const(self, value):
+        name = self.fresh("c")
+        self.consts[name] = value
+        return name
+
+    def compare(self, t, op, a, b):
+        """Source for comparing `a` and `b` (of type `t`) with `op`."""
+        if _is_simple_type(t):
+            return "({} {} {})".format(a, op, b)
+        res = { "==": "== EQ", "!=": "!= EQ", "<": "== LT", ">": "== GT", "<=": "!= GT", ">=": "!= LT" }[op]
+        return "(compare_values({}, {}, {}) {})".format(self.const(t), a, b, res)
+
+    def lambda_(self, f : ELambda, env):
+        v = self.fresh("v")
+        with extend(env, f.arg.id, v):
+            return (v, self.compile(f.body, env))
+
+    def compile(self, e : Exp, env : {str:str}) -> str:
+        res = self._compile(e, env)
+        if hasattr(e, "type") and isinstance(e.type, TList):
+            res = "tuple({})".format(res)
+        return res
+
+    def _compile(self, e : Exp, env : {str:str}) -> str:
+        if isinstance(e, EVar):
+            return env[e.id]
+        elif isinstance(e, EBool):
+            return "True" if e.val else "False"
+        elif isinstance(e, ENum):
+            s = e.val
+            if e.type == FLOAT:
+                s = Fraction(str(s))
+            return self.const(s)
+        elif isinstance(e, EStr):
+            return self.const(e.val)
+        elif isinstance(e, EEnumEntry):
+            return self.const(e.name)
+        elif isinstance(e, EEmptyList):
+            return self.const(_EMPTY_BAG)
+        elif isinstance(e, ESingleton):
+            x = self.compile(e.e, env)
+            if isinstance(e.type, TList):
+                return "({},)".format(x)
+            return "Bag(({},))".format(x)
+        elif isinstance(e, EHandle):
+            return "Handle({}, {})".format(self.compile(e.addr, env), self.compile(e.value, env))
+        elif isinstance(e, ENull):
+            return "None"
+        elif isinstance(e, ECond):
+            return "({} if {} else {})".format(
+                self.compile(e.then_branch, env),
+                self.compile(e.cond, env),
+                self.compile(e.else_branch, env))
+        elif isinstance(e, EMakeRecord):
+            return "FrozenDict(({},))".format(", ".join(
+                "({}, {})".format(self.const(f), self.compile(ee, env))
+                for (f, ee) in reversed(e.fields)))
+        elif isinstance(e, EGetField):
+            x = self.compile(e.e, env)
+            if isinstance(e.e.type, THandle):
+                assert e.field_name == "val"
+                return "{}.value".format(x)
+            assert isinstance(e.e.type, TRecord)
+            return "{}[{}]".format(x, self.const(e.field_name))
+        elif isinstance(e, ETuple):
+            return "({},)".format(", ".join(self.compile(ee, env) for ee in e.es))
+        elif isinstance(e, ETupleGet):
+            return "{}[{}]".format(self.compile(e.e, env), e.index)
+        elif isinstance(e, EStateVar):
+            return self.compile(e.e, env)
+        elif isinstance(e, ENative):
+            return "({}, {})".format(self.const(e.type.name), self.compile(e.e, env))
+        elif isinstance(e, EUnaryOp):
+            x = self.compile(e.e, env)
+            if e.op == UOp.Not or e.op == UOp.Empty:
+                return "(not {})".format(x)
+            elif e.op == UOp.Sum:
+                return "sum({})".format(x)
+            elif e.op == UOp.Exists:
+                return "bool({})".format(x)
+            elif e.op == UOp.All:
+                return "all({})".format(x)
+            elif e.op == UOp.Any:
+                return "any({})".format(x)
+            elif e.op == UOp.Length:
+                return "len({})".format(x)
+            elif e.op == UOp.AreUnique:
+                return "bag_are_unique({}, {})".format(self.const(e.e.type.elem_type), x)
+            elif e.op == UOp.Distinct:
+                return "Bag(bag_distinct({}, {}))".format(self.const(e.e.type.elem_type), x)
+            elif e.op == UOp.The:
+                return "_py_the({}, {})".format(x, self.const(mkval(e.type)))
+            elif e.op == UOp.Reversed:
+                return "tuple(reversed({}))".format(x)
+            elif e.op == "-":
+                return "(-{})".format(x)
+            else:
+                raise NotImplementedError(e.op)
+        elif isinstance(e, EBinOp):
+            if e.op == BOp.And:
+                return self.compile(ECond(e.e1, e.e2, EFALSE).with_type(BOOL), env)
+            elif e.op == BOp.Or:
+                return self.compile(ECond(e.e1, ETRUE, e.e2).with_type(BOOL), env)
+            elif e.op == "=>":
+                return self.compile(ECond(e.e1, e.e2, ETRUE).with_type(BOOL), env)
+            a = self.compile(e.e1, env)
+            b = self.compile(e.e2, env)
+            e1type = e.e1.type
+            if e.op == "+":
+                if isinstance(e.type, TSet):
+                    return "Bag(unique(itertools.chain({}, {})))".format(a, b)
+                elif is_collection(e.type):
+                    return "Bag(itertools.chain({}, {}))".format(a, b)
+                return "({} + {})".format(a, b)
+            elif e.op == "*":
+                return "({} * {})".format(a, b)
+            elif e.op == "-":
+                if isinstance(e.type, TBag) or isinstance(e.type, TSet):
+                    return "Bag(bag_difference({}, {}, {}))".format(self.const(e.type.elem_type), a, b)
+                elif isinstance(e.type, TList):
+                    return "bag_difference({}, {}, {})".format(self.const(e.type.elem_type), a, b)
+                return "({} - {})".format(a, b)
+            elif e.op in ("==", "!=", "<", ">", "<=", ">="):
+                return self.compare(e1type, e.op, a, b)
+            elif e.op == "===":
+                return "(compare_values({}, {}, {}, deep=True) == EQ)".format(self.const(e1type), a, b)
+            elif e.op == BOp.In:
+                if _is_simple_type(e1type):
+                    return "({} in {})".format(a, b)
+                return "bag_contains({}, {}, {})".format(self.const(e1type), b, a)
+            else:
+                raise NotImplementedError(e.op)
+        elif isinstance(e, EListGet):
+            return "_py_list_index({}, {}, {})".format(
+                self.compile(e.e, env),
+                self.compile(e.index, env),
+                self.const(mkval(e.type)))
+        elif isinstance(e, EListSlice):
+            return "_py_list_slice({}, {}, {})".format(
+                self.compile(e.e, env),
+                self.compile(e.start, env),
+                self.compile(e.end, env))
+        elif isinstance(e, EDropFront):
+            return "{}[1:]".format(self.compile(e.e, env))
+        elif isinstance(e, EDropBack):
+            return "{}[:-1]".format(self.compile(e.e, env))
+        elif isinstance(e, EFilter):
+            x = self.compile(e.e, env)
+            v, body = self.lambda_(e.predicate, env)
+            return "Bag([{v} for {v} in {x} if {body}])".format(v=v, x=x, body=body)
+        elif isinstance(e, EMap):
+            x = self.compile(e.e, env)
+            v, body = self.lambda_(e.transform_function, env)
+            return "Bag([{body} for {v} in {x}])".format(v=v, x=x, body=body)
+        elif isinstance(e, EFlatMap):
+            x = self.compile(e.e, env)
+            v, body = self.lambda_(e.transform_function, env)
+            y = self.fresh("v")
+            return "Bag([{y} for {v} in {x} for {y} in {body}])".format(v=v, x=x, y=y, body=body)
+        elif isinstance(e, EArgMin) or isinstance(e, EArgMax):
+            x = self.compile(e.e, env)
+            v, body = self.lambda_(e.key_function, env)
+            a, b = self.fresh("k"), self.fresh("k")
+            better = "lambda {a}, {b}: {cmp}".format(a=a, b=b,
+                cmp=self.compare(e.key_function.body.type, "<" if isinstance(e, EArgMin) else ">", a, b))
+            return "_py_arg_best({}, lambda {}: {}, {}, {})".format(x, v, body, better, self.const(mkval(e.type)))
+        elif isinstance(e, EMakeMap2):
+            x = self.compile(e.e, env)
+            v, body = self.lambda_(e.value_function, env)
+            return "Map({}, {}, [({v}, {body}) for {v} in {x}])".format(
+                self.const(e.type), self.const(mkval(e.type.v)), v=v, x=x, body=body)
+        elif isinstance(e, EMapGet):
+            return "{}[{}]".format(self.compile(e.map, env), self.compile(e.key, env))
+        elif isinstance(e, EHasKey):
+            return "({} in {})".format(self.compile(e.key, env), self.compile(e.map, env))
+        elif isinstance(e, EMapKeys):
+            return "Bag({}.keys())".format(self.compile(e.e, env))
+        elif isinstance(e, ECall):
+            return "{}({})".format(env[e.func], ", ".join(self.compile(a, env) for a in e.args))
+        elif isinstance(e, ELet):
+            x = self.compile(e.e, env)
+            v, body = self.lambda_(e.body_function, env)
+            return "(lambda {}: {})({})".format(v, body, x)
+        else:
+            h = extension_handler(type(e))
+            if h is not None:
+                return self.compile(h.encode(e), env)
+            raise NotImplementedError(type(e))
+
+def _compile_to_python(e : Exp, vars : [str]):
+    """Compile an expression to a Python function.
+
+    The function takes a list of environments, each of which is a list of
+    values for `vars` (in order), and returns a list of results.  Returns None
+    if the expression has no Python translation.
+    """
+    compiler = _PythonCompiler()
+    env = { v : "_a{}".format(i) for (i, v) in enumerate(vars) }
+    try:
+        body = compiler.compile(e, dict(env))
+        src = "def _f(_envs):\n    return [{} for ({}) in _envs]\n".format(
+            body, "".join(a + ", " for a in env.values()))
+        namespace = dict(compiler.consts)
+        exec(compile(src, "<cozy>", "exec"), namespace)
+    except (NotImplementedError, SyntaxError, RecursionError, MemoryError):
+        return None
+    return namespace["_f"]
+
+# The NumPy backend.
+#
+# Cozy integers are unbounded, but NumPy integers are 64 bits wide.  To keep
+# results exact, every compiled node also computes an upper bound on the
+# absolute value of its results; if any bound reaches 2**63 the whole
+# evaluation is abandoned and `eval_bulk` falls back to another backend.  Cozy
+# floats are exact fractions, so FLOAT expressions are never compiled.
+
+_NUMPY_TYPES = (INT, LONG, BOOL)
+_INT64_LIMIT = 2**63
+
+def _check_bound(bound : int) -> int:
+    if bound >= _INT64_LIMIT:
+        raise OverflowError(bound)
+    return bound
+
+def _compile_numpy(e : Exp, env : {str:int}):
+    """Compile `e` to a function from columns to (array, bound) pairs.
+
+    The function takes a list of columns (one (array, bound) pair for each
+    variable in `env`) and the number of rows.  It raises OverflowError if
+    intermediate values might not fit in 64 bits.
+    """
+    if e.type not in _NUMPY_TYPES:
+        raise NotImplementedError(e.type)
+    if isinstance(e, EVar):
+        i = env[e.id]
+        return lambda cols, n: cols[i]
+    elif isinstance(e, EBool):
+        val = e.val
+        return lambda cols, n: (numpy.full(n, val, dtype=bool), 1)
+    elif isinstance(e, ENum):
+        val = e.val
+        bound = _check_bound(abs(val))
+        return lambda cols, n: (numpy.full(n, val, dtype=numpy.int64), bound)
+    elif isinstance(e, EStateVar):
+        return _compile_numpy(e.e, env)
+    elif isinstance(e, ECond):
+        cond = _compile_numpy(e.cond, env)
+        then_branch = _compile_numpy(e.then_branch, env)
+        else_branch = _compile_numpy(e.else_branch, env)
+        def where(cols, n):
+            (c, _) = cond(cols, n)
+            (a, abound) = then_branch(cols, n)
+            (b, bbound) = else_branch(cols, n)
+            return (numpy.where(c, a, b), max(abound, bbound))
+        return where
+    elif isinstance(e, EUnaryOp):
+        f = _compile_numpy(e.e, env)
+        if e.op == UOp.Not:
+            op = numpy.logical_not
+        elif e.op == "-":
+            op = numpy.negative
+        else:
+            raise NotImplementedError(e.op)
+        def unary(cols, n):
+            (a, bound) = f(cols, n)
+            return (op(a), bound)
+        return unary
+    elif isinstance(e, EBinOp):
+        if e.e1.type not in _NUMPY_TYPES:
+            raise NotImplementedError(e.e1.type)
+        f1 = _compile_numpy(e.e1, env)
+        f2 = _compile_numpy(e.e2, env)
+        if e.op == BOp.And:
+            op, bound = numpy.logical_and, lambda b1, b2: 1
+        elif e.op == BOp.Or:
+            op, bound = numpy.logical_or, lambda b1, b2: 1
+        elif e.op == "=>":
+            op, bound = (lambda a, b: numpy.logical_or(numpy.logical_not(a), b)), lambda b1, b2: 1
+        elif e.op == "+":
+            op, bound = numpy.add, lambda b1, b2: b1 + b2
+        elif e.op == "-":
+            op, bound = numpy.subtract, lambda b1, b2: b1 + b2
+        elif e.op == "*":
+            op, bound = numpy.multiply, lambda b1, b2: b1 * b2
+        elif e.op == "==" or e.op == "===":
+            op, bound = numpy.equal, lambda b1, b2: 1
+        elif e.op == "!=":
+            op, bound = numpy.not_equal, lambda b1, b2: 1
+        elif e.op == "<":
+            op, bound = numpy.less, lambda b1, b2: 1
+        elif e.op == ">":
+            op, bound = numpy.greater, lambda b1, b2: 1
+        elif e.op == "<=":
+            op, bound = numpy.less_equal, lambda b1, b2: 1
+        elif e.op == ">=":
+            op, bound = numpy.greater_equal, lambda b1, b2: 1
+        else:
+            raise NotImplementedError(e.op)
+        def binary(cols, n):
+            (a, abound) = f1(cols, n)
+            (b, bbound) = f2(cols, n)
+            return (op(a, b), _check_bound(bound(abound, bbound)))
+        return binary
+    else:
+        raise NotImplementedError(type(e))
+
+def _numpy_column(t : Type, values) -> (object, int):
+    if t == BOOL:
+        return (numpy.array(values, dtype=bool), 1)
+    a = numpy.array(values, dtype=numpy.int64)
+    return (a, _check_bound(max(int(a.max()), -int(a.min()))) if len(a) else 0)
+
+def _compile_to_numpy(e : Exp, vars : [str], types : {str:Type}):
+    """Compile an expression to a function that evaluates it with NumPy.
+
+    The function takes the same arguments as `eval_bulk` (minus the
+    expression) and returns a list of results, or None if the results might
+    not fit in 64-bit integers or some environment is missing a variable.
+    Returns None instead of a function if NumPy is not installed or the
+    expression is not an integer or boolean expression over integer and
+    boolean variables.
+    """
+    if numpy is None or len(types) != len(vars) or any(t not in _NUMPY_TYPES for t in types.values()):
+        return None
+    try:
+        f = _compile_numpy(e, { v : i for (i, v) in enumerate(vars) })
+    except (NotImplementedError, OverflowError):
+        return None
+    def run(envs, use_default_values_for_undefined_vars=False):
+        try:
+            if use_default_values_for_undefined_vars:
+                columns = [[env.get(v, mkval(types[v])) for env in envs] for v in vars]
+            else:
+                columns = [[env[v] for env in envs] for v in vars]
+            cols = [_numpy_column(types[v], c) for (v, c) in zip(vars, columns)]
+            (res, _) = f(cols, len(envs))
+        except (KeyError, OverflowError):
+            return None
+        return res.tolist()
+    return run
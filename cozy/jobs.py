@@ -1,6 +1,8 @@
 """Helper class to implement interruptable tasks."""
 
-from multiprocessing import Process, Array, Queue
+from collections import deque
+import datetime
+from multiprocessing import Process, Array, Queue, Event
 from queue import Queue as PlainQueue, Empty, Full
 import threading
 
@@ -15,9 +17,16 @@ class Job(object):
         # flags[0] - stop_requested?
         # flags[1] - done?
         # flags[2] - true iff completed with no exception
+        self._unpaused = Event()
+        self._unpaused.set()
+        self._started = False
+        self._paused = False
+        self._in_job_process = False
     def start(self):
         self._thread.start()
+        self._started = True
     def _run(self):
+        self._in_job_process = True
         try:
             if do_profiling.value:
                 import cProfile
@@ -36,6 +45,14 @@ class Job(object):
         raise NotImplementedError()
     @property
     def stop_requested(self):
+        """Whether the job should stop.
+
+        Jobs should check this regularly.  Doing so is also how a job
+        honors `pause`: inside the job's process, reading this property
+        blocks while the job is paused.
+        """
+        if self._in_job_process and not self._flags[0]:
+            self._unpaused.wait()
         return self._flags[0]
     @property
     def done(self):
@@ -43,12 +60,42 @@ class Job(object):
     @property
     def successful(self):
         return self._flags[2]
+    @property
+    def started(self):
+        return self._started
+    @property
+    def paused(self):
+        return self._paused
+    def pause(self):
+        """Ask the job to wait until `resume` is called.
+
+        Pausing is cooperative: the job waits the next time it checks
+        `stop_requested`, keeping all of its in-memory state.  (Suspending
+        the process with SIGSTOP instead could stop it in the middle of
+        writing to a multiprocessing queue, while it holds a lock that
+        other jobs writing to the same queue need.)  A job that does not check
+        `stop_requested`---for instance, because it is in the middle of a
+        long solver call---keeps running until it does.  A paused job keeps
+        its process and all of its memory.  Has no effect if the job has not
+        started or has already finished.
+        """
+        if self._started and not self._paused and not self.done:
+            self._unpaused.clear()
+            self._paused = True
+    def resume(self):
+        """Continue a job that was suspended with `pause`."""
+        if self._paused:
+            self._unpaused.set()
+            self._paused = False
     def request_stop(self):
         print("requesting stop for {}".format(self))
         self._flags[0] = True
+        # a paused job would never notice the request
+        self.resume()
     def join(self, timeout=None):
         self._thread.join(timeout=timeout)
     def kill(self):
+        self.resume()
         self._thread.terminate()
     @property
     def pid(self):
@@ -59,6 +106,8 @@ def stop_jobs(jobs):
     for j in jobs:
         j.request_stop()
 
+    # jobs that never started have nothing to wait for
+    jobs = [j for j in jobs if j.started]
     while jobs:
         for j in jobs:
             j.join(timeout=1)
@@ -68,6 +117,80 @@ def stop_jobs(jobs):
             for j in jobs:
                 print("  --> {} [pid={}]".format(j, j.pid))
 
+class JobScheduler(object):
+    """Runs a bounded number of jobs at once.
+
+    Jobs given to `submit` are started immediately if fewer than `max_running`
+    jobs are currently running.  Otherwise they wait in a FIFO queue.  To make
+    sure every job makes progress, a job that has been running for longer than
+    `timeslice` is paused (see `Job.pause`) and sent to the back of the queue
+    whenever another job is waiting for its turn.  Jobs only pause when
+    they check `Job.stop_requested`.
+
+    The scheduler does not have a thread of its own; clients should call
+    `check` periodically to reap finished jobs and rotate the running set.
+
+    If `max_running` is None, every job runs as soon as it is submitted.
+    """
+
+    def __init__(self, max_running : int = None, timeslice : datetime.timedelta = datetime.timedelta(seconds=10)):
+        if max_running is not None and max_running < 1:
+            raise ValueError("max_running must be positive, not {}".format(max_running))
+        self.max_running = max_running
+        self.timeslice = timeslice
+        self.running = [] # list of (Job, datetime when its slice started)
+        self.waiting = deque()
+
+    @property
+    def jobs(self):
+        """All the unfinished jobs, running or not."""
+        return [j for (j, start) in self.running] + list(self.waiting)
+
+    def _has_free_slot(self):
+        return self.max_running is None or len(self.running) < self.max_running
+
+    def submit(self, job : Job):
+        """Add a new (unstarted) job."""
+        self.waiting.append(job)
+        self.check()
+
+    def stop(self, jobs : [Job]):
+        """Stop the given jobs and forget about them."""
+        jobs = list(jobs)
+        self.running = [(j, start) for (j, start) in self.running if j not in jobs]
+        self.waiting = deque(j for j in self.waiting if j not in jobs)
+        stop_jobs(jobs)
+        self.check()
+
+    def check(self, now : datetime.datetime = None):
+        """Reap finished jobs, preempt expired ones, and start waiting ones.
+
+        The `now` parameter overrides the current time; it is useful for
+        testing.
+        """
+        if now is None:
+            now = datetime.datetime.now()
+        self.running = [(j, start) for (j, start) in self.running if not j.done]
+
+        if self.max_running is not None and self.waiting:
+            expired = [(j, start) for (j, start) in self.running if start + self.timeslice <= now]
+            expired.sort(key=lambda x: x[1])
+            free_slots = self.max_running - len(self.running)
+            for (j, start) in expired[:max(0, len(self.waiting) - free_slots)]:
+                print("pausing {} [pid={}]".format(j, j.pid))
+                j.pause()
+                self.running.remove((j, start))
+                self.waiting.append(j)
+
+        while self.waiting and self._has_free_slot():
+            j = self.waiting.popleft()
+            if j.started:
+                print("resuming {} [pid={}]".format(j, j.pid))
+                j.resume()
+            else:
+                j.start()
+            self.running.append((j, now))
+
 class SafeQueue(object):
     """
     The multiprocessing.Queue class and its cousins come with a lot of caveats!
@@ -3,30 +3,43 @@
 Important functions:
  - task: a context manager to wrap self-contained tasks
  - event: print a log message (indented based on active tasks)
+ - current_tasks: the names of the active tasks
+
+Each thread has its own stack of active tasks.
 """
 
 from collections import defaultdict
 from contextlib import contextmanager
 import datetime
+import threading
 
 from cozy.opts import Option
 
 verbose = Option("verbose", bool, False)
 
 _times = defaultdict(float)
-_task_stack = []
+_times_lock = threading.Lock()
+_local = threading.local() # each thread has its own stack of active tasks
 _begin = datetime.datetime.now()
 
+def _task_stack():
+    try:
+        return _local.task_stack
+    except AttributeError:
+        _local.task_stack = []
+        return _local.task_stack
+
 def log(string):
     if verbose.value:
         print(string)
 
 def task_begin(name, **kwargs):
     start = datetime.datetime.now()
-    _task_stack.append((name, start))
+    stk = _task_stack()
+    stk.append((name, start))
     if not verbose.value:
         return
-    indent = "  " * (len(_task_stack) - 1)
+    indent = "  " * (len(stk) - 1)
     log("{indent}{name}{maybe_kwargs}...".format(
         indent = indent,
         name   = name,
@@ -34,13 +47,15 @@ def task_begin(name, **kwargs):
 
 def task_end(success=True):
     end = datetime.datetime.now()
-    key = tuple(name for name, start in _task_stack)
-    name, start = _task_stack.pop()
+    stk = _task_stack()
+    key = tuple(name for name, start in stk)
+    name, start = stk.pop()
     duration = (end-start).total_seconds()
-    _times[key] += duration
+    with _times_lock:
+        _times[key] += duration
     if not verbose.value:
         return
-    indent = "  " * len(_task_stack)
+    indent = "  " * len(stk)
     message = "Finished" if success else "FAILED"
     log("{indent}{msg} {name} [duration={duration:.3}s]".format(indent=indent, msg=message, name=name, duration=duration))
 
@@ -56,16 +71,22 @@ def task(name, **kwargs):
 def event(name):
     if not verbose.value:
         return
-    indent = "  " * len(_task_stack)
+    indent = "  " * len(_task_stack())
     log("{indent}{name}".format(indent=indent, name=name))
 
+def current_tasks():
+    """The names of the current thread's active tasks, outermost first."""
+    return [name for (name, start) in _task_stack()]
+
 def dump_profile():
     duration = (datetime.datetime.now() - _begin).total_seconds()
     with open("/tmp/cozy.profile", "w") as f:
         f.write("Total duration: {:.3} seconds\n".format(duration))
-        f.write("Currently in: {}\n\n".format(", ".join(name for (name, start) in _task_stack)))
-        for k in sorted(_times.keys(), key=_times.get, reverse=True):
-            f.write("{:16.3}".format(_times[k]))
+        f.write("Currently in: {}\n\n".format(", ".join(current_tasks())))
+        with _times_lock:
+            times = dict(_times)
+        for k in sorted(times.keys(), key=times.get, reverse=True):
+            f.write("{:16.3}".format(times[k]))
             f.write(" ")
             f.write(", ".join(k))
             f.write("\n")
@@ -33,6 +33,7 @@ def run():
     parser = argparse.ArgumentParser(description='Data structure synthesizer.')
     parser.add_argument("-S", "--save", metavar="FILE", type=str, default=None, help="Save synthesis output")
     parser.add_argument("-R", "--resume", action="store_true", help="Resume from saved synthesis output")
+    parser.add_argument("-I", "--incremental", metavar="FILE", type=str, default=None, help="Reuse the still-valid parts of saved synthesis output (see --save) for an edited specification")
     parser.add_argument("-t", "--timeout", metavar="N", type=float, default=60, help="Per-query synthesis timeout (in seconds); default=60")
     parser.add_argument("-s", "--simple", action="store_true", help="Do not synthesize improved solution; use the most trivial implementation of the spec")
     parser.add_argument("-p", "--port", metavar="P", type=int, default=None, help="Port to run progress-showing HTTP server")
@@ -52,6 +53,7 @@ def run():
     args = parser.parse_args()
     opts.read(args)
 
+    finished_queries = set()
     if args.resume:
         with common.open_maybe_stdin(args.file or "-", mode="rb") as f:
             ast = pickle.load(f)
@@ -89,6 +91,13 @@ def run():
 
         ast = synthesis.construct_initial_implementation(ast)
 
+        if args.incremental:
+            with open(args.incremental, "rb") as f:
+                old_impl = pickle.load(f)
+            print("Checking reusable implementations from file {}...".format(args.incremental))
+            finished_queries = synthesis.reuse_implementation(ast, old_impl)
+            print("Reused {}/{} query implementations".format(len(finished_queries), len(ast.query_specs)))
+
     start = datetime.datetime.now()
 
     if not args.simple:
@@ -135,7 +144,8 @@ def run():
         ast = synthesis.improve_implementation(
             ast,
             timeout           = datetime.timedelta(seconds=args.timeout),
-            progress_callback = callback)
+            progress_callback = callback,
+            finished_queries  = finished_queries)
 
         if server is not None:
             server.join()
@@ -49,3 +49,16 @@ def read(args):
             o.value = not o.value
         if o.type is int:
             o.value = int(o.value)
+
+def option_values() -> {str : object}:
+    """The current value of every Option, by name."""
+    return { o.name : o.value for o in _OPTS }
+
+def set_option_values(values : {str : object}):
+    """Set Options from the output of `option_values`.
+
+    Names that do not belong to any Option defined so far are ignored.
+    """
+    for o in _OPTS:
+        if o.name in values:
+            o.value = values[o.name]
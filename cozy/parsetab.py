@@ -0,0 +1,166 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'specnonassocKW_ELSEOP_COLONleftOP_SEMICOLONleftOP_COMMAleftOP_QUESTIONleftOP_IMPLIESleftKW_ANDKW_ORleftOP_EQOP_NEOP_LTOP_LEOP_GTOP_GEleftOP_PLUSOP_MINUSleftOP_TIMESOP_DIVIDEleftKW_INleftKW_NOTKW_DISTINCTKW_UNIQUEKW_EMPTYKW_EXISTSKW_THEKW_MINKW_MAXKW_ARGMINKW_ARGMAXKW_SUMKW_ANYKW_ALLKW_LENKW_REVERSEDleftOP_OPEN_BRACKETleftOP_OPEN_PARENleftOP_DOTleftKW_OPKW_QUERYKW_PRIVATEDOCCOMMENT EXTERNCODETOKEN FLOAT KW_ALL KW_AND KW_ANY KW_ARGMAX KW_ARGMIN KW_ASSUME KW_DISTINCT KW_ELSE KW_EMPTY KW_ENUM KW_EXISTS KW_EXTERN KW_FALSE KW_HANDLETYPE KW_IF KW_IN KW_INVARIANT KW_LEN KW_LET KW_MAX KW_MIN KW_NATIVE KW_NOT KW_OP KW_OR KW_PRIVATE KW_QUERY KW_REVERSED KW_STATE KW_SUM KW_THE KW_TRUE KW_TYPE KW_UNIQUE NUM OP_ASSIGN OP_CLOSE_BRACE OP_CLOSE_BRACKET OP_CLOSE_PAREN OP_COLON OP_COMMA OP_DIVIDE OP_DOT OP_EQ OP_GE OP_GT OP_IMPLIES OP_LE OP_LEFT_ARROW OP_LT OP_MINUS OP_NE OP_OPEN_BRACE OP_OPEN_BRACKET OP_OPEN_PAREN OP_PLUS OP_QUESTION OP_RIGHT_ARROW OP_SEMICOLON OP_TIMES OP_VBAR STRINGLITERAL WORD_multisep0 : typedecl\n                    | typedecl empty _multisep0_multisep1 : WORD\n                    | WORD OP_COMMA _multisep1_multisep10 : comprehension_clause\n                    | comprehension_clause OP_COMMA _multisep10_multisep11 : method\n                    | method empty _multisep11_multisep2 : typedname\n                    | typedname OP_COMMA _multisep2_multisep3 : type\n                    | type OP_COMMA _multisep3_multisep4 : func\n                    | func empty _multisep4_multisep5 : statevar\n                    | statevar empty _multisep5_multisep6 : assume\n                    | assume empty _multisep6_multisep7 : invariant\n                    | invariant empty _multisep7_multisep8 : exp\n                    | exp OP_COMMA _multisep8_multisep9 : record_field\n                    | record_field OP_COMMA _multisep9assumes : empty\n                  | _multisep6comprehension_body : empty\n                  | _multisep10enum_cases : empty\n                  | _multisep1exp_list : empty\n                  | _multisep8funcdecls : empty\n                  | _multisep4invariants : empty\n                  | _multisep7methods : empty\n                  | _multisep11record_fields : empty\n                  | _multisep9states : empty\n                  | _multisep5typedecls : empty\n                  | _multisep0typednames : empty\n                  | _multisep2typelist : empty\n                  | _multisep3spec : externcode doccomment WORD OP_COLON typedecls funcdecls states invariants methods externcodedoccomment :\n                      | DOCCOMMENTexterncode :\n                      | EXTERNCODETOKENtypedecl : KW_TYPE WORD OP_ASSIGN type\n                    | KW_HANDLETYPE WORD OP_ASSIGN typetype : WORD\n                | WORD OP_LT type OP_GT\n                | OP_OPEN_BRACE typednames OP_CLOSE_BRACE\n                | KW_ENUM OP_OPEN_BRACE enum_cases OP_CLOSE_BRACE\n                | OP_OPEN_PAREN typelist OP_CLOSE_PAREN\n                | KW_NATIVE STRINGLITERALtypedname : WORD OP_COLON typefunc : KW_EXTERN WORD OP_OPEN_PAREN typednames OP_CLOSE_PAREN OP_COLON type OP_ASSIGN STRINGLITERALstatevar : KW_STATE WORD OP_COLON typeassume : KW_ASSUME exp OP_SEMICOLONinvariant : KW_INVARIANT exp OP_SEMICOLONexp : STRINGLITERALlambda : OP_OPEN_BRACE WORD OP_RIGHT_ARROW exp OP_CLOSE_BRACEslice : exp\n                 | exp OP_COLON\n                 | OP_COLON exp\n                 | exp OP_COLON expexp : WORD\n               | NUM\n               | FLOAT\n               | KW_TRUE\n               | KW_FALSE\n               | exp OP_EQ exp\n               | exp OP_NE exp\n               | exp OP_LT exp\n               | exp OP_LE exp\n               | exp OP_GT exp\n               | exp OP_GE exp\n               | exp KW_AND exp\n               | exp KW_OR exp\n               | KW_NOT exp\n               | exp OP_IMPLIES exp\n               | exp OP_PLUS  exp\n               | exp OP_MINUS exp\n               | OP_MINUS exp\n               | exp OP_TIMES exp\n               | exp OP_DIVIDE exp\n               | exp OP_QUESTION exp OP_COLON exp\n               | exp OP_DOT NUM\n               | exp OP_DOT WORD\n               | OP_OPEN_PAREN exp_list OP_CLOSE_PAREN\n               | OP_OPEN_BRACE record_fields OP_CLOSE_BRACE\n               | OP_OPEN_BRACKET exp OP_CLOSE_BRACKET\n               | OP_OPEN_BRACKET exp OP_VBAR comprehension_body OP_CLOSE_BRACKET\n               | exp OP_OPEN_BRACKET slice OP_CLOSE_BRACKET\n               | KW_REVERSED exp\n               | KW_LET OP_OPEN_BRACE WORD OP_ASSIGN exp OP_CLOSE_BRACE KW_IN exp\n               | WORD OP_OPEN_PAREN exp_list OP_CLOSE_PAREN\n               | KW_SUM exp\n               | KW_LEN exp\n               | KW_EMPTY exp\n               | KW_EXISTS exp\n               | KW_ALL exp\n               | KW_ANY exp\n               | KW_DISTINCT exp\n               | KW_UNIQUE exp\n               | KW_THE exp\n               | exp KW_IN exp\n               | KW_MIN exp\n               | KW_MAX exp\n               | KW_ARGMIN lambda exp\n               | KW_ARGMAX lambda exp\n        record_field : WORD OP_COLON expcomprehension_clause : WORD OP_LEFT_ARROW exp\n                                | expaccesschain : WORD\n                       | accesschain OP_DOT WORDvisibility :\n                      | KW_PRIVATEmethod : doccomment            KW_OP    WORD OP_OPEN_PAREN typednames OP_CLOSE_PAREN assumes stm\n                  | doccomment visibility KW_QUERY WORD OP_OPEN_PAREN typednames OP_CLOSE_PAREN assumes expmaybeelse :\n                     | KW_ELSE blockblock : OP_OPEN_BRACE stm OP_CLOSE_BRACEbasicstm : accesschain OP_OPEN_PAREN exp_list OP_CLOSE_PAREN OP_SEMICOLON\n                    | accesschain OP_ASSIGN exp OP_SEMICOLON\n                    | KW_IF exp block maybeelse\n                    | KW_LET WORD OP_ASSIGN exp OP_SEMICOLONstm :\n               | basicstm stmempty :'
+    
+_lr_action_items = {'DOCCOMMENT':([0,2,3,7,8,9,10,11,14,15,16,17,22,23,24,25,29,32,33,34,35,39,41,42,47,52,55,56,57,58,59,60,81,95,100,101,102,121,122,133,135,136,137,138,139,140,141,142,143,144,145,149,154,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,199,200,207,209,225,227,233,239,240,241,242,243,248,249,256,257,263,264,265,269,273,274,278,279,280,281,],[-52,5,-53,-136,-136,-43,-44,-1,-136,-33,-34,-13,-136,-41,-42,-15,-2,5,-35,-36,-19,-14,-56,-54,-55,-136,-67,-73,-74,-75,-76,-77,-16,-61,5,-20,-66,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-64,-58,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-57,-59,-100,-103,-93,-99,-136,-63,-134,-25,-26,-17,-125,-134,-102,-135,-18,-65,-126,-127,-131,-132,-130,-128,-129,-133,]),'WORD':([0,2,3,4,5,12,13,18,26,30,31,36,40,43,45,61,62,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,82,88,90,96,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,134,146,147,148,150,152,160,162,182,186,188,189,191,197,201,203,205,206,219,220,224,228,229,233,238,240,241,242,243,244,245,246,249,251,252,255,258,259,260,263,264,269,270,271,273,274,278,279,280,281,],[-52,-50,-53,6,-51,20,21,28,38,41,41,56,83,83,41,56,56,56,131,56,56,56,56,56,56,56,56,56,56,56,56,56,41,41,158,161,56,56,56,56,56,56,56,56,56,56,56,56,56,56,179,56,56,56,192,56,194,56,41,83,41,204,56,56,131,56,218,41,158,83,56,56,56,56,83,218,56,-136,-68,247,-25,-26,-17,56,-136,56,247,56,262,56,56,56,268,-18,-65,-127,247,56,-131,-132,-130,-128,-129,-133,]),'EXTERNCODETOKEN':([0,7,8,9,10,11,14,15,16,17,22,23,24,25,29,32,33,34,35,39,41,42,47,49,50,51,52,55,56,57,58,59,60,81,95,101,102,121,122,133,135,136,137,138,139,140,141,142,143,144,145,149,154,159,163,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,199,200,207,209,225,227,233,239,240,241,242,243,248,249,256,257,263,264,265,269,273,274,278,279,280,281,],[3,-136,-136,-43,-44,-1,-136,-33,-34,-13,-136,-41,-42,-15,-2,-136,-35,-36,-19,-14,-56,-54,-55,3,-37,-38,-7,-67,-73,-74,-75,-76,-77,-16,-61,-20,-66,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-64,-58,-60,-8,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-57,-59,-100,-103,-93,-99,-136,-63,-134,-25,-26,-17,-125,-134,-102,-135,-18,-65,-126,-127,-131,-132,-130,-128,-129,-133,]),'$end':([1,3,7,8,9,10,11,14,15,16,17,22,23,24,25,29,32,33,34,35,39,41,42,47,49,50,51,52,55,56,57,58,59,60,81,95,99,101,102,121,122,133,135,136,137,138,139,140,141,142,143,144,145,149,154,159,163,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,199,200,207,209,225,227,233,239,240,241,242,243,248,249,256,257,263,264,265,269,273,274,278,279,280,281,],[0,-53,-136,-136,-43,-44,-1,-136,-33,-34,-13,-136,-41,-42,-15,-2,-136,-35,-36,-19,-14,-56,-54,-55,-52,-37,-38,-7,-67,-73,-74,-75,-76,-77,-16,-61,-49,-20,-66,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-64,-58,-60,-8,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-57,-59,-100,-103,-93,-99,-136,-63,-134,-25,-26,-17,-125,-134,-102,-135,-18,-65,-126,-127,-131,-132,-130,-128,-129,-133,]),'KW_OP':([5,7,8,9,10,11,14,15,16,17,22,23,24,25,29,32,33,34,35,39,41,42,47,48,52,55,56,57,58,59,60,81,95,100,101,102,121,122,133,135,136,137,138,139,140,141,142,143,144,145,149,154,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,199,200,207,209,225,227,233,239,240,241,242,243,248,249,256,257,263,264,265,269,273,274,278,279,280,281,],[-51,-136,-136,-43,-44,-1,-136,-33,-34,-13,-136,-41,-42,-15,-2,-50,-35,-36,-19,-14,-56,-54,-55,96,-136,-67,-73,-74,-75,-76,-77,-16,-61,-50,-20,-66,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-64,-58,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-57,-59,-100,-103,-93,-99,-136,-63,-134,-25,-26,-17,-125,-134,-102,-135,-18,-65,-126,-127,-131,-132,-130,-128,-129,-133,]),'KW_PRIVATE':([5,7,8,9,10,11,14,15,16,17,22,23,24,25,29,32,33,34,35,39,41,42,47,48,52,55,56,57,58,59,60,81,95,100,101,102,121,122,133,135,136,137,138,139,140,141,142,143,144,145,149,154,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,199,200,207,209,225,227,233,239,240,241,242,243,248,249,256,257,263,264,265,269,273,274,278,279,280,281,],[-51,-136,-136,-43,-44,-1,-136,-33,-34,-13,-136,-41,-42,-15,-2,-50,-35,-36,-19,-14,-56,-54,-55,98,-136,-67,-73,-74,-75,-76,-77,-16,-61,-50,-20,-66,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-64,-58,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-57,-59,-100,-103,-93,-99,-136,-63,-134,-25,-26,-17,-125,-134,-102,-135,-18,-65,-126,-127,-131,-132,-130,-128,-129,-133,]),'KW_QUERY':([5,7,8,9,10,11,14,15,16,17,22,23,24,25,29,32,33,34,35,39,41,42,47,48,52,55,56,57,58,59,60,81,95,97,98,100,101,102,121,122,133,135,136,137,138,139,140,141,142,143,144,145,149,154,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,199,200,207,209,225,227,233,239,240,241,242,243,248,249,256,257,263,264,265,269,273,274,278,279,280,281,],[-51,-136,-136,-43,-44,-1,-136,-33,-34,-13,-136,-41,-42,-15,-2,-50,-35,-36,-19,-14,-56,-54,-55,-123,-136,-67,-73,-74,-75,-76,-77,-16,-61,162,-124,-50,-20,-66,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-64,-58,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-57,-59,-100,-103,-93,-99,-136,-63,-134,-25,-26,-17,-125,-134,-102,-135,-18,-65,-126,-127,-131,-132,-130,-128,-129,-133,]),'OP_COLON':([6,38,55,56,57,58,59,60,83,118,121,122,131,133,135,136,137,138,139,140,141,142,143,144,145,151,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,209,225,227,256,],[7,82,-67,-73,-74,-75,-76,-77,150,182,-86,-90,189,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,197,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,205,-94,-95,206,-113,-96,-97,-98,-116,-117,-100,-103,-93,-99,-102,]),'KW_EXTERN':([7,8,9,10,11,17,27,29,41,42,47,95,154,159,199,200,239,],[-136,18,-43,-44,-1,-136,18,-2,-56,-54,-55,-61,-58,-60,-57,-59,-63,]),'KW_STATE':([7,8,9,10,11,14,15,16,17,25,29,37,39,41,42,47,95,149,154,159,199,200,239,],[-136,-136,-43,-44,-1,26,-33,-34,-13,-136,-2,26,-14,-56,-54,-55,-61,-64,-58,-60,-57,-59,-63,]),'KW_INVARIANT':([7,8,9,10,11,14,15,16,17,22,23,24,25,29,35,39,41,42,47,53,81,95,102,149,154,159,199,200,239,],[-136,-136,-43,-44,-1,-136,-33,-34,-13,36,-41,-42,-15,-2,-136,-14,-56,-54,-55,36,-16,-61,-66,-64,-58,-60,-57,-59,-63,]),'KW_TYPE':([7,11,19,41,42,47,95,154,159,199,200,],[12,-136,12,-56,-54,-55,-61,-58,-60,-57,-59,]),'KW_HANDLETYPE':([7,11,19,41,42,47,95,154,159,199,200,],[13,-136,13,-56,-54,-55,-61,-58,-60,-57,-59,]),'OP_ASSIGN':([20,21,41,95,154,159,192,199,200,221,247,250,262,268,],[30,31,-56,-61,-58,-60,219,-57,-59,232,-121,259,271,-122,]),'OP_OPEN_PAREN':([28,30,31,36,45,56,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,82,88,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,150,160,161,182,186,189,191,197,204,205,206,218,219,220,228,229,238,241,242,243,244,245,246,247,250,251,255,258,259,263,264,268,271,],[40,45,45,63,45,120,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,45,45,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,45,45,203,63,63,63,63,45,224,63,63,120,63,63,63,63,-68,-25,-26,-17,63,-136,63,-121,258,63,63,63,63,-18,-65,-122,63,]),'OP_OPEN_BRACE':([30,31,36,44,45,55,56,57,58,59,60,61,62,63,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,82,88,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,121,122,133,135,136,137,138,139,140,141,142,143,144,145,146,148,150,160,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,182,183,185,186,187,189,190,191,193,195,197,205,206,207,209,219,220,225,227,228,229,238,241,242,243,244,245,246,251,255,256,258,259,261,263,264,271,275,],[43,43,64,90,43,-67,-73,-74,-75,-76,-77,64,64,64,64,64,134,64,64,64,64,64,64,64,64,64,64,64,147,147,43,43,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,64,64,43,43,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,64,-113,-96,64,-97,64,-98,64,-116,-117,43,64,64,-100,-103,64,64,-93,-99,64,64,-68,-25,-26,-17,64,-136,64,64,64,-102,64,64,270,-18,-65,64,270,]),'KW_ENUM':([30,31,45,82,88,150,160,197,],[44,44,44,44,44,44,44,44,]),'KW_NATIVE':([30,31,45,82,88,150,160,197,],[46,46,46,46,46,46,46,46,]),'STRINGLITERAL':([36,46,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,232,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[55,95,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,239,-68,-25,-26,-17,55,-136,55,55,55,55,55,-18,-65,55,]),'NUM':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,178,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,-68,-25,-26,-17,57,-136,57,57,57,57,57,-18,-65,57,]),'FLOAT':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,-68,-25,-26,-17,58,-136,58,58,58,58,58,-18,-65,58,]),'KW_TRUE':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,-68,-25,-26,-17,59,-136,59,59,59,59,59,-18,-65,59,]),'KW_FALSE':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,-68,-25,-26,-17,60,-136,60,60,60,60,60,-18,-65,60,]),'KW_NOT':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,-68,-25,-26,-17,61,-136,61,61,61,61,61,-18,-65,61,]),'OP_MINUS':([36,54,55,56,57,58,59,60,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,146,148,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,182,183,185,186,187,189,190,191,193,195,205,206,207,208,209,212,213,218,219,220,225,226,227,228,229,230,231,236,238,241,242,243,244,245,246,251,254,255,256,258,259,261,263,264,265,267,271,277,],[62,113,-67,-73,-74,-75,-76,-77,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,-86,-90,113,113,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,62,62,113,113,113,113,113,113,113,113,113,-88,-89,-91,-92,113,-94,-95,113,62,-113,-96,62,-97,62,-98,62,-116,-117,62,62,-100,113,-103,113,113,-73,62,62,113,113,-99,62,62,113,113,113,-68,-25,-26,-17,62,-136,62,62,113,62,-102,62,62,113,-18,-65,113,113,62,113,]),'OP_OPEN_BRACKET':([36,54,55,56,57,58,59,60,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,146,148,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,182,183,185,186,187,189,190,191,193,195,205,206,207,208,209,212,213,218,219,220,225,226,227,228,229,230,231,236,238,241,242,243,244,245,246,251,254,255,256,258,259,261,263,264,265,267,271,277,],[65,118,-67,-73,-74,-75,-76,-77,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,118,118,118,118,118,118,118,118,118,118,118,118,118,118,118,118,65,65,118,118,118,118,118,118,118,118,118,118,118,118,118,118,-94,-95,118,65,118,-96,65,-97,65,-98,65,118,118,65,65,-100,118,-103,118,118,-73,65,65,118,118,-99,65,65,118,118,118,-68,-25,-26,-17,65,-136,65,65,118,65,118,65,65,118,-18,-65,118,118,65,118,]),'KW_REVERSED':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,-68,-25,-26,-17,66,-136,66,66,66,66,66,-18,-65,66,]),'KW_LET':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,233,238,240,241,242,243,244,245,246,249,251,255,258,259,263,264,269,270,271,273,274,278,279,280,281,],[67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,-136,-68,252,-25,-26,-17,67,-136,67,252,67,67,67,67,-18,-65,-127,252,67,-131,-132,-130,-128,-129,-133,]),'KW_SUM':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,-68,-25,-26,-17,68,-136,68,68,68,68,68,-18,-65,68,]),'KW_LEN':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,-68,-25,-26,-17,69,-136,69,69,69,69,69,-18,-65,69,]),'KW_EMPTY':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,-68,-25,-26,-17,70,-136,70,70,70,70,70,-18,-65,70,]),'KW_EXISTS':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,-68,-25,-26,-17,71,-136,71,71,71,71,71,-18,-65,71,]),'KW_ALL':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,-68,-25,-26,-17,72,-136,72,72,72,72,72,-18,-65,72,]),'KW_ANY':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,-68,-25,-26,-17,73,-136,73,73,73,73,73,-18,-65,73,]),'KW_DISTINCT':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,-68,-25,-26,-17,74,-136,74,74,74,74,74,-18,-65,74,]),'KW_UNIQUE':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,-68,-25,-26,-17,75,-136,75,75,75,75,75,-18,-65,75,]),'KW_THE':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,-68,-25,-26,-17,76,-136,76,76,76,76,76,-18,-65,76,]),'KW_MIN':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,-68,-25,-26,-17,77,-136,77,77,77,77,77,-18,-65,77,]),'KW_MAX':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,-68,-25,-26,-17,78,-136,78,78,78,78,78,-18,-65,78,]),'KW_ARGMIN':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,-68,-25,-26,-17,79,-136,79,79,79,79,79,-18,-65,79,]),'KW_ARGMAX':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,238,241,242,243,244,245,246,251,255,258,259,263,264,271,],[80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,-68,-25,-26,-17,80,-136,80,80,80,80,80,-18,-65,80,]),'OP_CLOSE_PAREN':([40,41,45,55,56,57,58,59,60,63,84,85,86,87,91,92,93,94,95,120,121,122,123,124,125,126,133,135,136,137,138,139,140,141,142,143,144,145,154,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,184,185,187,190,193,195,196,198,199,200,202,203,207,209,210,223,224,225,227,234,256,258,266,],[-136,-56,-136,-67,-73,-74,-75,-76,-77,-136,151,-45,-46,-9,159,-47,-48,-11,-61,-136,-86,-90,185,-31,-32,-21,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-58,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,209,-96,-97,-98,-116,-117,-62,-10,-57,-59,-12,-136,-100,-103,-22,233,-136,-93,-99,245,-102,-136,272,]),'OP_COMMA':([41,55,56,57,58,59,60,87,94,95,121,122,126,130,133,135,136,137,138,139,140,141,142,143,144,145,154,158,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,196,199,200,207,209,212,213,217,218,225,227,236,256,],[-56,-67,-73,-74,-75,-76,-77,152,160,-61,-86,-90,186,188,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-58,201,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-62,-57,-59,-100,-103,-118,-120,228,-73,-93,-99,-119,-102,]),'OP_GT':([41,54,55,56,57,58,59,60,95,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,153,154,159,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,199,200,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[-56,107,-67,-73,-74,-75,-76,-77,-61,-86,-90,107,107,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,199,-58,-60,-78,-79,-80,-81,-82,-83,107,107,107,-88,-89,-91,-92,107,-94,-95,107,-113,-96,-97,-98,-116,-117,-57,-59,-100,107,-103,107,107,-73,107,107,-99,107,107,107,107,-102,107,107,107,107,]),'OP_CLOSE_BRACE':([41,43,55,56,57,58,59,60,64,85,86,87,89,90,95,121,122,127,128,129,130,133,135,136,137,138,139,140,141,142,143,144,145,154,155,156,157,158,159,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,196,198,199,200,207,209,211,212,222,225,227,230,231,249,256,257,269,270,273,274,276,278,279,280,281,],[-56,-136,-67,-73,-74,-75,-76,-77,-136,-45,-46,-9,154,-136,-61,-86,-90,187,-39,-40,-23,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-58,200,-29,-30,-3,-60,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-62,-10,-57,-59,-100,-103,-24,-118,-4,-93,-99,237,238,-134,-102,-135,-127,-134,-131,-132,280,-130,-128,-129,-133,]),'OP_LT':([41,54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[88,105,-67,-73,-74,-75,-76,-77,-86,-90,105,105,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,105,105,105,-88,-89,-91,-92,105,-94,-95,105,-113,-96,-97,-98,-116,-117,-100,105,-103,105,105,-73,105,105,-99,105,105,105,105,-102,105,105,105,105,]),'OP_SEMICOLON':([54,55,56,57,58,59,60,121,122,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,207,209,225,227,254,256,267,272,277,],[102,-67,-73,-74,-75,-76,-77,-86,-90,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-100,-103,-93,-99,264,-102,273,278,281,]),'OP_EQ':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[103,-67,-73,-74,-75,-76,-77,-86,-90,103,103,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,103,103,103,-88,-89,-91,-92,103,-94,-95,103,-113,-96,-97,-98,-116,-117,-100,103,-103,103,103,-73,103,103,-99,103,103,103,103,-102,103,103,103,103,]),'OP_NE':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[104,-67,-73,-74,-75,-76,-77,-86,-90,104,104,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,104,104,104,-88,-89,-91,-92,104,-94,-95,104,-113,-96,-97,-98,-116,-117,-100,104,-103,104,104,-73,104,104,-99,104,104,104,104,-102,104,104,104,104,]),'OP_LE':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[106,-67,-73,-74,-75,-76,-77,-86,-90,106,106,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,106,106,106,-88,-89,-91,-92,106,-94,-95,106,-113,-96,-97,-98,-116,-117,-100,106,-103,106,106,-73,106,106,-99,106,106,106,106,-102,106,106,106,106,]),'OP_GE':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[108,-67,-73,-74,-75,-76,-77,-86,-90,108,108,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,108,108,108,-88,-89,-91,-92,108,-94,-95,108,-113,-96,-97,-98,-116,-117,-100,108,-103,108,108,-73,108,108,-99,108,108,108,108,-102,108,108,108,108,]),'KW_AND':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[109,-67,-73,-74,-75,-76,-77,-86,-90,109,109,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,109,-88,-89,-91,-92,109,-94,-95,109,-113,-96,-97,-98,-116,-117,-100,109,-103,109,109,-73,109,109,-99,109,109,109,109,-102,109,109,109,109,]),'KW_OR':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[110,-67,-73,-74,-75,-76,-77,-86,-90,110,110,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,110,-88,-89,-91,-92,110,-94,-95,110,-113,-96,-97,-98,-116,-117,-100,110,-103,110,110,-73,110,110,-99,110,110,110,110,-102,110,110,110,110,]),'OP_IMPLIES':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[111,-67,-73,-74,-75,-76,-77,-86,-90,111,111,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,111,-94,-95,111,-113,-96,-97,-98,-116,-117,-100,111,-103,111,111,-73,111,111,-99,111,111,111,111,-102,111,111,111,111,]),'OP_PLUS':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[112,-67,-73,-74,-75,-76,-77,-86,-90,112,112,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,112,112,112,112,112,112,112,112,112,-88,-89,-91,-92,112,-94,-95,112,-113,-96,-97,-98,-116,-117,-100,112,-103,112,112,-73,112,112,-99,112,112,112,112,-102,112,112,112,112,]),'OP_TIMES':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[114,-67,-73,-74,-75,-76,-77,-86,114,114,114,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,114,114,114,114,114,114,114,114,114,114,114,-91,-92,114,-94,-95,114,-113,-96,-97,-98,-116,-117,-100,114,-103,114,114,-73,114,114,-99,114,114,114,114,-102,114,114,114,114,]),'OP_DIVIDE':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[115,-67,-73,-74,-75,-76,-77,-86,115,115,115,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,115,115,115,115,115,115,115,115,115,115,115,-91,-92,115,-94,-95,115,-113,-96,-97,-98,-116,-117,-100,115,-103,115,115,-73,115,115,-99,115,115,115,115,-102,115,115,115,115,]),'OP_QUESTION':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,254,256,261,265,267,277,],[116,-67,-73,-74,-75,-76,-77,-86,-90,116,116,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,116,-94,-95,116,-113,-96,-97,-98,-116,-117,-100,116,-103,116,116,-73,116,116,-99,116,116,116,116,-102,116,116,116,116,]),'OP_DOT':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,247,250,254,256,261,265,267,268,277,],[117,-67,-73,-74,-75,-76,-77,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,117,-94,-95,117,117,-96,-97,-98,117,117,-100,117,-103,117,117,-73,117,117,-99,117,117,117,-121,260,117,117,117,117,117,-122,117,]),'KW_IN':([54,55,56,57,58,59,60,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,183,185,187,190,193,195,207,208,209,212,213,218,225,226,227,230,231,236,237,254,256,261,265,267,277,],[119,-67,-73,-74,-75,-76,-77,-86,119,119,119,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,119,119,119,119,119,119,119,119,119,119,119,119,119,119,-94,-95,119,-113,-96,-97,-98,-116,-117,-100,119,-103,119,119,-73,119,119,-99,119,119,119,246,119,-102,119,119,119,119,]),'OP_CLOSE_BRACKET':([55,56,57,58,59,60,121,122,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,180,181,183,185,187,190,191,193,195,206,207,208,209,213,214,215,216,217,218,225,226,227,235,236,256,],[-67,-73,-74,-75,-76,-77,-86,-90,190,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-69,207,-113,-96,-97,-98,-136,-116,-117,-70,-100,-71,-103,-120,227,-27,-28,-5,-73,-93,-72,-99,-6,-119,-102,]),'OP_VBAR':([55,56,57,58,59,60,121,122,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,178,179,183,185,187,190,193,195,207,209,225,227,256,],[-67,-73,-74,-75,-76,-77,-86,-90,191,-101,-104,-105,-106,-107,-108,-109,-110,-111,-112,-114,-115,-78,-79,-80,-81,-82,-83,-84,-85,-87,-88,-89,-91,-92,-94,-95,-113,-96,-97,-98,-116,-117,-100,-103,-93,-99,-102,]),'OP_RIGHT_ARROW':([194,],[220,]),'OP_LEFT_ARROW':([218,],[229,]),'KW_IF':([233,240,241,242,243,249,263,264,269,270,273,274,278,279,280,281,],[-136,251,-25,-26,-17,251,-18,-65,-127,251,-131,-132,-130,-128,-129,-133,]),'KW_ASSUME':([233,243,245,253,264,],[244,-136,244,244,-65,]),'KW_ELSE':([269,280,],[275,-129,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'spec':([0,],[1,]),'externcode':([0,49,],[2,99,]),'doccomment':([2,32,100,],[4,48,48,]),'typedecls':([7,],[8,]),'empty':([7,8,11,14,17,22,25,32,35,40,43,45,52,63,64,90,120,191,203,224,233,243,245,258,],[9,15,19,23,27,33,37,50,53,85,85,92,100,124,128,156,124,215,85,85,241,253,241,124,]),'_multisep0':([7,19,],[10,29,]),'typedecl':([7,19,],[11,11,]),'funcdecls':([8,],[14,]),'_multisep4':([8,27,],[16,39,]),'func':([8,27,],[17,17,]),'states':([14,],[22,]),'_multisep5':([14,37,],[24,81,]),'statevar':([14,37,],[25,25,]),'invariants':([22,],[32,]),'_multisep7':([22,53,],[34,101,]),'invariant':([22,53,],[35,35,]),'type':([30,31,45,82,88,150,160,197,],[42,47,94,149,153,196,94,221,]),'methods':([32,],[49,]),'_multisep11':([32,100,],[51,163,]),'method':([32,100,],[52,52,]),'exp':([36,61,62,63,65,66,68,69,70,71,72,73,74,75,76,77,78,103,104,105,106,107,108,109,110,111,112,113,114,115,116,118,119,120,146,148,182,186,189,191,205,206,219,220,228,229,244,246,251,255,258,259,271,],[54,121,122,126,132,133,135,136,137,138,139,140,141,142,143,144,145,164,165,166,167,168,169,170,171,172,173,174,175,176,177,180,183,126,193,195,208,126,212,213,225,226,230,231,213,236,254,256,261,265,126,267,277,]),'typednames':([40,43,203,224,],[84,89,223,234,]),'_multisep2':([40,43,152,203,224,],[86,86,198,86,86,]),'typedname':([40,43,152,203,224,],[87,87,87,87,87,]),'typelist':([45,],[91,]),'_multisep3':([45,160,],[93,202,]),'visibility':([48,],[97,]),'exp_list':([63,120,258,],[123,184,266,]),'_multisep8':([63,120,186,258,],[125,125,210,125,]),'record_fields':([64,],[127,]),'_multisep9':([64,188,],[129,211,]),'record_field':([64,188,],[130,130,]),'lambda':([79,80,],[146,148,]),'enum_cases':([90,],[155,]),'_multisep1':([90,201,],[157,222,]),'slice':([118,],[181,]),'comprehension_body':([191,],[214,]),'_multisep10':([191,228,],[216,235,]),'comprehension_clause':([191,228,],[217,217,]),'assumes':([233,245,],[240,255,]),'_multisep6':([233,245,253,],[242,242,263,]),'assume':([233,245,253,],[243,243,243,]),'stm':([240,249,270,],[248,257,276,]),'basicstm':([240,249,270,],[249,249,249,]),'accesschain':([240,249,270,],[250,250,250,]),'block':([261,275,],[269,279,]),'maybeelse':([269,],[274,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> spec","S'",1,None,None,None),
+  ('_multisep0 -> typedecl','_multisep0',1,'p__multisep0','parsetools.py',23),
+  ('_multisep0 -> typedecl empty _multisep0','_multisep0',3,'p__multisep0','parsetools.py',24),
+  ('_multisep1 -> WORD','_multisep1',1,'p__multisep1','parsetools.py',23),
+  ('_multisep1 -> WORD OP_COMMA _multisep1','_multisep1',3,'p__multisep1','parsetools.py',24),
+  ('_multisep10 -> comprehension_clause','_multisep10',1,'p__multisep10','parsetools.py',23),
+  ('_multisep10 -> comprehension_clause OP_COMMA _multisep10','_multisep10',3,'p__multisep10','parsetools.py',24),
+  ('_multisep11 -> method','_multisep11',1,'p__multisep11','parsetools.py',23),
+  ('_multisep11 -> method empty _multisep11','_multisep11',3,'p__multisep11','parsetools.py',24),
+  ('_multisep2 -> typedname','_multisep2',1,'p__multisep2','parsetools.py',23),
+  ('_multisep2 -> typedname OP_COMMA _multisep2','_multisep2',3,'p__multisep2','parsetools.py',24),
+  ('_multisep3 -> type','_multisep3',1,'p__multisep3','parsetools.py',23),
+  ('_multisep3 -> type OP_COMMA _multisep3','_multisep3',3,'p__multisep3','parsetools.py',24),
+  ('_multisep4 -> func','_multisep4',1,'p__multisep4','parsetools.py',23),
+  ('_multisep4 -> func empty _multisep4','_multisep4',3,'p__multisep4','parsetools.py',24),
+  ('_multisep5 -> statevar','_multisep5',1,'p__multisep5','parsetools.py',23),
+  ('_multisep5 -> statevar empty _multisep5','_multisep5',3,'p__multisep5','parsetools.py',24),
+  ('_multisep6 -> assume','_multisep6',1,'p__multisep6','parsetools.py',23),
+  ('_multisep6 -> assume empty _multisep6','_multisep6',3,'p__multisep6','parsetools.py',24),
+  ('_multisep7 -> invariant','_multisep7',1,'p__multisep7','parsetools.py',23),
+  ('_multisep7 -> invariant empty _multisep7','_multisep7',3,'p__multisep7','parsetools.py',24),
+  ('_multisep8 -> exp','_multisep8',1,'p__multisep8','parsetools.py',23),
+  ('_multisep8 -> exp OP_COMMA _multisep8','_multisep8',3,'p__multisep8','parsetools.py',24),
+  ('_multisep9 -> record_field','_multisep9',1,'p__multisep9','parsetools.py',23),
+  ('_multisep9 -> record_field OP_COMMA _multisep9','_multisep9',3,'p__multisep9','parsetools.py',24),
+  ('assumes -> empty','assumes',1,'p_assumes','parsetools.py',34),
+  ('assumes -> _multisep6','assumes',1,'p_assumes','parsetools.py',35),
+  ('comprehension_body -> empty','comprehension_body',1,'p_comprehension_body','parsetools.py',34),
+  ('comprehension_body -> _multisep10','comprehension_body',1,'p_comprehension_body','parsetools.py',35),
+  ('enum_cases -> empty','enum_cases',1,'p_enum_cases','parsetools.py',34),
+  ('enum_cases -> _multisep1','enum_cases',1,'p_enum_cases','parsetools.py',35),
+  ('exp_list -> empty','exp_list',1,'p_exp_list','parsetools.py',34),
+  ('exp_list -> _multisep8','exp_list',1,'p_exp_list','parsetools.py',35),
+  ('funcdecls -> empty','funcdecls',1,'p_funcdecls','parsetools.py',34),
+  ('funcdecls -> _multisep4','funcdecls',1,'p_funcdecls','parsetools.py',35),
+  ('invariants -> empty','invariants',1,'p_invariants','parsetools.py',34),
+  ('invariants -> _multisep7','invariants',1,'p_invariants','parsetools.py',35),
+  ('methods -> empty','methods',1,'p_methods','parsetools.py',34),
+  ('methods -> _multisep11','methods',1,'p_methods','parsetools.py',35),
+  ('record_fields -> empty','record_fields',1,'p_record_fields','parsetools.py',34),
+  ('record_fields -> _multisep9','record_fields',1,'p_record_fields','parsetools.py',35),
+  ('states -> empty','states',1,'p_states','parsetools.py',34),
+  ('states -> _multisep5','states',1,'p_states','parsetools.py',35),
+  ('typedecls -> empty','typedecls',1,'p_typedecls','parsetools.py',34),
+  ('typedecls -> _multisep0','typedecls',1,'p_typedecls','parsetools.py',35),
+  ('typednames -> empty','typednames',1,'p_typednames','parsetools.py',34),
+  ('typednames -> _multisep2','typednames',1,'p_typednames','parsetools.py',35),
+  ('typelist -> empty','typelist',1,'p_typelist','parsetools.py',34),
+  ('typelist -> _multisep3','typelist',1,'p_typelist','parsetools.py',35),
+  ('spec -> externcode doccomment WORD OP_COLON typedecls funcdecls states invariants methods externcode','spec',10,'p_spec','parse.py',193),
+  ('doccomment -> <empty>','doccomment',0,'p_doccomment','parse.py',197),
+  ('doccomment -> DOCCOMMENT','doccomment',1,'p_doccomment','parse.py',198),
+  ('externcode -> <empty>','externcode',0,'p_externcode','parse.py',202),
+  ('externcode -> EXTERNCODETOKEN','externcode',1,'p_externcode','parse.py',203),
+  ('typedecl -> KW_TYPE WORD OP_ASSIGN type','typedecl',4,'p_typedecl','parse.py',209),
+  ('typedecl -> KW_HANDLETYPE WORD OP_ASSIGN type','typedecl',4,'p_typedecl','parse.py',210),
+  ('type -> WORD','type',1,'p_type','parse.py',217),
+  ('type -> WORD OP_LT type OP_GT','type',4,'p_type','parse.py',218),
+  ('type -> OP_OPEN_BRACE typednames OP_CLOSE_BRACE','type',3,'p_type','parse.py',219),
+  ('type -> KW_ENUM OP_OPEN_BRACE enum_cases OP_CLOSE_BRACE','type',4,'p_type','parse.py',220),
+  ('type -> OP_OPEN_PAREN typelist OP_CLOSE_PAREN','type',3,'p_type','parse.py',221),
+  ('type -> KW_NATIVE STRINGLITERAL','type',2,'p_type','parse.py',222),
+  ('typedname -> WORD OP_COLON type','typedname',3,'p_typedname','parse.py',241),
+  ('func -> KW_EXTERN WORD OP_OPEN_PAREN typednames OP_CLOSE_PAREN OP_COLON type OP_ASSIGN STRINGLITERAL','func',9,'p_func','parse.py',248),
+  ('statevar -> KW_STATE WORD OP_COLON type','statevar',4,'p_statevar','parse.py',254),
+  ('assume -> KW_ASSUME exp OP_SEMICOLON','assume',3,'p_assume','parse.py',260),
+  ('invariant -> KW_INVARIANT exp OP_SEMICOLON','invariant',3,'p_invariant','parse.py',264),
+  ('exp -> STRINGLITERAL','exp',1,'p_exp_strlit','parse.py',288),
+  ('lambda -> OP_OPEN_BRACE WORD OP_RIGHT_ARROW exp OP_CLOSE_BRACE','lambda',5,'p_lambda','parse.py',292),
+  ('slice -> exp','slice',1,'p_slice','parse.py',296),
+  ('slice -> exp OP_COLON','slice',2,'p_slice','parse.py',297),
+  ('slice -> OP_COLON exp','slice',2,'p_slice','parse.py',298),
+  ('slice -> exp OP_COLON exp','slice',3,'p_slice','parse.py',299),
+  ('exp -> WORD','exp',1,'p_exp','parse.py',311),
+  ('exp -> NUM','exp',1,'p_exp','parse.py',312),
+  ('exp -> FLOAT','exp',1,'p_exp','parse.py',313),
+  ('exp -> KW_TRUE','exp',1,'p_exp','parse.py',314),
+  ('exp -> KW_FALSE','exp',1,'p_exp','parse.py',315),
+  ('exp -> exp OP_EQ exp','exp',3,'p_exp','parse.py',316),
+  ('exp -> exp OP_NE exp','exp',3,'p_exp','parse.py',317),
+  ('exp -> exp OP_LT exp','exp',3,'p_exp','parse.py',318),
+  ('exp -> exp OP_LE exp','exp',3,'p_exp','parse.py',319),
+  ('exp -> exp OP_GT exp','exp',3,'p_exp','parse.py',320),
+  ('exp -> exp OP_GE exp','exp',3,'p_exp','parse.py',321),
+  ('exp -> exp KW_AND exp','exp',3,'p_exp','parse.py',322),
+  ('exp -> exp KW_OR exp','exp',3,'p_exp','parse.py',323),
+  ('exp -> KW_NOT exp','exp',2,'p_exp','parse.py',324),
+  ('exp -> exp OP_IMPLIES exp','exp',3,'p_exp','parse.py',325),
+  ('exp -> exp OP_PLUS exp','exp',3,'p_exp','parse.py',326),
+  ('exp -> exp OP_MINUS exp','exp',3,'p_exp','parse.py',327),
+  ('exp -> OP_MINUS exp','exp',2,'p_exp','parse.py',328),
+  ('exp -> exp OP_TIMES exp','exp',3,'p_exp','parse.py',329),
+  ('exp -> exp OP_DIVIDE exp','exp',3,'p_exp','parse.py',330),
+  ('exp -> exp OP_QUESTION exp OP_COLON exp','exp',5,'p_exp','parse.py',331),
+  ('exp -> exp OP_DOT NUM','exp',3,'p_exp','parse.py',332),
+  ('exp -> exp OP_DOT WORD','exp',3,'p_exp','parse.py',333),
+  ('exp -> OP_OPEN_PAREN exp_list OP_CLOSE_PAREN','exp',3,'p_exp','parse.py',334),
+  ('exp -> OP_OPEN_BRACE record_fields OP_CLOSE_BRACE','exp',3,'p_exp','parse.py',335),
+  ('exp -> OP_OPEN_BRACKET exp OP_CLOSE_BRACKET','exp',3,'p_exp','parse.py',336),
+  ('exp -> OP_OPEN_BRACKET exp OP_VBAR comprehension_body OP_CLOSE_BRACKET','exp',5,'p_exp','parse.py',337),
+  ('exp -> exp OP_OPEN_BRACKET slice OP_CLOSE_BRACKET','exp',4,'p_exp','parse.py',338),
+  ('exp -> KW_REVERSED exp','exp',2,'p_exp','parse.py',339),
+  ('exp -> KW_LET OP_OPEN_BRACE WORD OP_ASSIGN exp OP_CLOSE_BRACE KW_IN exp','exp',8,'p_exp','parse.py',340),
+  ('exp -> WORD OP_OPEN_PAREN exp_list OP_CLOSE_PAREN','exp',4,'p_exp','parse.py',341),
+  ('exp -> KW_SUM exp','exp',2,'p_exp','parse.py',342),
+  ('exp -> KW_LEN exp','exp',2,'p_exp','parse.py',343),
+  ('exp -> KW_EMPTY exp','exp',2,'p_exp','parse.py',344),
+  ('exp -> KW_EXISTS exp','exp',2,'p_exp','parse.py',345),
+  ('exp -> KW_ALL exp','exp',2,'p_exp','parse.py',346),
+  ('exp -> KW_ANY exp','exp',2,'p_exp','parse.py',347),
+  ('exp -> KW_DISTINCT exp','exp',2,'p_exp','parse.py',348),
+  ('exp -> KW_UNIQUE exp','exp',2,'p_exp','parse.py',349),
+  ('exp -> KW_THE exp','exp',2,'p_exp','parse.py',350),
+  ('exp -> exp KW_IN exp','exp',3,'p_exp','parse.py',351),
+  ('exp -> KW_MIN exp','exp',2,'p_exp','parse.py',352),
+  ('exp -> KW_MAX exp','exp',2,'p_exp','parse.py',353),
+  ('exp -> KW_ARGMIN lambda exp','exp',3,'p_exp','parse.py',354),
+  ('exp -> KW_ARGMAX lambda exp','exp',3,'p_exp','parse.py',355),
+  ('record_field -> WORD OP_COLON exp','record_field',3,'p_record_field','parse.py',423),
+  ('comprehension_clause -> WORD OP_LEFT_ARROW exp','comprehension_clause',3,'p_comprehension_clause','parse.py',429),
+  ('comprehension_clause -> exp','comprehension_clause',1,'p_comprehension_clause','parse.py',430),
+  ('accesschain -> WORD','accesschain',1,'p_accesschain','parse.py',439),
+  ('accesschain -> accesschain OP_DOT WORD','accesschain',3,'p_accesschain','parse.py',440),
+  ('visibility -> <empty>','visibility',0,'p_visibility','parse.py',447),
+  ('visibility -> KW_PRIVATE','visibility',1,'p_visibility','parse.py',448),
+  ('method -> doccomment KW_OP WORD OP_OPEN_PAREN typednames OP_CLOSE_PAREN assumes stm','method',8,'p_method','parse.py',455),
+  ('method -> doccomment visibility KW_QUERY WORD OP_OPEN_PAREN typednames OP_CLOSE_PAREN assumes exp','method',9,'p_method','parse.py',456),
+  ('maybeelse -> <empty>','maybeelse',0,'p_maybeelse','parse.py',465),
+  ('maybeelse -> KW_ELSE block','maybeelse',2,'p_maybeelse','parse.py',466),
+  ('block -> OP_OPEN_BRACE stm OP_CLOSE_BRACE','block',3,'p_block','parse.py',473),
+  ('basicstm -> accesschain OP_OPEN_PAREN exp_list OP_CLOSE_PAREN OP_SEMICOLON','basicstm',5,'p_basicstm','parse.py',477),
+  ('basicstm -> accesschain OP_ASSIGN exp OP_SEMICOLON','basicstm',4,'p_basicstm','parse.py',478),
+  ('basicstm -> KW_IF exp block maybeelse','basicstm',4,'p_basicstm','parse.py',479),
+  ('basicstm -> KW_LET WORD OP_ASSIGN exp OP_SEMICOLON','basicstm',5,'p_basicstm','parse.py',480),
+  ('stm -> <empty>','stm',0,'p_stm','parse.py',493),
+  ('stm -> basicstm stm','stm',2,'p_stm','parse.py',494),
+  ('empty -> <empty>','empty',0,'p_empty','parse.py',504),
+]
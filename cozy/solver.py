@@ -9,30 +9,61 @@ Important functions and classes:
 """
 
 from collections import defaultdict, OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from fractions import Fraction
 from functools import lru_cache
+import os
+import pickle
+import queue
+import random
+import select
+import subprocess
+import sys
 import threading
+import time
+import traceback
 
 import z3
 
 from cozy.target_syntax import *
-from cozy.syntax_tools import BottomUpExplorer, pprint, free_vars, free_funcs, cse, all_exps, purify
+from cozy.syntax_tools import BottomUpExplorer, pprint, free_vars, free_funcs, cse, all_exps, purify, hash_cons
 from cozy.typecheck import is_collection, is_numeric
 from cozy.common import declare_case, fresh_name, Visitor, FrozenDict, typechecked, extend, OrderedSet, make_random_access
 from cozy import evaluation
-from cozy.opts import Option
+from cozy.opts import Option, option_values, set_option_values
 from cozy.structures import extension_handler
-from cozy.logging import task
-from cozy.value_types import Map, Bag, Handle
+from cozy.logging import task, event, current_tasks
+from cozy.value_types import Map, Bag, Handle, bag_distinct
 from cozy.evaluation import eval_bulk
 from cozy.contexts import Context
+from cozy.solver_cache import SolverCache, context_key, query_key, solver_cache_dir
+from cozy.solver_trace import current_trace
 
 collection_depth_opt = Option("collection-depth", int, 4, metavar="N", description="Bound for bounded verification")
+translation_cache_size = Option("solver-translation-cache-size", int, 50000, metavar="N", description="Number of translated subexpressions each solver remembers between queries (0 to disable)")
+random_testing_budget = Option("random-testing-budget", int, 32, metavar="N", description="Number of random inputs to try before asking Z3 to satisfy a formula (0 to disable)")
+solver_portfolio = Option("solver-portfolio", bool, False, description="Race several solver configurations (collection depths, encodings, and logics) in parallel processes and take the first definitive answer")
+example_cache_size = Option("solver-example-cache-size", int, 256, metavar="N", description="Number of models each caching solver keeps for answering future queries without Z3")
+reuse_solvers = Option("solver-pool", bool, True, description="Reuse Z3 contexts between one-shot calls to satisfy, satisfiable, and valid")
 use_quantified_encoding = Option("quantified-encoding", bool, False, description="Allow the use of quantifiers during formula encoding. The resulting formulas are still decideable using Z3's macro_finder option. Enabling this option offloads work from Python to Z3. Generally it harms performance.")
 
 class SolverReportedUnknown(Exception):
     pass
 
+class _Unknown(object):
+    def __repr__(self):
+        return "UNKNOWN"
+
+# Stands for a formula the solver could not answer in the results of
+# satisfy_all (and friends) when called with raise_on_unknown=False.
+UNKNOWN = _Unknown()
+
+def _raise_on_unknown(results):
+    if any(res is UNKNOWN for res in results):
+        raise SolverReportedUnknown("z3 reported unknown")
+    return results
+
 class ModelValidationError(Exception):
     pass
 
@@ -236,6 +267,50 @@ class ToZ3(Visitor):
         assert to_bool(self.false) is False
         assert to_bool(self.int_zero) is None
 
+        # See `translate`.
+        self.memo = None
+        self.memo_env = None
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.memo_time_saved = 0.0
+
+    def translate(self, e, env, memo):
+        """Translate `e` under `env`, reusing earlier translations.
+
+        `memo` maps ids of interned expressions to (exp, Z3 value, seconds
+        spent, Z3 values of its free variables) tuples and is updated in
+        place.  An entry is only reused where the expression's free variables
+        are bound to the same Z3 values as when it was recorded, so one memo
+        stays correct as variables come and go (e.g. across push and pop).
+        """
+        self.memo = memo
+        self.memo_env = env
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.memo_time_saved = 0.0
+        try:
+            return self.visit(e, env)
+        finally:
+            self.memo = None
+            self.memo_env = None
+
+    def _visit_memoized(self, e, env):
+        fvs = free_vars(e)
+        entry = self.memo.get(id(e))
+        if entry is not None and all(env.get(v.id) is z for (v, z) in zip(fvs, entry[3])):
+            self.memo_hits += 1
+            self.memo_time_saved += entry[2]
+            return entry[1]
+        root = self.memo_env
+        if env is not root and any(env.get(v.id) is not root.get(v.id) for v in fvs):
+            # depends on a binder; not worth remembering
+            return super().visit(e, env)
+        self.memo_misses += 1
+        start = time.perf_counter()
+        res = super().visit(e, env)
+        self.memo[id(e)] = (e, res, time.perf_counter() - start, tuple(env.get(v.id) for v in fvs))
+        return res
+
     def bool_to_z3(self, b):
         return self.true if b else self.false
 
@@ -839,6 +914,8 @@ class ToZ3(Visitor):
         return z3.BoolVal(e, self.ctx)
     def visit(self, e, *args):
         try:
+            if self.memo is not None and isinstance(e, Exp) and e._interned:
+                return self._visit_memoized(e, *args)
             return super().visit(e, *args)
         except KeyboardInterrupt:
             raise
@@ -970,21 +1047,22 @@ DECIDABLE_TYPES = set([TInt, TLong, TBool, TString, TEnum, TNative, TReal, TFloa
 def decideable(t : Type):
     return type(t) in DECIDABLE_TYPES
 
-_start = None
+_timing = threading.local()
 _debug_duration = timedelta(seconds=5)
 def _tick():
-    global _start
-    _start = datetime.now()
+    _timing.start = datetime.now()
 
 def _tock(e, event):
-    global _start
     now = datetime.now()
-    elapsed = now - _start
-    _start = now
+    elapsed = now - _timing.start
+    _timing.start = now
     if elapsed > _debug_duration:
         print("WARNING: took {elapsed}s to {event}".format(event=event, elapsed=elapsed.total_seconds()))
 
-_LOCK = threading.RLock()
+# Guards the creation of Z3 contexts.  Everything else is guarded by the lock
+# of the IncrementalSolver that owns the context, so that solvers in different
+# threads can run concurrently.  (Z3 releases the GIL while it works.)
+_CONTEXT_LOCK = threading.Lock()
 
 class ExtractedFunc(object):
     def __init__(self, cases, default):
@@ -996,11 +1074,66 @@ class ExtractedFunc(object):
         return repr(self)
     def __call__(self, *args):
         return self.cases.get(args, self.default)
+    def __eq__(self, other):
+        return isinstance(other, ExtractedFunc) and self.cases == other.cases and self.default == other.default
+    def __hash__(self):
+        return hash((frozenset(self.cases.items()), self.default))
+
+def _random_value(t : Type, min_size : int, max_size : int, rng : random.Random, heap : dict):
+    """Produce a random value of type `t`.
+
+    Values are drawn from (a small part of) the space that the solver searches:
+    collections have between `min_size` and `max_size` elements and strings
+    follow the solver's encoding.  `heap` maps (handle type, address) pairs to
+    values so that handles with the same address agree.
+    """
+    if t == INT or t == LONG:
+        return rng.randint(-max_size, max_size)
+    elif t == REAL or t == FLOAT:
+        return Fraction(rng.randint(-max_size, max_size))
+    elif t == BOOL:
+        return rng.random() < 0.5
+    elif t == STRING:
+        return "a" * rng.randint(0, max_size)
+    elif isinstance(t, TNative):
+        return (t.name, rng.randint(0, max_size))
+    elif isinstance(t, TEnum):
+        return rng.choice(t.cases)
+    elif isinstance(t, TBag) or isinstance(t, TSet) or isinstance(t, TList):
+        elems = [_random_value(t.elem_type, min_size, max_size, rng, heap) for i in range(rng.randint(min_size, max_size))]
+        if isinstance(t, TList):
+            return tuple(elems)
+        if isinstance(t, TSet):
+            elems = bag_distinct(t.elem_type, elems)
+        return Bag(elems)
+    elif isinstance(t, TMap):
+        res = Map(t, evaluation.mkval(t.v))
+        keys = [_random_value(t.k, min_size, max_size, rng, heap) for i in range(rng.randint(0, max_size))]
+        for k in bag_distinct(t.k, keys):
+            res[k] = _random_value(t.v, min_size, max_size, rng, heap)
+        return res
+    elif isinstance(t, TRecord):
+        return FrozenDict([(f, _random_value(tt, min_size, max_size, rng, heap)) for (f, tt) in t.fields])
+    elif isinstance(t, TTuple):
+        return tuple(_random_value(tt, min_size, max_size, rng, heap) for tt in t.ts)
+    elif isinstance(t, THandle):
+        addr = rng.randint(0, max_size)
+        k = (t, addr)
+        if k not in heap:
+            heap[k] = _random_value(t.value_type, min_size, max_size, rng, heap)
+        return Handle(addr, heap[k])
+    elif isinstance(t, TFunc):
+        return ExtractedFunc({}, _random_value(t.ret_type, min_size, max_size, rng, heap))
+    h = extension_handler(type(t))
+    if h is not None:
+        return _random_value(h.encoding_type(t), min_size, max_size, rng, heap)
+    raise NotImplementedError(t)
 
 class IncrementalSolver(object):
     SAVE_PROPS = [
         "vars",
         "funcs",
+        "assumptions",
         "_env"]
 
     def __init__(self,
@@ -1023,11 +1156,21 @@ class IncrementalSolver(object):
         self.collection_depth = collection_depth
         self.validate_model = validate_model
         self.model_callback = model_callback
+        self.logic = logic
+        self.timeout = timeout
+        self.assumptions = []
         self._env = OrderedDict()
+        self._z3_vars = { }      # (name, type) -> (Z3 value, [Z3 assertions])
+        self._translations = { } # see ToZ3.translate
         self.stk = []
         self.do_cse = do_cse
+        self._rng = random.Random(0)
+        self.random_tests = 0
+        self.random_refutations = 0
+
+        self._lock = threading.RLock()
 
-        with _LOCK:
+        with _CONTEXT_LOCK:
             ctx = z3.Context()
             solver = z3.Solver(ctx=ctx) if logic is None else z3.SolverFor(logic, ctx=ctx)
             if use_quantified_encoding.value:
@@ -1037,51 +1180,106 @@ class IncrementalSolver(object):
             solver.set("core.validate", validate_model)
             visitor = ToZ3(ctx, solver)
 
+        with self._lock:
             self.visitor = visitor
             self.z3_solver = solver
             self._create_vars(vars=vars or (), funcs=funcs or {})
 
     def push(self):
-        self.stk.append(tuple(type(getattr(self, p))(getattr(self, p)) for p in IncrementalSolver.SAVE_PROPS))
-        self.z3_solver.push()
+        with self._lock:
+            self.stk.append(tuple(type(getattr(self, p))(getattr(self, p)) for p in IncrementalSolver.SAVE_PROPS))
+            self.z3_solver.push()
 
     def pop(self):
-        x = self.stk.pop()
-        for v, p in zip(x, IncrementalSolver.SAVE_PROPS):
-            setattr(self, p, v)
-        self.z3_solver.pop()
+        with self._lock:
+            x = self.stk.pop()
+            for v, p in zip(x, IncrementalSolver.SAVE_PROPS):
+                setattr(self, p, v)
+            self.z3_solver.pop()
+
+    def interrupt(self):
+        """Make a Z3 check in progress give up and report "unknown".
+
+        Unlike the other methods, this one may be called from any thread
+        while another thread is using the solver.
+        """
+        self.visitor.ctx.interrupt()
 
     def _create_vars(self, vars, funcs):
         for f, t in funcs.items():
             if f not in self._env:
-                self._env[f] = self.visitor.mkvar(self.collection_depth, t, min_collection_depth=self.min_collection_depth)
+                self._env[f] = self._z3_var(f, t)
                 self.funcs[f] = t
         for v in vars:
             if v.id not in self._env:
-                self._env[v.id] = self.visitor.mkvar(self.collection_depth, v.type, min_collection_depth=self.min_collection_depth)
+                self._env[v.id] = self._z3_var(v.id, v.type)
                 self.vars.add(v)
 
+    def _z3_var(self, name, t):
+        """Find or make the Z3 value for a variable or function.
+
+        The same name and type always get the same Z3 value, even after
+        `pop` forgets the variable, so that translations of expressions that
+        mention it can be reused (see `ToZ3.translate`).  The constraints on
+        the value are (re-)asserted in the current scope.
+        """
+        try:
+            entry = self._z3_vars.get((name, t))
+        except TypeError:
+            # unhashable type; expressions of this type are never memoized
+            entry = None
+        if entry is None:
+            assertions = []
+            value = self.visitor.mkvar(self.collection_depth, t, min_collection_depth=self.min_collection_depth, on_z3_assertion=assertions.append)
+            entry = (value, assertions)
+            try:
+                self._z3_vars[(name, t)] = entry
+            except TypeError:
+                pass
+        value, assertions = entry
+        for a in assertions:
+            self.z3_solver.add(a)
+        return value
+
     def _convert(self, e):
         _tick()
         orig_e = e
         try:
-            e = purify(e)
-            if self.do_cse:
-                orig_size = e.size()
-                e = cse(e, verify=False)
-                _tock(e, "cse (size: {} --> {})".format(orig_size, e.size()))
-            with _LOCK:
+            with self._lock:
                 self._create_vars(vars=free_vars(orig_e), funcs=free_funcs(orig_e))
+                if translation_cache_size.value <= 0:
+                    e = purify(e)
+                    if self.do_cse:
+                        orig_size = e.size()
+                        e = cse(e, verify=False)
+                        _tock(e, "cse (size: {} --> {})".format(orig_size, e.size()))
+                    with task("encode formula", size=e.size()):
+                        return self.visitor.visit(e, self._env)
+                # With the memo, purify and cse are unnecessary: the memo
+                # already translates each distinct interned subexpression
+                # once, and the fresh names they introduce would keep later
+                # queries from finding earlier translations.
+                if len(self._translations) > translation_cache_size.value:
+                    self._translations.clear()
+                    live = set(id(z) for z in self._env.values())
+                    self._z3_vars = { k : entry for (k, entry) in self._z3_vars.items() if id(entry[0]) in live }
+                e = hash_cons(e)
                 with task("encode formula", size=e.size()):
-                    return self.visitor.visit(e, self._env)
+                    res = self.visitor.translate(e, self._env, self._translations)
+                    event("translation cache: {} hits, {} misses, saved ~{:.3}s".format(
+                        self.visitor.memo_hits,
+                        self.visitor.memo_misses,
+                        self.visitor.memo_time_saved))
+                    return res
         except:
             print("conversion failed for: {!r}".format(orig_e))
             raise
 
     def add_assumption(self, e):
         try:
-            with _LOCK:
+            with self._lock:
                 self.z3_solver.add(self._convert(e))
+                self.assumptions.append(e)
         except Exception:
             print(" ---> to reproduce: satisfy({e!r}, vars={vars!r}, collection_depth={collection_depth!r}, validate_model={validate_model!r})".format(
                 e=e,
@@ -1090,7 +1288,148 @@ class IncrementalSolver(object):
                 validate_model=self.validate_model))
             raise
 
+    def _random_model(self, e):
+        """Look for a model of `e` by evaluating it on random inputs.
+
+        Returns None if none of the inputs satisfies `e` (which does not mean
+        that `e` is unsatisfiable).
+        """
+        formula = EAll(self.assumptions + [e])
+        vars = free_vars(formula)
+        funcs = free_funcs(formula)
+        max_size = max(self.collection_depth, self.min_collection_depth)
+        self.random_tests += 1
+        try:
+            envs = []
+            for i in range(random_testing_budget.value):
+                heap = { }
+                env = { }
+                for f, t in funcs.items():
+                    env[f] = _random_value(t, self.min_collection_depth, max_size, self._rng, heap)
+                for v in vars:
+                    env[v.id] = _random_value(v.type, self.min_collection_depth, max_size, self._rng, heap)
+                envs.append(env)
+            results = eval_bulk(formula, envs)
+        except Exception:
+            # Not every type can be generated and not every expression can
+            # be evaluated on arbitrary inputs; leave those to the solver.
+            return None
+        for env, res in zip(envs, results):
+            if res:
+                self.random_refutations += 1
+                event("random testing found a model [{}/{} queries]".format(self.random_refutations, self.random_tests))
+                # like models from Z3, include every variable and function
+                for f, t in self.funcs.items():
+                    if f not in env:
+                        env[f] = ExtractedFunc({}, evaluation.mkval(t.ret_type))
+                for v in self.vars:
+                    if v.id not in env:
+                        env[v.id] = evaluation.mkval(v.type)
+                if self.model_callback is not None:
+                    self.model_callback(env)
+                return env
+        return None
+
+    def _portfolio_configurations(self):
+        """The (collection depth, logic, quantified encoding) triples to race.
+
+        The first one is this solver's own configuration.
+        """
+        depth = self.collection_depth
+        quantified = use_quantified_encoding.value
+        configs = [(depth, self.logic, quantified)]
+        configs.extend((d, self.logic, False) for d in (1, 2) if d < depth)
+        if self.logic is None:
+            configs.append((depth, "QF_AUFLIRA", False))
+        configs.append((depth, self.logic, not quantified))
+        return configs
+
+    def _portfolio_satisfy(self, e, model_extraction):
+        """Race several solver configurations against each other.
+
+        Each configuration runs in a worker process (see `_PortfolioWorker`).
+        A model found at any collection depth is a real model, but
+        "unsatisfiable" is only definitive at the full collection depth.
+        Returns a pair (answered, result); if no configuration gives a
+        definitive answer, `answered` is False.  If this solver's own
+        configuration was among those that gave up, the result is UNKNOWN and
+        `answered` is True, since asking again here would only double the
+        time spent.
+        """
+        options = option_values()
+        kwargs = dict(
+            vars=list(self.vars),
+            funcs=OrderedDict(self.funcs),
+            min_collection_depth=self.min_collection_depth,
+            validate_model=self.validate_model,
+            timeout=self.timeout,
+            do_cse=self.do_cse)
+        configs = self._portfolio_configurations()
+        with _PORTFOLIO_LOCK:
+            workers = _portfolio_workers(len(configs))
+            pending = { }
+            for w, config in zip(workers, configs):
+                pending[w] = config
+                w.run(options, config, kwargs, list(self.assumptions), e, model_extraction)
+            gave_up = False
+            try:
+                while pending:
+                    ready, _, _ = select.select(list(pending.keys()), [], [])
+                    for w in ready:
+                        config = pending.pop(w)
+                        reply = w.receive()
+                        if reply is None:
+                            # the worker crashed
+                            continue
+                        status, model = reply
+                        event("portfolio: {} answered {}".format(config, status))
+                        if status == "sat" or (status == "unsat" and config[0] >= self.collection_depth):
+                            if model is not None and self.model_callback is not None:
+                                self.model_callback(model)
+                            return (True, model)
+                        if status == "unknown" and config == configs[0]:
+                            gave_up = True
+                return (True, UNKNOWN) if gave_up else (False, None)
+            finally:
+                for w in pending:
+                    w.cancel()
+
     def satisfy(self, e, model_extraction=True):
+        return self.satisfy_all([e], model_extraction=model_extraction)[0]
+
+    def satisfy_all(self, es, model_extraction=True, raise_on_unknown=True):
+        """Find a model for each of several formulas.
+
+        Returns a list with one entry per formula: a model, or None if the
+        formula is unsatisfiable.  The formulas are answered in a single
+        solver session.  Each one is guarded by a fresh literal and checked
+        using `check(assumptions)`, so shared subexpressions are encoded only
+        once and Z3 keeps what it learns about one formula for the next.
+
+        If the solver cannot answer some formula, SolverReportedUnknown is
+        raised, unless `raise_on_unknown` is False; then the entry for that
+        formula is UNKNOWN and the other answers are still returned.
+        """
+        results = [None] * len(es)
+        todo = []
+        for i, e in enumerate(es):
+            if random_testing_budget.value > 0:
+                res = self._random_model(e)
+                if res is not None:
+                    results[i] = res
+                    continue
+            if solver_portfolio.value:
+                answered, res = self._portfolio_satisfy(e, model_extraction)
+                if answered:
+                    results[i] = res
+                    continue
+            todo.append(i)
+        if todo:
+            for i, res in zip(todo, self._check_all([es[i] for i in todo], model_extraction)):
+                results[i] = res
+        return _raise_on_unknown(results) if raise_on_unknown else results
+
+    def _check_all(self, es, model_extraction):
         _env = self._env
         solver = self.z3_solver
         vars = self.vars
@@ -1099,7 +1438,7 @@ class IncrementalSolver(object):
         if self.validate_model:
             model_extraction = True
 
-        with _LOCK:
+        with self._lock:
             _tick()
 
             builtin_type = type
@@ -1156,28 +1495,16 @@ class IncrementalSolver(object):
                         return reconstruct(model, value, h.encoding_type(type))
                     raise NotImplementedError(type)
 
-            a = self._convert(e)
-            solver.push()
-            solver.add(a)
-
-            _tock(e, "encode")
-            with task("invoke Z3"):
-                res = solver.check()
-            _tock(e, "solve")
-            if res == z3.unsat:
-                solver.pop()
-                return None
-            elif res == z3.unknown:
-                solver.pop()
-                raise SolverReportedUnknown("z3 reported unknown")
-            else:
+            def extract(e):
                 res = { }
                 if model_extraction:
                     def mkfunc(f, arg_types, out_type):
-                        z3_func = model[f]
                         if not arg_types:
                             default = reconstruct(model, f(), out_type)
                             return ExtractedFunc({}, default)
+                        # Some versions of Z3 return an empty FuncInterp
+                        # rather than None for uninterpreted functions.
+                        z3_func = model[f] if f in model.decls() else None
                         if z3_func is None:
                             return ExtractedFunc({}, evaluation.mkval(out_type))
                         *z3_entries, z3_default = z3_func.as_list()
@@ -1250,32 +1577,328 @@ class IncrementalSolver(object):
                                             break
                             raise ModelValidationError("model validation failed")
                     _tock(e, "extract model")
-                solver.pop()
                 return res
 
+            formulas = []
+            encode_times = []
+            for e in es:
+                start = time.perf_counter()
+                formulas.append(self._convert(e))
+                encode_times.append(time.perf_counter() - start)
+            trace = current_trace()
+            if trace is not None:
+                # Converting the formulas may have created new variables and
+                # asserted their well-formedness conditions, so this has to
+                # happen afterwards.
+                base_assertions = solver.assertions()
+            solver.push()
+            try:
+                if len(es) == 1:
+                    # no need for an assumption literal
+                    literals = [None]
+                    solver.add(formulas[0])
+                else:
+                    literals = [z3.Bool(fresh_name("query"), ctx=visitor.ctx) for e in es]
+                    for p, a in zip(literals, formulas):
+                        solver.add(z3.Implies(p, a, visitor.ctx))
+                _tock(es[0], "encode")
+
+                results = []
+                for i, (e, p) in enumerate(zip(es, literals)):
+                    start = time.perf_counter()
+                    with task("invoke Z3"):
+                        res = solver.check() if p is None else solver.check(p)
+                    _tock(e, "solve")
+                    solve_time = time.perf_counter() - start
+                    start = time.perf_counter()
+                    if res == z3.sat:
+                        results.append(extract(e))
+                    elif res == z3.unsat:
+                        results.append(None)
+                    else:
+                        results.append(UNKNOWN)
+                    if trace is not None:
+                        self._trace(trace, e, formulas[i], base_assertions,
+                            encode_time  = encode_times[i],
+                            solve_time   = solve_time,
+                            extract_time = time.perf_counter() - start,
+                            result       = str(res))
+            finally:
+                solver.pop()
+            return results
+
+    def _trace(self, trace, e, formula, base_assertions, **fields):
+        """Log a query to a SolverTrace.
+
+        The SMT-LIB text includes the solver's standing assertions, so each
+        query can be replayed on its own.
+        """
+        s = z3.Solver(ctx=self.visitor.ctx)
+        s.add(base_assertions)
+        s.add(formula)
+        query = {
+            "vars": list(self.vars),
+            "funcs": OrderedDict(self.funcs),
+            "assumptions": list(self.assumptions),
+            "formula": e }
+        size = e.size()
+        trace.record(query, s.to_smt2(),
+            tasks            = current_tasks(),
+            size             = size,
+            cse_size         = cse(purify(e), verify=False).size() if self.do_cse else size,
+            collection_depth = self.collection_depth,
+            logic            = self.logic,
+            timeout          = self.timeout,
+            **fields)
+
     def satisfiable(self, e):
         return self.satisfy(e, model_extraction=False) is not None
 
+    def satisfiable_all(self, es, raise_on_unknown=True):
+        return [res if res is UNKNOWN else res is not None
+            for res in self.satisfy_all(es, model_extraction=False, raise_on_unknown=raise_on_unknown)]
+
     def valid(self, e):
         return not self.satisfiable(ENot(e))
 
+    def valid_all(self, es, raise_on_unknown=True):
+        return [sat if sat is UNKNOWN else not sat
+            for sat in self.satisfiable_all([ENot(e) for e in es], raise_on_unknown=raise_on_unknown)]
+
+_POOL_LOCK = threading.Lock()
+_solver_pool = defaultdict(list) # solver options -> idle IncrementalSolvers
+_solver_pool_pid = None
+
+@contextmanager
+def _one_shot_solver(vars=None, funcs=None, **opts):
+    """Check out an IncrementalSolver for a single query.
+
+    Creating a Z3 context is expensive compared to solving a small query, so
+    solvers are pooled by their options.  Everything the query adds to the
+    solver is discarded using push/pop before the solver is returned to the
+    pool.  A solver whose query raised an exception may be in an unknown
+    state, so it is dropped instead.
+    """
+    global _solver_pool_pid
+    if not reuse_solvers.value or opts.get("model_callback") is not None:
+        yield IncrementalSolver(vars=vars, funcs=funcs, **opts)
+        return
+    if opts.get("collection_depth") is None:
+        opts["collection_depth"] = collection_depth_opt.value
+    key = tuple(sorted(opts.items()))
+    with _POOL_LOCK:
+        if _solver_pool_pid != os.getpid():
+            # do not share Z3 contexts with a forked parent process
+            _solver_pool.clear()
+            _solver_pool_pid = os.getpid()
+        idle = _solver_pool[key]
+        s = idle.pop() if idle else None
+    if s is None:
+        s = IncrementalSolver(**opts)
+    s.push()
+    with s._lock:
+        s._create_vars(vars=vars or (), funcs=funcs or {})
+    try:
+        yield s
+    except:
+        # The solver may be in an unknown state; drop it.
+        raise
+    else:
+        s.pop()
+        with _POOL_LOCK:
+            _solver_pool[key].append(s)
+
+# Portfolio workers (see `IncrementalSolver._portfolio_satisfy`).  Workers
+# are separate interpreters rather than forks of this process: they share no
+# Z3 state or locks with it, they can be started from inside daemonic job
+# processes, and they live across queries, so each one keeps its pool of Z3
+# contexts warm.
+_PORTFOLIO_LOCK = threading.Lock()
+_portfolio_pool = []
+_portfolio_pool_pid = None
+
+# Seconds to wait for a cancelled worker to stop before replacing it.
+_PORTFOLIO_CANCEL_GRACE = 1.0
+
+class _PortfolioWorker(object):
+    """A worker process that answers satisfiability queries.
+
+    A worker has at most one outstanding task.  Requests and replies are
+    pickled over the worker's stdin and stdout; see `_portfolio_worker_main`.
+    """
+
+    def __init__(self):
+        env = dict(os.environ)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", "from cozy.solver import _portfolio_worker_main; _portfolio_worker_main()"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env)
+        self.task_id = 0
+        self.busy = False
+
+    def fileno(self):
+        return self.process.stdout.fileno()
+
+    def _send(self, msg):
+        try:
+            pickle.dump(msg, self.process.stdin)
+            self.process.stdin.flush()
+        except OSError:
+            # The worker died; `receive` will notice.
+            pass
+
+    def run(self, *task):
+        self.task_id += 1
+        self.busy = True
+        self._send(("task", self.task_id) + task)
+
+    def cancel(self):
+        """Ask the worker to give up on its outstanding task."""
+        self._send(("cancel", self.task_id))
+
+    def receive(self):
+        """Wait for the answer to the outstanding task.
+
+        Returns a (status, model) pair, or None if the worker died.
+        """
+        self.busy = False
+        try:
+            return pickle.load(self.process.stdout)
+        except Exception:
+            return None
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+def _portfolio_workers(n):
+    """Get `n` idle portfolio workers, starting new ones as needed.
+
+    The caller must hold _PORTFOLIO_LOCK.
+    """
+    global _portfolio_pool_pid
+    if _portfolio_pool_pid != os.getpid():
+        # the workers of a parent process are not ours to use
+        _portfolio_pool.clear()
+        _portfolio_pool_pid = os.getpid()
+    busy = [w for w in _portfolio_pool if w.busy]
+    deadline = time.monotonic() + _PORTFOLIO_CANCEL_GRACE
+    while busy:
+        ready, _, _ = select.select(busy, [], [], max(0, deadline - time.monotonic()))
+        if not ready:
+            break
+        for w in ready:
+            w.receive()
+            busy.remove(w)
+    for i, w in enumerate(_portfolio_pool):
+        if w.busy or w.process.poll() is not None:
+            event("replacing portfolio worker [pid={}]".format(w.process.pid))
+            w.kill()
+            _portfolio_pool[i] = _PortfolioWorker()
+    while len(_portfolio_pool) < n:
+        _portfolio_pool.append(_PortfolioWorker())
+    return _portfolio_pool[:n]
+
+def _portfolio_worker_main():
+    """Main loop of a portfolio worker process (see `_PortfolioWorker`)."""
+    requests = sys.stdin.buffer
+    replies = os.fdopen(os.dup(1), "wb")
+    # anything else written to stdout would corrupt the replies
+    os.dup2(2, 1)
+
+    tasks = queue.Queue()
+    lock = threading.Lock()
+    state = { "running": None, "solver": None, "finished": 0, "cancelled": 0 }
+
+    def interrupt(task_id):
+        # Z3 ignores interrupts that arrive before a check starts, so keep
+        # interrupting until the task is over.
+        while True:
+            with lock:
+                if state["finished"] >= task_id:
+                    return
+                if state["running"] == task_id and state["solver"] is not None:
+                    state["solver"].interrupt()
+            time.sleep(0.05)
+
+    def read_requests():
+        while True:
+            try:
+                msg = pickle.load(requests)
+            except EOFError:
+                # the parent is gone
+                os._exit(0)
+            if msg[0] == "cancel":
+                with lock:
+                    state["cancelled"] = max(state["cancelled"], msg[1])
+                threading.Thread(target=interrupt, args=(msg[1],), daemon=True).start()
+            else:
+                tasks.put(msg)
+
+    threading.Thread(target=read_requests, daemon=True).start()
+    while True:
+        _, task_id, options, config, kwargs, assumptions, e, model_extraction = tasks.get()
+        set_option_values(options)
+        depth, logic, quantified = config
+        use_quantified_encoding.value = quantified
+        random_testing_budget.value = 0
+        solver_portfolio.value = False
+        try:
+            with _one_shot_solver(collection_depth=depth, logic=logic, **kwargs) as s:
+                with lock:
+                    state["running"] = task_id
+                    state["solver"] = s
+                for a in assumptions:
+                    s.add_assumption(a)
+                model = s.satisfy(e, model_extraction=model_extraction)
+            answer = ("unsat", None) if model is None else ("sat", model)
+        except SolverReportedUnknown:
+            answer = ("unknown", None)
+        except Exception:
+            with lock:
+                cancelled = state["cancelled"] >= task_id
+            if cancelled:
+                # Z3 sometimes reports an interrupt as an error
+                answer = ("unknown", None)
+            else:
+                traceback.print_exc()
+                answer = ("error", None)
+        with lock:
+            state["running"] = None
+            state["solver"] = None
+            state["finished"] = task_id
+        pickle.dump(answer, replies)
+        replies.flush()
+
 def satisfy(e, **opts):
-    s = IncrementalSolver(**opts)
-    return s.satisfy(e)
+    with _one_shot_solver(**opts) as s:
+        return s.satisfy(e)
 
 def satisfiable(e, **opts):
-    s = IncrementalSolver(**opts)
-    return s.satisfiable(e)
+    with _one_shot_solver(**opts) as s:
+        return s.satisfiable(e)
 
 def valid(e, **opts):
-    s = IncrementalSolver(**opts)
-    return s.valid(e)
+    with _one_shot_solver(**opts) as s:
+        return s.valid(e)
 
 class ModelCachingSolver(object):
     """
     A non-incremental solver that caches the models it obtains.  This is useful
     if you expect to be issuing many solver queries in similar contexts; solver
     calls can often be avoided using a counterexample found on a previous call.
+
+    If the --solver-cache option is set, answers are also saved to and looked
+    up from a persistent cache (see cozy.solver_cache).
+
+    The cached models are kept in `examples`, most useful first.  At most
+    --solver-example-cache-size of them are kept; when the store is full,
+    the oldest model that has never answered a query is evicted (or the
+    least useful one, if every model has been useful).  Duplicate models are
+    only stored once.
     """
 
     def __init__(self, vars : [EVar], funcs : { str : TFunc }, examples : [dict] = (), assumptions : Exp = ETRUE):
@@ -1283,28 +1906,153 @@ class ModelCachingSolver(object):
         self.funcs = OrderedDict(funcs)
         self.calls = 0
         self.hits = 0
-        self.examples = list(examples)
+        self.disk_hits = 0
+        self.evictions = 0
+        self.examples = []
+        self._example_hits = [] # parallel to self.examples
+        self._example_keys = [] # parallel to self.examples
+        self._known_keys = set()
+        for x in examples:
+            self._add_example(x)
         self.solver = IncrementalSolver(vars=vars, funcs=funcs)
         self.solver.add_assumption(assumptions)
+        self.disk_cache = None
+        if solver_cache_dir.value:
+            self.disk_cache = SolverCache(solver_cache_dir.value)
+            self.disk_cache_context = context_key(self.vars, self.funcs, assumptions, self.solver.collection_depth)
 
     def satisfy(self, e):
-        self.calls += 1
-        eval_results = eval_bulk(e, self.examples, use_default_values_for_undefined_vars=True)
-        for x, res in zip(self.examples, eval_results):
-            if res:
-                self.hits += 1
-                return x
-        x = self.solver.satisfy(e)
-        if x is not None:
-            self.examples.append(x)
+        return self.satisfy_all([e])[0]
+
+    def satisfy_all(self, es, raise_on_unknown=True):
+        """Find a model for each of several formulas.
+
+        Like `satisfy`, but formulas that cannot be answered from the cached
+        examples are sent to the solver as one batch.  See
+        IncrementalSolver.satisfy_all for the meaning of `raise_on_unknown`.
+        """
+        self.calls += len(es)
+        results = [None] * len(es)
+        keys = [None] * len(es)
+        todo = []
+        for i, e in enumerate(es):
+            x = self._find_example(e)
+            if x is not None:
+                results[i] = x
+                continue
+            if self.disk_cache is not None:
+                keys[i] = query_key(self.disk_cache_context, e)
+                entry = self.disk_cache.lookup(keys[i])
+                if entry is not None:
+                    x = entry["model"]
+                    # models are cheap to double-check
+                    if x is None or eval_bulk(e, [x], use_default_values_for_undefined_vars=True)[0]:
+                        self.disk_hits += 1
+                        if x is not None:
+                            self._add_example(x)
+                        results[i] = x
+                        continue
+            todo.append(i)
+        if todo:
+            models = self.solver.satisfy_all([es[i] for i in todo], raise_on_unknown=False)
+            for i, x in zip(todo, models):
+                results[i] = x
+                if x is UNKNOWN:
+                    continue
+                if keys[i] is not None:
+                    self.disk_cache.store(keys[i], x)
+                if x is not None:
+                    self._add_example(x)
+        return _raise_on_unknown(results) if raise_on_unknown else results
+
+    # Number of examples from the front of the store to try before the rest.
+    _HOT_EXAMPLES = 16
+
+    def _find_example(self, e):
+        hot = self._HOT_EXAMPLES
+        for start, end in ((0, hot), (hot, len(self.examples))):
+            eval_results = eval_bulk(e, self.examples[start:end], use_default_values_for_undefined_vars=True)
+            for i, res in enumerate(eval_results, start):
+                if res:
+                    self.hits += 1
+                    return self._record_hit(i)
+        return None
+
+    def _record_hit(self, i):
+        """Note that example i answered a query; returns the example.
+
+        The example moves forward past examples with fewer hits, so the
+        store stays sorted by usefulness.
+        """
+        hits = self._example_hits
+        hits[i] += 1
+        x = self.examples[i]
+        j = i
+        while j > 0 and hits[j-1] < hits[i]:
+            j -= 1
+        if j < i:
+            for l in (self.examples, hits, self._example_keys):
+                l.insert(j, l.pop(i))
+        return x
+
+    def _add_example(self, x):
+        key = _example_key(x)
+        if key is not None:
+            if key in self._known_keys:
+                return
+            self._known_keys.add(key)
+        if len(self.examples) >= max(example_cache_size.value, 1):
+            hits = self._example_hits
+            # oldest example that has never been useful, or the least useful
+            i = hits.index(0) if 0 in hits else len(hits) - 1
+            self._known_keys.discard(self._example_keys[i])
+            for l in (self.examples, hits, self._example_keys):
+                del l[i]
+            self.evictions += 1
+        self.examples.append(x)
+        self._example_hits.append(0)
+        self._example_keys.append(key)
+
+    def satisfy_cheaply(self, e):
+        """Look for a model of `e` without calling Z3.
+
+        The cached examples are tried first, then random inputs.  Returns None
+        if neither produces a model, which does not mean that `e` is
+        unsatisfiable.
+        """
+        x = self._find_example(e)
+        if x is None and random_testing_budget.value > 0:
+            x = self.solver._random_model(e)
+            if x is not None:
+                self._add_example(x)
         return x
 
     def satisfiable(self, e):
         return self.satisfy(e) is not None
 
+    def satisfiable_all(self, es, raise_on_unknown=True):
+        return [x if x is UNKNOWN else x is not None
+            for x in self.satisfy_all(es, raise_on_unknown=raise_on_unknown)]
+
     def valid(self, e):
         return not self.satisfiable(ENot(e))
 
+    def valid_all(self, es, raise_on_unknown=True):
+        return [sat if sat is UNKNOWN else not sat
+            for sat in self.satisfiable_all([ENot(e) for e in es], raise_on_unknown=raise_on_unknown)]
+
+def _example_key(x):
+    """A hashable key identifying a model up to deep equality, or None.
+
+    Models with equal keys are indistinguishable to the evaluator.
+    """
+    try:
+        key = tuple(sorted(x.items()))
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
 @lru_cache()
 def solver_for_context(context : Context, assumptions : Exp = ETRUE):
     return ModelCachingSolver(
@@ -0,0 +1,102 @@
+"""Persistent on-disk cache of solver results.
+
+Cozy asks the solver the same questions over and over: within one job, across
+the per-query jobs, and from one run to the next.  This module remembers the
+answer to each question (either "unsatisfiable" or a satisfying model) so
+that it only has to be computed once.
+
+Entries are content-addressed: the key is a hash of everything that affects
+the answer (the formula, the variables and functions in scope, the standing
+assumptions, and the collection depth).  Bound variables are renamed to
+canonical names before hashing, so alpha-equivalent formulas share an entry.
+
+Important functions and classes:
+ - SolverCache: a directory of cached solver results
+ - context_key: compute the part of a key shared by all queries in a context
+ - query_key: compute the key for one query
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from cozy.syntax import Exp, EVar
+from cozy.syntax_tools import canonicalize_binders
+from cozy.opts import Option
+
+solver_cache_dir = Option("solver-cache", str, "", metavar="DIR",
+    description="Directory for a persistent cache of solver results, shared "
+        + "by all jobs and runs that use it. Leave empty to disable.")
+
+# Bump this whenever the on-disk format or the meaning of keys changes.
+FORMAT_VERSION = 1
+
+def context_key(
+        vars             : [EVar],
+        funcs            : dict,
+        assumptions      : Exp,
+        collection_depth : int) -> str:
+    """Compute the part of the cache key that depends on the solver.
+
+    Solvers that agree on everything passed to this function give the same
+    answers to the same queries.
+    """
+    parts = (
+        FORMAT_VERSION,
+        collection_depth,
+        tuple((v.id, v.type) for v in vars),
+        tuple(sorted(funcs.items())),
+        canonicalize_binders(assumptions))
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+def query_key(ctx_key : str, e : Exp) -> str:
+    """Compute the cache key for satisfying `e` in the given context."""
+    parts = (ctx_key, canonicalize_binders(e))
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+class SolverCache(object):
+    """A directory of cached solver results.
+
+    Each entry stores the model found for a query, or None if the query is
+    unsatisfiable.
+
+    Writes are atomic, so many processes can safely share one cache.
+    """
+
+    def __init__(self, directory : str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key : str) -> str:
+        return os.path.join(self.directory, "{}.pickle".format(key))
+
+    def lookup(self, key : str):
+        """Find the cached entry for `key`, or None.
+
+        Entries are dictionaries whose "model" field holds the cached model
+        (or None for unsatisfiable queries).
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print("WARNING: ignoring unreadable solver cache entry {}: {}".format(key, e))
+            return None
+
+    def store(self, key : str, model):
+        """Record the result of a query.
+
+        `model` should be None if the query is unsatisfiable.
+        """
+        entry = { "model" : model }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,110 @@
+"""Structured trace of solver calls.
+
+When the --solver-trace option is set, every formula that reaches Z3 is
+logged so that slow queries can be found and studied offline.  Each process
+appends JSON-lines records to its own file in the trace directory:
+
+    trace-<pid>.jsonl
+
+Each record has these fields:
+ - id: a name for the query, unique within the trace directory
+ - tasks: the stack of active tasks (see cozy.logging) at the time of the call
+ - size: the size of the formula
+ - cse_size: the size of the formula after common subexpression elimination
+ - encode_time, solve_time, extract_time: seconds spent on each step
+ - result: "sat", "unsat", or "unknown"
+ - collection_depth, logic, timeout: solver settings
+ - smtlib: file holding the query as SMT-LIB text
+ - query: file holding the pickled Cozy query (see `load_query`)
+
+The files named by `smtlib` and `query` are written next to the trace file.
+See cozy.bench.solver_replay for a tool that re-runs a captured corpus.
+
+Important functions and classes:
+ - SolverTrace: a directory of solver-call records
+ - current_trace: the trace for this process, if tracing is enabled
+ - load_records: read all records in a trace directory
+ - load_query: read the Cozy query for a record
+"""
+
+import json
+import os
+import pickle
+import threading
+
+from cozy.opts import Option
+
+solver_trace_dir = Option("solver-trace", str, "", metavar="DIR",
+    description="Directory in which to log every solver call as a JSON-lines "
+        + "record with its SMT-LIB text. Leave empty to disable.")
+
+class SolverTrace(object):
+    """A directory of solver-call records written by one process."""
+
+    def __init__(self, directory : str):
+        self.directory = directory
+        self.pid = os.getpid()
+        self.count = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, query : dict, smtlib : str, **fields):
+        """Log one solver call.
+
+        `query` should be a dictionary with the keys "vars", "funcs",
+        "assumptions", and "formula" describing the Cozy query; `smtlib` is
+        the same query in SMT-LIB format.  The remaining fields are written
+        to the JSON record as-is.
+        """
+        with self._lock:
+            self.count += 1
+            id = "{}-{}".format(self.pid, self.count)
+            rec = dict(fields)
+            rec["id"] = id
+            rec["smtlib"] = "{}.smt2".format(id)
+            rec["query"] = "{}.pickle".format(id)
+            with open(os.path.join(self.directory, rec["smtlib"]), "w") as f:
+                f.write(smtlib)
+            with open(os.path.join(self.directory, rec["query"]), "wb") as f:
+                pickle.dump(query, f)
+            with open(os.path.join(self.directory, "trace-{}.jsonl".format(self.pid)), "a") as f:
+                f.write(json.dumps(rec, sort_keys=True))
+                f.write("\n")
+
+_LOCK = threading.Lock()
+_trace = None
+
+def current_trace() -> SolverTrace:
+    """Get the trace that solver calls should be logged to.
+
+    Returns None if the --solver-trace option is not set.
+    """
+    global _trace
+    directory = solver_trace_dir.value
+    if not directory:
+        return None
+    with _LOCK:
+        if _trace is None or _trace.directory != directory or _trace.pid != os.getpid():
+            _trace = SolverTrace(directory)
+        return _trace
+
+def load_records(directory : str) -> [dict]:
+    """Read every record in a trace directory, in a deterministic order."""
+    records = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.startswith("trace-") and filename.endswith(".jsonl"):
+            with open(os.path.join(directory, filename)) as f:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+    return records
+
+def load_query(directory : str, record : dict) -> dict:
+    """Read the pickled Cozy query for a record."""
+    with open(os.path.join(directory, record["query"]), "rb") as f:
+        return pickle.load(f)
+
+def load_smtlib(directory : str, record : dict) -> str:
+    """Read the SMT-LIB text for a record."""
+    with open(os.path.join(directory, record["smtlib"])) as f:
+        return f.read()
@@ -4,6 +4,9 @@ Important functions:
  - pprint: prettyprint a syntax tree
  - free_vars: compute the set of free variables
  - alpha_equivalent: test alpha equivalence of two expressions
+ - alpha_hash: hash an expression consistently with alpha equivalence
+ - hash_cons: share structurally identical expressions
+ - canonicalize_binders: give bound variables canonical names
  - unpack_representation: separate a packed expression into its state and
    runtime components
 """
@@ -14,6 +17,8 @@ import sys
 import itertools
 import json
 import functools
+import threading
+import weakref
 from enum import Enum
 from fractions import Fraction
 
@@ -508,6 +513,10 @@ def free_vars(exp, counts=False):
     the AST.
     """
 
+    if isinstance(exp, common.ADT) and exp._cached_free_vars is not None:
+        res = collections.OrderedDict(exp._cached_free_vars)
+        return res if counts else common.OrderedSet(res.keys())
+
     res = collections.OrderedDict()
     bound = collections.defaultdict(int)
 
@@ -546,6 +555,10 @@ def free_vars(exp, counts=False):
         x = stk.pop()
         if isinstance(x, PushScope) or isinstance(x, PopScope) or isinstance(x, Bind):
             x.exec()
+        elif isinstance(x, common.ADT) and x._cached_free_vars is not None:
+            for k, v in x._cached_free_vars.items():
+                if not bound[k]:
+                    res[k] = res.get(k, 0) + v
         elif isinstance(x, syntax.EVar):
             if not bound[x]:
                 res[x] = res.get(x, 0) + 1
@@ -1222,6 +1235,76 @@ def lightweight_subst(
         e = e.with_type(haystack.type)
     return e
 
+class _AlphaEquivalenceChecker(common.Visitor):
+    def __init__(self):
+        self.depth = 0
+        self.remap_l = { } # maps e1 varnames ---> ids
+        self.remap_r = { } # maps e2 varnames ---> ids
+
+    @contextmanager
+    @typechecked
+    def unify(self, vs : [(syntax.EVar, syntax.EVar)], i : int = 0):
+        if i >= len(vs):
+            yield
+        else:
+            self.depth += 1
+            v1, v2 = vs[i]
+            with common.extend(self.remap_l, v1, self.depth):
+                with common.extend(self.remap_r, v2, self.depth):
+                    with self.unify(vs, i + 1):
+                        yield
+            self.depth -= 1
+
+    def visit_EVar(self, e1, e2):
+        if not isinstance(e2, syntax.EVar):
+            return False
+        return self.remap_l.get(e1, e1) == self.remap_r.get(e2, e2)
+    def visit_ELambda(self, e1, e2):
+        if not isinstance(e2, target_syntax.ELambda):
+            return False
+        with self.unify([(e1.arg, e2.arg)]):
+            return self.visit(e1.body, e2.body)
+    def visit_EListComprehension(self, lcmp, other):
+        if not isinstance(other, syntax.EListComprehension):
+            return False
+        if len(lcmp.clauses) != len(other.clauses):
+            return False
+        return self.visit_clauses(0, lcmp.clauses, other.clauses, lcmp.e, other.e)
+    def visit_clauses(self, i, clauses1, clauses2, e1, e2):
+        if i >= len(clauses1):
+            return self.visit(e1, e2)
+        c1 = clauses1[i]
+        c2 = clauses2[i]
+        if isinstance(c1, syntax.CPull):
+            if not isinstance(c2, syntax.CPull):
+                return False
+            with self.unify([(c1, c2)]):
+                return self.visit_clauses(i + 1, clauses1, clauses2, e1, e2)
+        elif isinstance(c1, syntax.CCond):
+            return self.visit(c1.e, c2.e) and self.visit_clauses(i + 1, clauses1, clauses2, e1, e2)
+        else:
+            raise NotImplementedError(pprint(c1))
+    def visit_str(self, s1, s2):
+        return s1 == s2
+    def visit_int(self, i1, i2):
+        return i1 == i2
+    def visit_float(self, f1, f2):
+        return f1 == f2
+    def visit_Fraction(self, f1, f2):
+        return f1 == f2
+    def visit_tuple(self, t1, t2):
+        return len(t1) == len(t2) and all(self.visit(x, y) for x, y in zip(t1, t2))
+    def visit_list(self, t1, t2):
+        return len(t1) == len(t2) and all(self.visit(x, y) for x, y in zip(t1, t2))
+    def visit_Exp(self, e1, e2):
+        if type(e1) is not type(e2):
+            return False
+        if e1 is e2 and all(self.remap_l.get(v, v) == self.remap_r.get(v, v) for v in free_vars(e1)):
+            return True
+        return all(self.visit(x, y) for (x, y) in zip(e1.children(), e2.children()))
+    def visit_object(self, o, *args):
+        raise NotImplementedError("{} ({})".format(type(o), repr(o)))
+
 @typechecked
 def alpha_equivalent(e1 : syntax.Exp, e2 : syntax.Exp) -> bool:
     """
@@ -1231,75 +1314,159 @@ def alpha_equivalent(e1 : syntax.Exp, e2 : syntax.Exp) -> bool:
     However, alpha equivalence allows renaming of variables, so
         alpha_equivalent([x | x <- L], [y | y <- L]) == True.
     """
-    class V(common.Visitor):
-        def __init__(self):
-            self.depth = 0
-            self.remap_l = { } # maps e1 varnames ---> ids
-            self.remap_r = { } # maps e2 varnames ---> ids
-
-        @contextmanager
-        @typechecked
-        def unify(self, vs : [(syntax.EVar, syntax.EVar)], i : int = 0):
-            if i >= len(vs):
-                yield
-            else:
-                self.depth += 1
-                v1, v2 = vs[i]
-                with common.extend(self.remap_l, v1, self.depth):
-                    with common.extend(self.remap_r, v2, self.depth):
-                        with self.unify(vs, i + 1):
-                            yield
-                self.depth -= 1
-
-        def visit_EVar(self, e1, e2):
-            if not isinstance(e2, syntax.EVar):
-                return False
-            return self.remap_l.get(e1, e1) == self.remap_r.get(e2, e2)
-        def visit_ELambda(self, e1, e2):
-            if not isinstance(e2, target_syntax.ELambda):
-                return False
-            with self.unify([(e1.arg, e2.arg)]):
-                return self.visit(e1.body, e2.body)
-        def visit_EListComprehension(self, lcmp, other):
-            if not isinstance(other, syntax.EListComprehension):
-                return False
-            if len(lcmp.clauses) != len(other.clauses):
-                return False
-            return self.visit_clauses(0, lcmp.clauses, other.clauses, lcmp.e, other.e)
-        def visit_clauses(self, i, clauses1, clauses2, e1, e2):
-            if i >= len(clauses1):
-                return self.visit(e1, e2)
-            c1 = clauses1[i]
-            c2 = clauses2[i]
-            if isinstance(c1, syntax.CPull):
-                if not isinstance(c2, syntax.CPull):
-                    return False
-                with self.unify([(c1, c2)]):
-                    return self.visit_clauses(i + 1, clauses1, clauses2, e1, e2)
-            elif isinstance(c1, syntax.CCond):
-                return self.visit(c1.e, c2.e) and self.visit_clauses(i + 1, clauses1, clauses2, e1, e2)
-            else:
-                raise NotImplementedError(pprint(c1))
-        def visit_str(self, s1, s2):
-            return s1 == s2
-        def visit_int(self, i1, i2):
-            return i1 == i2
-        def visit_float(self, f1, f2):
-            return f1 == f2
-        def visit_Fraction(self, f1, f2):
-            return f1 == f2
-        def visit_tuple(self, t1, t2):
-            return len(t1) == len(t2) and all(self.visit(x, y) for x, y in zip(t1, t2))
-        def visit_list(self, t1, t2):
-            return len(t1) == len(t2) and all(self.visit(x, y) for x, y in zip(t1, t2))
-        def visit_Exp(self, e1, e2):
-            if type(e1) is not type(e2):
-                return False
-            return all(self.visit(x, y) for (x, y) in zip(e1.children(), e2.children()))
-        def visit_object(self, o, *args):
-            raise NotImplementedError("{} ({})".format(type(o), repr(o)))
+    if e1 is e2:
+        return True
+    if e1._alpha_hash is not None and e2._alpha_hash is not None and e1._alpha_hash != e2._alpha_hash:
+        return False
+    return _AlphaEquivalenceChecker().visit(e1, e2)
+
+class _Unbind(object):
+    __slots__ = ("var",)
+    def __init__(self, var : str):
+        self.var = var
+
+def alpha_hash(e : syntax.Exp) -> int:
+    """Hash an expression consistently with alpha equivalence.
+
+    If alpha_equivalent(e1, e2), then alpha_hash(e1) == alpha_hash(e2).  Bound
+    variables are hashed by the depth of their binder (as in de Bruijn
+    notation) rather than by name; free variables are hashed by name.  Types
+    are ignored, as they are by `alpha_equivalent`.
+
+    The result is remembered on `e`, so later calls on the same object are
+    cheap.
+    """
+    if e._alpha_hash is not None:
+        return e._alpha_hash
+    tokens = []
+    levels = collections.defaultdict(list) # var name -> binder depths, innermost last
+    depth = 0
+    stk = [e]
+    while stk:
+        x = stk.pop()
+        if isinstance(x, _Unbind):
+            levels[x.var].pop()
+            depth -= 1
+        elif isinstance(x, syntax.EVar):
+            l = levels.get(x.id)
+            tokens.append(("bound", l[-1]) if l else ("free", x.id))
+        elif isinstance(x, syntax.ELambda):
+            depth += 1
+            levels[x.arg.id].append(depth)
+            tokens.append(syntax.ELambda)
+            stk.append(_Unbind(x.arg.id))
+            stk.append(x.body)
+        elif isinstance(x, syntax.EListComprehension):
+            # coarse, but consistent with alpha_equivalent
+            tokens.append((syntax.EListComprehension, len(x.clauses)))
+        elif isinstance(x, common.ADT):
+            children = x.children()
+            tokens.append((type(x), len(children)))
+            stk.extend(reversed(children))
+        elif isinstance(x, tuple) or isinstance(x, list):
+            tokens.append((tuple, len(x)))
+            stk.extend(reversed(x))
+        else:
+            tokens.append(x)
+    e._alpha_hash = hash(tuple(tokens))
+    return e._alpha_hash
+
+_interned_exps = weakref.WeakValueDictionary()
+_INTERN_LOCK = threading.Lock()
+
+def _intern_key(x, memo):
+    """Compute the hash-consing key for a child value of an expression.
+
+    Expressions in `x` are replaced by their entries in `memo`.  Returns a pair
+    (new value, key), or None if `x` cannot be part of an interned expression.
+    """
+    if isinstance(x, syntax.Exp):
+        x = memo[id(x)]
+        return (x, id(x))
+    if isinstance(x, syntax.Type):
+        return (x, x)
+    if isinstance(x, tuple):
+        res = []
+        for y in x:
+            r = _intern_key(y, memo)
+            if r is None:
+                return None
+            res.append(r)
+        return (tuple(y for (y, k) in res), tuple(k for (y, k) in res))
+    if x is None or isinstance(x, (str, int, float, Fraction)):
+        return (x, (type(x), x))
+    return None
+
+def hash_cons(e : syntax.Exp) -> syntax.Exp:
+    """Find the shared ("interned") copy of an expression.
+
+    Every expression returned by this function is shared: if two interned
+    expressions have the same class, the same type, and identical children,
+    then they are the same object.  Interned expressions also remember their
+    size and free variables, so `size` and `free_vars` on an expression made
+    mostly of interned parts only have to look at the parts that are new.
+
+    The input must be fully typechecked.  The output must not be modified;
+    interned expressions are shared by everyone who interns an equal
+    expression.  The input is never interned itself (unless it already was),
+    so its owner may keep modifying it.
+
+    Sub-expressions that cannot be interned (for instance, because they
+    contain statements or lists) are left alone, as are their parents.
+
+    This function is safe to call from several threads.
+    """
+    with _INTERN_LOCK:
+        return _hash_cons(e)
+
+def _hash_cons(e : syntax.Exp) -> syntax.Exp:
+    memo = { } # id(original exp) -> interned exp
+    stk = [(e, False)]
+    while stk:
+        x, children_done = stk.pop()
+        if id(x) in memo:
+            continue
+        if x._interned:
+            memo[id(x)] = x
+            continue
+        if not children_done:
+            stk.append((x, True))
+            q = list(x.children())
+            while q:
+                c = q.pop()
+                if isinstance(c, syntax.Exp):
+                    stk.append((c, False))
+                elif isinstance(c, tuple):
+                    q.extend(c)
+            continue
 
-    return V().visit(e1, e2)
+        r = _intern_key(x.children(), memo)
+        if r is None:
+            memo[id(x)] = x
+            continue
+        children, key = r
+        t = getattr(x, "type", None)
+        key = (type(x), key, t)
+        try:
+            res = _interned_exps.get(key)
+        except TypeError:
+            # some types are unhashable (e.g. a TEnum whose cases are a list)
+            memo[id(x)] = x
+            continue
+        if res is None:
+            # Always make a copy: the caller still owns `x` and may modify it
+            # (e.g. with `with_type`), but interned expressions must never
+            # change.
+            res = type(x)(*children)
+            if t is not None:
+                res = res.with_type(t)
+            hash(res)
+            res._cached_size = res.size()
+            res._cached_free_vars = free_vars(res, counts=True)
+            res._interned = True
+            _interned_exps[key] = res
+        memo[id(x)] = res
+    return memo[id(e)]
 
 def freshen_binders(e : syntax.Exp, context):
     fvs = { v : True for v, p in context.vars() }
@@ -1323,6 +1490,31 @@ def freshen_binders(e : syntax.Exp, context):
     assert alpha_equivalent(e, ee)
     return ee
 
+class _BinderCanonicalizer(BottomUpRewriter):
+    def __init__(self, renaming : {str:str}):
+        self.renaming = dict(renaming)
+        self.counter = 0
+    def visit_EVar(self, v):
+        new_name = self.renaming.get(v.id)
+        if new_name is None:
+            return v
+        return syntax.EVar(new_name).with_type(v.type)
+    def visit_ELambda(self, e):
+        name = "_b{}".format(self.counter)
+        self.counter += 1
+        with common.extend(self.renaming, e.arg.id, name):
+            return target_syntax.ELambda(syntax.EVar(name).with_type(e.arg.type), self.visit(e.body))
+
+def canonicalize_binders(x, renaming : {str:str} = {}):
+    """Rename variables to canonical names.
+
+    Variables bound by lambdas are renamed to _b0, _b1, ... in visitation
+    order, and free variables are renamed according to `renaming`.  Any two
+    alpha-equivalent inputs give the same output, so the output's `repr` is
+    suitable for keys that have to be stable from one run to the next.
+    """
+    return _BinderCanonicalizer(renaming).visit(x)
+
 BOOL = syntax.TBool()
 
 def implies(e1, e2):
@@ -1444,27 +1636,15 @@ def map_value_func(e : syntax.Exp):
     raise NotImplementedError(repr(e))
 
 class Aeq(object):
+    """Wrapper that compares expressions up to alpha equivalence.
+
+    Sets and dictionaries of Aeq objects only run `alpha_equivalent` on
+    expressions whose `alpha_hash`es collide.
+    """
     def __init__(self, e : syntax.Exp):
         self.e = e
     def __hash__(self):
-        res = 0
-        q = [self.e]
-        while q:
-            x = q[-1]
-            del q[-1]
-            if isinstance(x, syntax.EVar):
-                continue
-            elif isinstance(x, common.ADT):
-                res *= 31
-                res += hash(type(x))
-                res %= 2**64
-                q.extend(x.children())
-            elif isinstance(x, tuple) or isinstance(x, list):
-                q.extend(x)
-            else:
-                res += hash(x)
-                # raise NotImplementedError(repr(x))
-        return res % (2**64)
+        return alpha_hash(self.e)
     def __eq__(self, other):
         return isinstance(other, Aeq) and alpha_equivalent(self.e, other.e)
     def __ne__(self, other):
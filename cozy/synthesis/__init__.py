@@ -4,4 +4,5 @@ from . import high_level_interface
 # re-export the most important functions and types
 Implementation                   = impls.Implementation
 construct_initial_implementation = impls.construct_initial_implementation
+reuse_implementation             = impls.reuse_implementation
 improve_implementation           = high_level_interface.improve_implementation
@@ -26,7 +26,7 @@ from cozy.target_syntax import (
     EFlatMap, EFilter, EMakeMap2, EStateVar,
     EDropFront, EDropBack)
 from cozy.typecheck import is_collection, is_scalar
-from cozy.syntax_tools import subst, pprint, free_vars, fresh_var, alpha_equivalent, strip_EStateVar, freshen_binders, wrap_naked_statevars, break_conj, inline_lets
+from cozy.syntax_tools import subst, pprint, free_vars, fresh_var, alpha_equivalent, alpha_hash, strip_EStateVar, freshen_binders, wrap_naked_statevars, break_conj, inline_lets
 from cozy.wf import exp_wf
 from cozy.common import No, OrderedSet, unique, OrderedSet, StopException
 from cozy.solver import valid, solver_for_context, ModelCachingSolver
@@ -49,6 +49,10 @@ check_blind_substitutions = Option("blind-substitutions", bool, True,
         + "In some cases, this allows Cozy to quickly discover nonintuitive "
         + "solutions.")
 enable_eviction = Option("eviction", bool, True)
+reuse_enumerator = Option("reuse-enumerator", bool, True,
+    description="Keep the enumerator's cache when a candidate turns out to be "
+        + "wrong, instead of restarting enumeration from scratch with the new "
+        + "counterexample. This makes Cozy faster but uses more memory.")
 cost_pruning = Option("prune-using-cost", bool, False,
     description="During synthesis, skip expressions that are more expensive "
         + "than the current best. This makes Cozy faster since it caches "
@@ -180,72 +184,88 @@ def improve(
     watched_targets = [target]
     blacklist = {}
 
+    # The enumerator depends on the watched targets, but not on the examples.
+    # It survives new counterexamples, but not changes to watched_targets.
+    enumerators = {}
+
     while True:
+        for enum in enumerators.values():
+            enum.add_examples(examples[len(enum.examples):])
+
         # 1. find any potential improvement to any sub-exp of target
-        for new_target in search_for_improvements(
-                targets=watched_targets,
-                wf_solver=solver,
-                context=context,
-                examples=examples,
-                cost_model=cost_model,
-                stop_callback=stop_callback,
-                hints=hints,
-                ops=ops,
-                blacklist=blacklist):
-            print("Found candidate improvement: {}".format(pprint(new_target)))
-
-            # 2. check
-            with task("verifying candidate"):
-                counterexample = solver.satisfy(ENot(EEq(target, new_target)))
-
-            if counterexample is not None:
-                if counterexample in examples:
-                    print("assumptions = {!r}".format(assumptions))
-                    print("duplicate example: {!r}".format(counterexample))
-                    print("old target = {!r}".format(target))
-                    print("new target = {!r}".format(new_target))
-                    raise Exception("got a duplicate example")
-                # a. if incorrect: add example, restart
-                examples.append(counterexample)
-                print("new example: {!r}".format(counterexample))
-                print("wrong; restarting with {} examples".format(len(examples)))
-                break
-            else:
-                # b. if correct: yield it, watch the new target, goto 1
-                print("The candidate is valid!")
-                print(repr(new_target))
-                print("Determining whether to yield it...")
-                with task("updating frontier"):
-                    to_evict = []
-                    keep = True
-                    old_better = None
-                    for old_target in watched_targets:
-                        evc = eviction_policy(new_target, context, old_target, context, RUNTIME_POOL, cost_model)
-                        if old_target not in evc:
-                            to_evict.append(old_target)
-                        if new_target not in evc:
-                            old_better = old_target
-                            keep = False
-                            break
-                    for t in to_evict:
-                        watched_targets.remove(t)
-                    if not keep:
-                        print("Whoops! Looks like we already found something better.")
-                        print(" --> {}".format(pprint(old_better)))
-                        continue
-                    if target in to_evict:
-                        print("Yep, it's an improvement!")
-                        yield new_target
-                        if heuristic_done(new_target):
-                            print("target now matches doneness heuristic")
-                            return
-                        target = new_target
-                    else:
-                        print("Nope, it isn't substantially better!")
-
-                watched_targets.append(new_target)
-                print("Now watching {} targets".format(len(watched_targets)))
-                break
+        search = search_for_improvements(
+            targets=watched_targets,
+            wf_solver=solver,
+            context=context,
+            examples=examples,
+            cost_model=cost_model,
+            stop_callback=stop_callback,
+            hints=hints,
+            ops=ops,
+            blacklist=blacklist,
+            enumerators=enumerators if reuse_enumerator.value else None)
+        try:
+            for new_target in search:
+                print("Found candidate improvement: {}".format(pprint(new_target)))
+
+                # 2. check
+                with task("verifying candidate"):
+                    counterexample = solver.satisfy(ENot(EEq(target, new_target)))
+
+                if counterexample is not None:
+                    if counterexample in examples:
+                        print("assumptions = {!r}".format(assumptions))
+                        print("duplicate example: {!r}".format(counterexample))
+                        print("old target = {!r}".format(target))
+                        print("new target = {!r}".format(new_target))
+                        raise Exception("got a duplicate example")
+                    # a. if incorrect: add example, restart
+                    examples.append(counterexample)
+                    print("new example: {!r}".format(counterexample))
+                    print("wrong; restarting with {} examples".format(len(examples)))
+                    break
+                else:
+                    # b. if correct: yield it, watch the new target, goto 1
+                    print("The candidate is valid!")
+                    print(repr(new_target))
+                    print("Determining whether to yield it...")
+                    with task("updating frontier"):
+                        to_evict = []
+                        keep = True
+                        old_better = None
+                        for old_target in watched_targets:
+                            evc = eviction_policy(new_target, context, old_target, context, RUNTIME_POOL, cost_model)
+                            if old_target not in evc:
+                                to_evict.append(old_target)
+                            if new_target not in evc:
+                                old_better = old_target
+                                keep = False
+                                break
+                        for t in to_evict:
+                            watched_targets.remove(t)
+                        if not keep:
+                            print("Whoops! Looks like we already found something better.")
+                            print(" --> {}".format(pprint(old_better)))
+                            continue
+                        if target in to_evict:
+                            print("Yep, it's an improvement!")
+                            yield new_target
+                            if heuristic_done(new_target):
+                                print("target now matches doneness heuristic")
+                                return
+                            target = new_target
+                        else:
+                            print("Nope, it isn't substantially better!")
+
+                    watched_targets.append(new_target)
+                    enumerators.clear()
+                    print("Now watching {} targets".format(len(watched_targets)))
+                    break
+        finally:
+            # The enumerators only accept new examples when no enumeration
+            # is in progress, so an abandoned search has to be finished now
+            # rather than whenever it happens to be garbage-collected.
+            search.close()
 
 SearchInfo = namedtuple("SearchInfo", (
     "context",
@@ -265,7 +285,8 @@ def search_for_improvements(
         stop_callback : Callable[[], bool],
         hints         : [Exp],
         ops           : [Op],
-        blacklist     : {(Exp, Context, Pool, Exp) : str}):
+        blacklist     : {(Exp, Context, Pool, Exp) : str},
+        enumerators   : {tuple : Enumerator} = None):
     """Search for potential improvements to any of the target expressions.
 
     This function yields expressions that look like improvements (or are
@@ -273,6 +294,13 @@ def search_for_improvements(
     guaranteed to be correct on the given examples.
 
     This function may add new items to the given blacklist.
+
+    If given, `enumerators` maps tuples of targets to the Enumerator used to
+    search for improvements to them.  This function reuses the enumerator for
+    the given targets if there is one, or replaces the contents of
+    `enumerators` with a new one otherwise.  The caller is responsible for
+    keeping the enumerators' examples in sync with `examples` (see
+    `Enumerator.add_examples`).
     """
 
     root_ctx = context
@@ -288,19 +316,27 @@ def search_for_improvements(
                 return No("too expensive")
             return True
 
-    with task("setting up hints"):
-        frags = list(unique(itertools.chain(
-            *[all_subexpressions_with_context_information(t, root_ctx) for t in targets],
-            *[all_subexpressions_with_context_information(h, root_ctx) for h in hints])))
-        frags.sort(key=hint_order)
-        enum = Enumerator(
-            examples=examples,
-            cost_model=cost_model,
-            check_wf=check_wf,
-            hints=frags,
-            heuristics=try_optimize,
-            stop_callback=stop_callback,
-            do_eviction=enable_eviction.value)
+    enum = enumerators.get(tuple(targets)) if enumerators is not None else None
+    if enum is None:
+        with task("setting up hints"):
+            frags = list(unique(itertools.chain(
+                *[all_subexpressions_with_context_information(t, root_ctx) for t in targets],
+                *[all_subexpressions_with_context_information(h, root_ctx) for h in hints])))
+            frags.sort(key=hint_order)
+            enum = Enumerator(
+                examples=examples,
+                cost_model=cost_model,
+                check_wf=check_wf,
+                hints=frags,
+                heuristics=try_optimize,
+                stop_callback=stop_callback,
+                do_eviction=enable_eviction.value,
+                incremental=enumerators is not None)
+        if enumerators is not None:
+            enumerators.clear()
+            enumerators[tuple(targets)] = enum
+    else:
+        print("reusing enumerator with |cache|={}".format(enum.cache_size()))
 
     target_fp = Fingerprint.of(targets[0], examples)
 
@@ -314,16 +350,23 @@ def search_for_improvements(
                     watches_by_context[ctx] = l
                 l.append((target, e, pool))
 
+        # (ctx, pool, fingerprint hash) -> fingerprint -> [(target, e)]
+        # The hash is consistent with `Fingerprint.equal_to`, so finding the
+        # watches that match a fingerprint only takes one lookup.
         watches = OrderedDict()
         for ctx, exprs in watches_by_context.items():
             exs = ctx.instantiate_examples(examples)
             for target, e, pool in exprs:
                 fp = Fingerprint.of(e, exs)
-                k = (fp, ctx, pool)
-                l = watches.get(k)
+                k = (ctx, pool, fp.hash_for_equal_to())
+                bucket = watches.get(k)
+                if bucket is None:
+                    bucket = OrderedDict()
+                    watches[k] = bucket
+                l = bucket.get(fp)
                 if l is None:
                     l = []
-                    watches[k] = l
+                    bucket[fp] = l
                 l.append((target, e))
 
         watched_ctxs = list(unique((ctx, pool) for _, _, ctx, pool in exploration_order(targets, root_ctx)))
@@ -349,10 +392,7 @@ def search_for_improvements(
                 for info in enum.enumerate_with_info(size=size, context=ctx, pool=pool):
                     with task("searching for obvious substitution", expression=pprint(info.e)):
                         fp = info.fingerprint
-                        for ((fpx, cc, pp), reses) in watches.items():
-                            if cc != ctx or pp != pool:
-                                continue
-
+                        for (fpx, reses) in watches.get((ctx, pool, fp.hash_for_equal_to()), {}).items():
                             if not fpx.equal_to(fp):
                                 continue
 
@@ -433,7 +473,8 @@ def _consider_replacement(
         target, context, RUNTIME_POOL,
         e, ctx, pool,
         replacement), context)
-    if any(alpha_equivalent(t, new_target) for t in info.targets):
+    h = alpha_hash(new_target)
+    if any(alpha_hash(t) == h and alpha_equivalent(t, new_target) for t in info.targets):
         event("already seen")
         return
     wf = info.check_wf(new_target, context, RUNTIME_POOL)
@@ -19,6 +19,7 @@ from collections import namedtuple, defaultdict, OrderedDict
 import datetime
 import itertools
 import functools
+from typing import Callable
 
 from cozy.common import pick_to_sum, OrderedSet, unique, make_random_access, StopException, Periodically
 from cozy.syntax import (
@@ -36,8 +37,9 @@ from cozy.target_syntax import (
     EMap, EFilter, EFlatMap,
     TMap, EMakeMap2, EMapKeys, EMapGet, EHasKey)
 from cozy.structures import all_extension_handlers
-from cozy.syntax_tools import pprint, fresh_var, free_vars, freshen_binders, alpha_equivalent, all_types
-from cozy.evaluation import eval_bulk, construct_value, values_equal
+from cozy.syntax_tools import pprint, fresh_var, free_vars, freshen_binders, alpha_equivalent, alpha_hash, all_types, hash_cons
+from cozy.evaluation import eval_bulk, construct_value
+from cozy.value_types import values_equal, hash_value
 from cozy.typecheck import is_numeric, is_scalar, is_collection, is_ordered
 from cozy.cost_model import CostModel, Order
 from cozy.pools import Pool, RUNTIME_POOL, STATE_POOL, pool_name
@@ -50,6 +52,16 @@ do_enumerate = Option("enumeration", bool, True,
         + "Disabling this option cripples Cozy, but makes the effect of the "
         + "acceleration rules more apparent.")
 
+hash_cons_exps = Option("hash-cons", bool, True,
+    description="Share structurally identical subexpressions between "
+        + "enumerated expressions.")
+
+max_shadowed_exps = Option("max-shadowed-exps", int, 100000, metavar="N",
+    description="Maximum number of skipped or evicted expressions that an "
+        + "enumerator keeps in case new examples tell them apart from the "
+        + "expressions it preferred. Beyond this limit they are forgotten and "
+        + "the next new example clears the enumerator's cache instead.")
+
 @functools.total_ordering
 class Fingerprint(object):
     """A summary of an expression's behavior on some inputs.
@@ -79,6 +91,15 @@ class Fingerprint(object):
         """Compute the fingerprint of an expression over the given inputs."""
         return Fingerprint(e.type, eval_bulk(e, inputs))
 
+    def extend(self, e : Exp, inputs : [{str:object}]):
+        """Extend this fingerprint of `e` with its behavior on more inputs.
+
+        If this fingerprint was computed over inputs `xs`, then the result is
+        the same as `Fingerprint.of(e, xs + inputs)`, but `e` only needs to be
+        evaluated on the new inputs.
+        """
+        return Fingerprint(self.type, self.signature + tuple(eval_bulk(e, inputs)))
+
     def __init__(self, type : Type, signature : [object]):
         self.type = type
         self.signature = tuple(signature)
@@ -136,6 +157,15 @@ class Fingerprint(object):
             and len(self.signature) == len(other.signature)
             and all(values_equal(self.type, v1, v2) for (v1, v2) in zip(self.signature, other.signature)))
 
+    def hash_for_equal_to(self) -> int:
+        """A hash code that is consistent with `equal_to`.
+
+        If `fp1.equal_to(fp2)` then
+        `fp1.hash_for_equal_to() == fp2.hash_for_equal_to()`.  (Note that this
+        is not true of `hash`, which is consistent with `==` instead.)
+        """
+        return hash((self.type, tuple(hash_value(self.type, v) for v in self.signature)))
+
     def subset_of(self, other) -> bool:
         """Determine whether this fingerprint looks like a subset of the other.
 
@@ -242,11 +272,20 @@ def eviction_policy(new_exp : Exp, new_ctx : Context, old_exp : Exp, old_ctx : C
     raise ValueError(ordering)
 
 class ExpCache(object):
-    """Cache for expressions used by Enumerator instances."""
+    """Cache for expressions used by Enumerator instances.
+
+    In addition to the expressions themselves, the cache can hold "shadowed"
+    expressions: expressions that were left out because an equivalent
+    expression was preferred.  Those are not visible through the normal lookup
+    methods, but the Enumerator may bring them back when new examples show
+    that they are not equivalent after all.
+    """
 
     def __init__(self):
         """Construct an empty cache."""
         self.data = OrderedDict() # (Pool, Context) -> (int -> [EnumeratedExp], Fingerprint -> [EnumeratedExp])
+        self.shadowed = OrderedDict() # (Pool, Context) -> [EnumeratedExp]
+        self.shadowed_count = 0
 
     def __len__(self):
         """Return the total number of cached expressions across all contexts and pools."""
@@ -277,6 +316,57 @@ class ExpCache(object):
         by_size[enumerated_exp.size].remove(enumerated_exp)
         by_fingerprint[enumerated_exp.fingerprint].remove(enumerated_exp)
 
+    def shadow(self, context : Context, pool : Pool, enumerated_exp : EnumeratedExp):
+        """Record an expression that is equivalent to a cached one."""
+        self.shadowed.setdefault((pool, context), []).append(enumerated_exp)
+        self.shadowed_count += 1
+
+    def unshadow(self, context : Context, pool : Pool, enumerated_exp : EnumeratedExp):
+        """Move a shadowed expression into the cache."""
+        self.shadowed[(pool, context)].remove(enumerated_exp)
+        self.shadowed_count -= 1
+        self.add(context, pool, enumerated_exp)
+
+    def clear_shadowed(self):
+        """Forget all shadowed expressions."""
+        self.shadowed.clear()
+        self.shadowed_count = 0
+
+    def find_shadowed_expressions(self, context : Context, pool : Pool) -> [EnumeratedExp]:
+        """Iterate over all shadowed expressions in the given context and pool."""
+        yield from self.shadowed.get((pool, context), ())
+
+    def remove_sizes(self, context : Context, pool : Pool, sizes : Callable[[int], bool]):
+        """Remove all expressions whose sizes satisfy the given predicate.
+
+        Shadowed expressions are removed as well.
+        """
+        key = (pool, context)
+        if key in self.data:
+            by_size, by_fingerprint = self.data[key]
+            for sz in [sz for sz in by_size.keys() if sizes(sz)]:
+                for entry in by_size.pop(sz):
+                    by_fingerprint[entry.fingerprint].remove(entry)
+        if key in self.shadowed:
+            entries = self.shadowed[key]
+            self.shadowed[key] = [entry for entry in entries if not sizes(entry.size)]
+            self.shadowed_count -= len(entries) - len(self.shadowed[key])
+
+    def update_fingerprints(self, f : Callable[[Context, Pool, EnumeratedExp], Fingerprint]):
+        """Recompute the fingerprint of every expression, including shadowed ones.
+
+        The new fingerprint of each entry `x` in context `ctx` and pool `p` is
+        `f(ctx, p, x)`.  Expressions that used to have the same fingerprint
+        may end up with different ones.
+        """
+        for (pool, context), (by_size, _) in list(self.data.items()):
+            entries = [x._replace(fingerprint=f(context, pool, x)) for l in by_size.values() for x in l]
+            del self.data[(pool, context)]
+            for x in entries:
+                self.add(context, pool, x)
+        for (pool, context), entries in self.shadowed.items():
+            self.shadowed[(pool, context)] = [x._replace(fingerprint=f(context, pool, x)) for x in entries]
+
     def all_contexts(self) -> [Context]:
         """Iterate over the unique contexts that the cache has seen."""
         return unique(context for pool, context in self.data.keys())
@@ -301,9 +391,11 @@ class Enumerator(object):
      - if two expressions behave the same on all examples, only the better one
        is kept in the cache (although clients might still see the worse one if
        it gets discovered first)
+     - new examples can be added with `add_examples` without losing the work
+       done so far (if the enumerator was constructed with incremental=True)
     """
 
-    def __init__(self, examples, cost_model : CostModel, check_wf=None, hints=None, heuristics=None, stop_callback=None, do_eviction=True):
+    def __init__(self, examples, cost_model : CostModel, check_wf=None, hints=None, heuristics=None, stop_callback=None, do_eviction=True, incremental=False):
         """Set up a fresh enumerator.
 
         Parameters:
@@ -317,6 +409,11 @@ class Enumerator(object):
            enumeration
          - do_eviction: boolean. if true, this class spends time
            trying to evict older, slower versions of expressions from its cache
+         - incremental: boolean. if true, this class remembers expressions that
+           it skipped or evicted in favor of equivalent ones, so that
+           `add_examples` can bring them back if the new examples tell them
+           apart.  This costs memory, up to --max-shadowed-exps expressions;
+           past that limit, `add_examples` clears the cache instead.
         """
         self.examples = list(examples)
         self.cost_model = cost_model
@@ -339,6 +436,8 @@ class Enumerator(object):
             stop_callback = lambda: False
         self.stop_callback = stop_callback
         self.do_eviction = do_eviction
+        self.incremental = incremental
+        self.shadows_dropped = False
         self.stat_timer = Periodically(self.print_stats, timespan=datetime.timedelta(seconds=2))
 
     def print_stats(self):
@@ -347,6 +446,17 @@ class Enumerator(object):
     def cache_size(self):
         return len(self.cache)
 
+    def _shadow(self, context : Context, pool : Pool, entry : EnumeratedExp):
+        """Remember a skipped or evicted expression for `add_examples`."""
+        if not self.incremental or self.shadows_dropped:
+            return
+        if self.cache.shadowed_count >= max_shadowed_exps.value:
+            event("too many shadowed expressions; forgetting them")
+            self.cache.clear_shadowed()
+            self.shadows_dropped = True
+            return
+        self.cache.shadow(context, pool, entry)
+
     def _enumerate_core(self, context : Context, size : int, pool : Pool) -> [Exp]:
         """Build new expressions of the given size.
 
@@ -577,9 +687,83 @@ class Enumerator(object):
         else:
             assert k not in self.in_progress, "recursive enumeration?? {}".format(k)
             self.in_progress.add(k)
-            yield from self._enumerate_with_info(context, size, pool)
-            self.in_progress.remove(k)
-            self.complete.add(k)
+            finished = False
+            try:
+                yield from self._enumerate_with_info(context, size, pool)
+                finished = True
+            finally:
+                self.in_progress.remove(k)
+                if finished:
+                    self.complete.add(k)
+                else:
+                    # The client stopped listening partway through.  Forget
+                    # the partial results so that a later call starts over.
+                    cache.remove_sizes(context, pool, lambda sz: sz == size)
+
+    def add_examples(self, new_examples : [{str:object}]):
+        """Add new examples without discarding the cache.
+
+        Every cached expression is re-fingerprinted by evaluating it on the new
+        examples only, so equivalence classes that the new examples tell apart
+        are split in place.  If a skipped or evicted expression turns out to be
+        unlike every cached expression, it is brought back into the cache.
+        Since larger expressions were never built out of it, every cached
+        expression larger than the smallest such expression is discarded and
+        will be enumerated again on demand.  Expressions of other sizes are
+        kept, so the work done on them is not repeated.
+
+        If the enumerator had to forget shadowed expressions (see
+        --max-shadowed-exps), the cache cannot be updated this way and is
+        cleared instead.
+
+        This method requires incremental=True and may not be called while an
+        enumeration is in progress.
+        """
+        assert self.incremental, "add_examples requires incremental=True"
+        assert not self.in_progress, "cannot add examples during enumeration"
+        new_examples = list(new_examples)
+        self.examples.extend(new_examples)
+        if self.shadows_dropped:
+            event("clearing the cache, since shadowed expressions were forgotten")
+            self.cache = ExpCache()
+            self.complete = set()
+            self.shadows_dropped = False
+            return
+        cache = self.cache
+        with task("adding examples", count=len(new_examples), cache_size=self.cache_size()):
+            instantiated = {}
+            def refingerprint(context, pool, entry):
+                exs = instantiated.get(context)
+                if exs is None:
+                    exs = context.instantiate_examples(new_examples)
+                    instantiated[context] = exs
+                return entry.fingerprint.extend(entry.e, exs)
+            cache.update_fingerprints(refingerprint)
+
+            def is_unique(context, pool, entry):
+                return not any(cache.find_equivalent_expressions(context, pool, entry.fingerprint))
+
+            smallest_revived = min(
+                (entry.size
+                    for (pool, context) in cache.shadowed.keys()
+                    for entry in cache.find_shadowed_expressions(context, pool)
+                    if is_unique(context, pool, entry)),
+                default=None)
+            if smallest_revived is None:
+                return
+
+            # Discard larger expressions first: some of them may have evicted
+            # smaller ones that now deserve to come back.
+            event("discarding expressions larger than {}".format(smallest_revived))
+            for (pool, context) in list(cache.data.keys()) + list(cache.shadowed.keys()):
+                cache.remove_sizes(context, pool, lambda sz: sz > smallest_revived)
+            self.complete = set(k for k in self.complete if k[1] <= smallest_revived)
+
+            for (pool, context) in list(cache.shadowed.keys()):
+                for entry in list(cache.find_shadowed_expressions(context, pool)):
+                    if is_unique(context, pool, entry):
+                        event("reviving {}".format(pprint(entry.e)))
+                        cache.unshadow(context, pool, entry)
 
     def _enumerate_with_info(self, context : Context, size : int, pool : Pool) -> [EnumeratedExp]:
         """Helper for enumerate_with_info that bypasses the cache.
@@ -607,6 +791,8 @@ class Enumerator(object):
             self.stat_timer.check()
 
             e = freshen_binders(e, context)
+            if hash_cons_exps.value:
+                e = hash_cons(e)
             _consider(e, size, context, pool)
 
             wf = self.check_wf(e, context, pool)
@@ -620,7 +806,8 @@ class Enumerator(object):
             prev = list(cache.find_equivalent_expressions(context, pool, fp))
             to_evict = []
 
-            if any(e.type == prev_entry.e.type and alpha_equivalent(e, prev_entry.e) for prev_entry in prev):
+            h = alpha_hash(e)
+            if any(e.type == prev_entry.e.type and alpha_hash(prev_entry.e) == h and alpha_equivalent(e, prev_entry.e) for prev_entry in prev):
                 _skip(e, size, context, pool, "duplicate")
                 should_keep = False
             else:
@@ -635,6 +822,7 @@ class Enumerator(object):
                             if e not in to_keep:
                                 _skip(e, size, context, pool, "preferring {}".format(pprint(prev_exp)))
                                 should_keep = False
+                                self._shadow(context, pool, EnumeratedExp(e=e, fingerprint=fp, size=size))
                                 break
                             if prev_exp not in to_keep:
                                 to_evict.append(entry)
@@ -648,6 +836,7 @@ class Enumerator(object):
                         for entry in to_evict:
                             _evict(entry.e, entry.size, context, pool, e, size)
                             cache.remove(context, pool, entry)
+                            self._shadow(context, pool, entry)
 
                 _accept(e, size, context, pool, fp)
                 info = EnumeratedExp(
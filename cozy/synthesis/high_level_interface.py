@@ -21,9 +21,11 @@ from cozy import jobs
 from cozy.contexts import Context
 from cozy.opts import Option
 from cozy.cost_model import CostModel
+from cozy.workload import method_frequencies
 
 from . import core
 from .impls import Implementation
+from .result_cache import ResultCache, cache_key, synthesis_cache_dir
 
 nice_children = Option("nice-children", bool, False,
     description='Apply a high Unix "niceness" value to child processes. '
@@ -33,6 +35,17 @@ nice_children = Option("nice-children", bool, False,
 log_dir = Option("log-dir", str, "/tmp",
     description="Location to place log files for child processes.")
 
+max_jobs = Option("jobs", int, 0, metavar="N",
+    description="Maximum number of query synthesis jobs to run at once. "
+        + "Jobs beyond this limit are queued and rotated in time slices so "
+        + "that every query still makes progress. Queued jobs that have "
+        + "already started stay in memory while they wait, so this limits CPU "
+        + "usage but not memory usage. Use 0 for no limit.")
+
+job_timeslice = Option("job-timeslice", int, 10, metavar="SECONDS",
+    description="How long a query synthesis job may run before yielding to "
+        + "a queued job (only relevant when --jobs is nonzero).")
+
 class ImproveQueryJob(jobs.Job):
     @typechecked
     def __init__(self,
@@ -43,7 +56,8 @@ class ImproveQueryJob(jobs.Job):
             k,
             hints       : [Exp]     = [],
             freebies    : [Exp]     = [],
-            ops         : [Op]      = []):
+            ops         : [Op]      = [],
+            frequencies : {str:int} = {}):
         super().__init__()
         self.state = state
         self.assumptions = assumptions
@@ -54,6 +68,7 @@ class ImproveQueryJob(jobs.Job):
         self.hints = hints
         self.freebies = freebies
         self.ops = ops
+        self.frequencies = frequencies
         self.k = k
     def __str__(self):
         return "ImproveQueryJob[{}]".format(self.q.name)
@@ -72,11 +87,23 @@ class ImproveQueryJob(jobs.Job):
                     funcs=self.context.funcs(),
                     assumptions=EAll(self.assumptions),
                     freebies=self.freebies,
-                    ops=self.ops)
+                    ops=self.ops,
+                    frequencies=self.frequencies,
+                    query=self.q.name)
+
+            cache = None
+            start = self.q.ret
+            if synthesis_cache_dir.value:
+                cache = ResultCache(synthesis_cache_dir.value)
+                key = cache_key(self.q, self.state, self.assumptions, self.ops, self.context.funcs(), self.freebies, self.frequencies)
+                cached = cache.lookup(key, self.q, self.context, self.assumptions)
+                if cached is not None:
+                    print("starting from cached implementation {}".format(pprint(cached)))
+                    start = cached
 
             try:
-                for expr in itertools.chain((self.q.ret,), core.improve(
-                        target=self.q.ret,
+                for expr in itertools.chain((start,), core.improve(
+                        target=start,
                         assumptions=EAll(self.assumptions),
                         context=self.context,
                         hints=self.hints,
@@ -84,6 +111,8 @@ class ImproveQueryJob(jobs.Job):
                         cost_model=cost_model,
                         ops=self.ops)):
 
+                    if cache is not None and expr is not start:
+                        cache.store(key, self.q, expr, cost_model, self.context)
                     new_rep, new_ret = unpack_representation(expr)
                     self.k(new_rep, new_ret)
                 print("PROVED OPTIMALITY FOR {}".format(self.q.name))
@@ -94,7 +123,8 @@ class ImproveQueryJob(jobs.Job):
 def improve_implementation(
         impl              : Implementation,
         timeout           : datetime.timedelta = datetime.timedelta(seconds=60),
-        progress_callback : Callable[[Implementation], Any] = None) -> Implementation:
+        progress_callback : Callable[[Implementation], Any] = None,
+        finished_queries  : {str} = frozenset()) -> Implementation:
     """Improve an implementation.
 
     This function tries to synthesize a better version of the given
@@ -103,6 +133,9 @@ def improve_implementation(
     If provided, progress_callback will be called whenever a better
     implementation is found.  It will be given the better implementation, which
     it should not modify or cache.
+
+    No improvement jobs are started for queries named in finished_queries
+    (e.g. those carried over by `reuse_implementation`).
     """
 
     start_time = datetime.datetime.now()
@@ -112,13 +145,16 @@ def improve_implementation(
 
     # worker threads ("jobs"), one per query
     improvement_jobs = []
+    scheduler = jobs.JobScheduler(
+        max_running=max_jobs.value or None,
+        timeslice=datetime.timedelta(seconds=job_timeslice.value))
 
     with jobs.SafeQueue() as solutions_q:
 
         def stop_jobs(js):
             """Stop the given jobs and remove them from `improvement_jobs`."""
             js = list(js)
-            jobs.stop_jobs(js)
+            scheduler.stop(js)
             for j in js:
                 improvement_jobs.remove(j)
 
@@ -130,9 +166,10 @@ def improve_implementation(
 
             # figure out what new jobs we need
             job_query_names  = set(j.q.name for j in improvement_jobs)
+            frequencies = method_frequencies(impl)
             new = []
             for q in impl.query_specs:
-                if q.name not in job_query_names:
+                if q.name not in job_query_names and q.name not in finished_queries:
                     states_maintained_by_q = impl.states_maintained_by(q)
                     new.append(ImproveQueryJob(
                         impl.abstract_state,
@@ -142,7 +179,8 @@ def improve_implementation(
                         k=(lambda q: lambda new_rep, new_ret: solutions_q.put((q, new_rep, new_ret)))(q),
                         hints=[EStateVar(c).with_type(c.type) for c in impl.concretization_functions.values()],
                         freebies=[e for (v, e) in impl.concretization_functions.items() if EVar(v) in states_maintained_by_q],
-                        ops=impl.op_specs))
+                        ops=impl.op_specs,
+                        frequencies=frequencies))
 
             # figure out what old jobs we can stop
             impl_query_names = set(q.name for q in impl.query_specs)
@@ -151,7 +189,7 @@ def improve_implementation(
             # make it so
             stop_jobs(old)
             for j in new:
-                j.start()
+                scheduler.submit(j)
             improvement_jobs.extend(new)
 
         # start jobs
@@ -161,6 +199,7 @@ def improve_implementation(
         timeout = Timeout(timeout)
         done = False
         while not done and not timeout.is_timed_out():
+            scheduler.check()
             for j in improvement_jobs:
                 if j.done:
                     if j.successful:
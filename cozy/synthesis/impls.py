@@ -7,6 +7,10 @@ they store various other information to aid synthesis.
 `Implementation` objects are typically constructed using the
 `construct_initial_implementation` function that converts a specification to a
 slow, but correct, implementation.
+
+When a specification is edited, `reuse_implementation` can carry the still-
+correct parts of an older implementation (e.g. one saved with --save) over to
+the initial implementation of the new specification.
 """
 
 import itertools
@@ -18,13 +22,13 @@ from cozy.syntax import (
     TFunc,
     Exp, EVar, EAll, ECall, EEq, EImplies, EGetField, ELambda, EIn, ENot, EUnaryOp, UOp,
     Stm, SNoOp, SForEach, seq)
-from cozy.target_syntax import EFilter, EDeepIn
-from cozy.syntax_tools import subst, free_vars, fresh_var, all_exps, BottomUpRewriter, pprint, shallow_copy, unpack_representation, rewrite_ret, strip_EStateVar
+from cozy.target_syntax import EFilter, EDeepIn, EStateVar
+from cozy.syntax_tools import subst, free_vars, fresh_var, all_exps, BottomUpRewriter, pprint, shallow_copy, unpack_representation, rewrite_ret, strip_EStateVar, alpha_equivalent
 from cozy.handle_tools import reachable_handles_at_method, implicit_handle_assumptions
 import cozy.state_maintenance as inc
 from cozy.opts import Option
 from cozy.simplification import simplify
-from cozy.solver import valid, ModelCachingSolver
+from cozy.solver import valid, ModelCachingSolver, solver_for_context
 from cozy.logging import task, event
 from cozy.graph_theory import DirectedGraph
 from cozy.contexts import Context, RootCtx
@@ -37,6 +41,10 @@ dedup_queries = Option("deduplicate-subqueries", bool, True,
         + "adds to the implementation. While deduplication is slow (it involves "
         + "a solver call), it results in far fewer query synthesis threads.")
 
+# Number of existing state variables to compare a new one against per
+# solver call when looking for duplicates.
+_EQUIVALENCE_BATCH_SIZE = 4
+
 def simplify_or_ignore(e):
     ee = simplify(e)
     return ee if ee.size() < e.size() else e
@@ -317,7 +325,17 @@ class Implementation(object):
             with task("finding duplicated state vars"):
                 to_remove = set()
                 for (v, e) in rep:
-                    aeq = find_one(vv for (vv, ee) in self._concretization_functions if e.type == ee.type and self.state_solver.valid(EEq(e, ee)))
+                    candidates = [(vv, ee) for (vv, ee) in self._concretization_functions if e.type == ee.type]
+                    aeq = None
+                    # Check a few candidates per solver call, stopping at the
+                    # first equivalent one.  A candidate the solver cannot
+                    # decide is treated as different.
+                    for i in range(0, len(candidates), _EQUIVALENCE_BATCH_SIZE):
+                        batch = candidates[i:i+_EQUIVALENCE_BATCH_SIZE]
+                        equivalent = self.state_solver.valid_all([EEq(e, ee) for (vv, ee) in batch], raise_on_unknown=False)
+                        aeq = find_one(vv for ((vv, ee), eq) in zip(batch, equivalent) if eq is True)
+                        if aeq is not None:
+                            break
                     # aeq = find_one(vv for (vv, ee) in self._concretization_functions if e.type == ee.type and alpha_equivalent(e, ee))
                     if aeq is not None:
                         event("state var {} is equivalent to {}".format(v.id, aeq.id))
@@ -480,6 +498,18 @@ class Implementation(object):
             if isinstance(e, ECall) and e.func in [q.name for q in self.query_specs]:
                 yield e.func
 
+    def packed_impl(self, q : Query) -> Exp:
+        """Get the implementation of a query as a single expression.
+
+        The result is in terms of abstract state and the arguments of `q`;
+        every use of a concrete state variable is replaced by an EStateVar
+        wrapping its concretization function.  This is the inverse of
+        `unpack_representation`, and the result is suitable for `set_impl`.
+        """
+        return subst(
+            self.query_impls[q.name].ret,
+            { v : EStateVar(e).with_type(e.type) for (v, e) in self.concretization_functions.items() })
+
     def states_maintained_by(self, q : Query) -> [EVar]:
         concrete_vars = []
         for (var_name, op_name), stm in self.updates.items():
@@ -502,3 +532,60 @@ def construct_initial_implementation(spec : Spec) -> Implementation:
     impl.cleanup()
 
     return impl
+
+def _rename_args(e : Exp, old_q : Query, new_q : Query) -> Exp:
+    return subst(e, { a : EVar(b).with_type(t) for ((a, t), (b, _)) in zip(old_q.args, new_q.args) })
+
+def _candidate_queries(q : Query, old : Implementation) -> [Query]:
+    """Queries in `old` whose implementations might also implement `q`.
+
+    A public query is matched by name, since its specification may have been
+    edited.  Internal queries get fresh names every run, so they are matched
+    by their specifications instead.
+    """
+    arg_types = [t for (a, t) in q.args]
+    for old_q in old.query_specs:
+        if [t for (a, t) in old_q.args] != arg_types or old_q.ret.type != q.ret.type:
+            continue
+        if old_q.name == q.name:
+            yield old_q
+        elif q.visibility == Visibility.Internal and old_q.visibility == Visibility.Internal and alpha_equivalent(_rename_args(old_q.ret, old_q, q), q.ret):
+            yield old_q
+
+def reuse_implementation(impl : Implementation, old : Implementation) -> {str}:
+    """Copy still-correct query implementations from `old` into `impl`.
+
+    `impl` should be a fresh implementation of an edited specification (see
+    `construct_initial_implementation`) and `old` an implementation of the
+    original one.  Every query in `impl` with a counterpart in `old` gets the
+    counterpart's implementation, provided the solver confirms that it still
+    meets the new specification.  Maintenance code is always regenerated, so
+    edits to update operations are handled as well.
+
+    Returns the names of the queries whose implementations were reused; only
+    the remaining queries need further synthesis.
+    """
+    reused = set()
+    visited = set()
+    changed = True
+    while changed:
+        changed = False
+        for q in list(impl.query_specs):
+            if q.name in visited or q not in impl.query_specs:
+                continue
+            visited.add(q.name)
+            with task("looking for reusable implementation", query=q.name):
+                checker = solver_for_context(
+                    context=impl.context_for_method(q),
+                    assumptions=EAll(impl.spec.assumptions))
+                for old_q in _candidate_queries(q, old):
+                    e = _rename_args(old.packed_impl(old_q), old_q, q)
+                    if checker.valid(EImplies(EAll(q.assumptions), EEq(q.ret, e))):
+                        event("reusing implementation of {} for {}".format(old_q.name, q.name))
+                        rep, ret = unpack_representation(e)
+                        impl.set_impl(q, rep, ret)
+                        impl.cleanup()
+                        reused.add(q.name)
+                        changed = True
+                        break
+    return set(q.name for q in impl.query_specs if q.name in reused)
@@ -0,0 +1,141 @@
+"""Persistent on-disk cache of synthesized query implementations.
+
+Synthesis is deterministic in spirit but very slow, and build pipelines tend
+to regenerate the same specifications over and over.  This module stores the
+best implementation found for each query so that later runs can start from it
+instead of from the naive implementation.
+
+Entries are content-addressed: the key is a hash of everything that affects
+what the best implementation of a query is (its return expression and
+arguments, its assumptions, the abstract state, the update operations, the
+extern functions, the freebies, and the cost model).  Names that do not matter---the query
+name, its argument names, and the names of bound variables---are normalized
+away before hashing, so the auxiliary queries that Cozy invents with fresh
+names get the same key from one run to the next.
+
+Important functions and classes:
+ - ResultCache: a directory of cached results
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from cozy.syntax import Query, Op, Exp, EVar, EAll, EImplies, EEq
+from cozy.syntax_tools import canonicalize_binders, pprint
+from cozy.cost_model import CostModel, Order, cost_model_selection, calibration
+from cozy.contexts import Context
+from cozy.pools import RUNTIME_POOL
+from cozy.solver import solver_for_context
+from cozy.opts import Option
+
+synthesis_cache_dir = Option("synthesis-cache", str, "", metavar="DIR",
+    description="Directory for a persistent cache of synthesized query "
+        + "implementations. Queries found in the cache start from the cached "
+        + "implementation instead of the naive one. Leave empty to disable.")
+
+# Bump this whenever the on-disk format or the meaning of keys changes.
+FORMAT_VERSION = 2
+
+def _arg_renaming(q : Query) -> {str:str}:
+    return { a : "_arg{}".format(i) for (i, (a, t)) in enumerate(q.args) }
+
+def cache_key(
+        q           : Query,
+        state_vars  : [EVar],
+        assumptions : [Exp],
+        ops         : [Op],
+        funcs       : dict,
+        freebies    : [Exp] = [],
+        frequencies : {str:int} = {}) -> str:
+    """Compute the cache key for a query.
+
+    The key is stable across runs and insensitive to the name of the query,
+    the names of its arguments, and the names of bound variables.  Of the
+    workload `frequencies`, only those the cost model looks at (the query's
+    own and the ops') are part of the key.
+    """
+    renaming = _arg_renaming(q)
+    parts = (
+        FORMAT_VERSION,
+        cost_model_selection.value,
+        tuple(sorted(calibration().items())),
+        tuple((v.id, v.type) for v in state_vars),
+        tuple(sorted(funcs.items())),
+        tuple(t for (a, t) in q.args),
+        tuple(canonicalize_binders(a, renaming) for a in assumptions),
+        canonicalize_binders(q.ret, renaming),
+        tuple(canonicalize_binders(op, {}) for op in ops),
+        tuple(canonicalize_binders(e, {}) for e in freebies),
+        frequencies.get(q.name, 1),
+        tuple(frequencies.get(op.name, 1) for op in ops))
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+class ResultCache(object):
+    """A directory of cached query implementations.
+
+    Each entry stores the packed expression (see `unpack_representation`)
+    that implements a query.  Since the key covers everything the cost model
+    depends on, every run that uses an entry ranks implementations the same
+    way; `store` uses that ranking to avoid replacing a good entry with a
+    worse one when several runs write the same entry at the same time.
+
+    Writes are atomic, so many processes can safely share one cache.
+    """
+
+    def __init__(self, directory : str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key : str) -> str:
+        return os.path.join(self.directory, "{}.pickle".format(key))
+
+    def _read(self, key : str):
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print("WARNING: ignoring unreadable cache entry {}: {}".format(key, e))
+            return None
+
+    def lookup(self, key : str, q : Query, context : Context, assumptions : [Exp] = ()) -> Exp:
+        """Find the cached implementation for `q`, or None.
+
+        The result is in terms of the arguments of `q`.  Entries are only
+        returned if the solver confirms that they implement `q` in the given
+        context under the given assumptions; a stale or corrupted entry is
+        ignored (and will be overwritten by the next call to `store`).
+        """
+        entry = self._read(key)
+        if entry is None:
+            return None
+        e = canonicalize_binders(entry["e"], { name : a for (a, name) in _arg_renaming(q).items() })
+        checker = solver_for_context(context=context, assumptions=EAll(assumptions))
+        if not checker.valid(EImplies(EAll(q.assumptions), EEq(q.ret, e))):
+            print("WARNING: ignoring incorrect cache entry {}: {}".format(key, pprint(e)))
+            return None
+        return e
+
+    def store(self, key : str, q : Query, e : Exp, cost_model : CostModel, context : Context):
+        """Record `e` as the best known implementation of `q`.
+
+        The entry is not updated if the cache already holds an implementation
+        that `cost_model` considers cheaper in the given context.
+        """
+        old = self._read(key)
+        if old is not None:
+            old_e = canonicalize_binders(old["e"], { name : a for (a, name) in _arg_renaming(q).items() })
+            if cost_model.compare(old_e, e, context, RUNTIME_POOL) == Order.LT:
+                return
+        entry = { "e" : canonicalize_binders(e, _arg_renaming(q)) }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except:
+            os.unlink(tmp_path)
+            raise
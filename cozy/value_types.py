@@ -18,38 +18,57 @@ These classes all have a few important attributes:
 
 Important functions:
  - compare_values: compare two Cozy values
+ - hash_value: hash a Cozy value consistently with normal equality
+ - normal_equality_key: cheap hashable stand-ins for values, when they exist
+ - bag_contains, bag_difference, bag_distinct, bag_are_unique: collection
+   operations that respect normal equality
 """
 
-from collections import namedtuple
-from functools import total_ordering
+from collections import namedtuple, Counter
+from functools import total_ordering, lru_cache, cmp_to_key
 
 from cozy.syntax import (
-    Type, THandle, INT, TEnum, TBag, TSet, TMap, TTuple, TList, TRecord)
+    Type, THandle, INT, TEnum, TBag, TSet, TMap, TTuple, TList, TRecord,
+    TInt, TLong, TFloat, TBool, TString, TNative)
 from cozy.structures import extension_handler
 
 @total_ordering
 class Map(object):
-    """A Cozy key-value map."""
+    """A Cozy key-value map.
+
+    If the key type has a `normal_equality_key`, lookups go through a hash
+    index.  Otherwise they scan the entries in order.
+    """
 
     def __init__(self, type, default, items=()):
         self.type = type
         self.default = default
         self._items = []
+        self._index = {} # normal_equality_key(key) -> position in _items
         for (k, v) in items:
             self[k] = v
-    def __setitem__(self, k, v):
+    def _find(self, k):
+        key = normal_equality_key(self.type.k)
+        if key is not None:
+            return self._index.get(key(k))
         for i in range(len(self._items)):
-            (kk, vv) = self._items[i]
-            if values_equal(self.type.k, k, kk):
-                self._items[i] = (kk, v)
-                return
+            if values_equal(self.type.k, k, self._items[i][0]):
+                return i
+        return None
+    def __setitem__(self, k, v):
+        i = self._find(k)
+        if i is not None:
+            self._items[i] = (self._items[i][0], v)
+            return
+        key = normal_equality_key(self.type.k)
+        if key is not None:
+            self._index[key(k)] = len(self._items)
         self._items.append((k, v))
     def __getitem__(self, k):
-        for i in range(len(self._items)):
-            (kk, vv) = self._items[i]
-            if values_equal(self.type.k, k, kk):
-                return vv
-        return self.default
+        i = self._find(k)
+        return self.default if i is None else self._items[i][1]
+    def __contains__(self, k):
+        return self._find(k) is not None
     def items(self):
         yield from self._items
     def keys(self):
@@ -218,3 +237,125 @@ def compare_values(t : Type, v1, v2, deep : bool = False) -> int:
 def values_equal(t : Type, v1, v2) -> bool:
     """Shorthand for `compare_values(t, v1, v2) == EQ`."""
     return compare_values(t, v1, v2) == EQ
+
+def hash_value(t : Type, v) -> int:
+    """Hash a Cozy value consistently with normal equality.
+
+    If `values_equal(t, v1, v2)` then `hash_value(t, v1) == hash_value(t, v2)`.
+    The built-in `hash` function does not have this property, since Python's
+    == operator implements deep equality (see `compare_values`).
+    """
+    h = extension_handler(type(t))
+    if h is not None:
+        return hash_value(h.encoding_type(t), v)
+    if isinstance(t, THandle):
+        return hash(v.address)
+    if isinstance(t, TBag) or isinstance(t, TSet):
+        return hash(tuple(sorted(hash_value(t.elem_type, x) for x in v)))
+    if isinstance(t, TMap):
+        return hash((
+            hash_value(t.v, v.default),
+            tuple(sorted((hash_value(t.k, k), hash_value(t.v, x)) for (k, x) in v.items()))))
+    if isinstance(t, TTuple):
+        return hash(tuple(hash_value(tt, x) for (tt, x) in zip(t.ts, v)))
+    if isinstance(t, TList):
+        return hash(tuple(hash_value(t.elem_type, x) for x in v))
+    if isinstance(t, TRecord):
+        return hash(tuple(hash_value(ft, v[f]) for (f, ft) in t.fields))
+    return hash(v)
+
+def _identity(v):
+    return v
+
+@lru_cache(maxsize=None)
+def normal_equality_key(t : Type):
+    """Find a cheap function that identifies values up to normal equality.
+
+    Returns a function `f` such that `f(v1) == f(v2)` if and only if
+    `values_equal(t, v1, v2)`, and whose results are hashable.  Returns None
+    if values of type `t` have no such cheap stand-in; that is the case for
+    collections, whose normal equality ignores element order.
+    """
+    h = extension_handler(type(t))
+    if h is not None:
+        return normal_equality_key(h.encoding_type(t))
+    if isinstance(t, (TInt, TLong, TFloat, TBool, TString, TNative, TEnum)):
+        return _identity
+    if isinstance(t, THandle):
+        return lambda v: v.address
+    if isinstance(t, TTuple):
+        keys = [normal_equality_key(tt) for tt in t.ts]
+        if any(k is None for k in keys):
+            return None
+        return lambda v: tuple(k(x) for (k, x) in zip(keys, v))
+    if isinstance(t, TRecord):
+        keys = [(f, normal_equality_key(ft)) for (f, ft) in t.fields]
+        if any(k is None for (f, k) in keys):
+            return None
+        return lambda v: tuple(k(v[f]) for (f, k) in keys)
+    return None
+
+def bag_contains(elem_type : Type, bag, x) -> bool:
+    """Determine whether `bag` has an element equal to `x`."""
+    key = normal_equality_key(elem_type)
+    if key is _identity:
+        return x in bag
+    if key is not None:
+        k = key(x)
+        return any(key(y) == k for y in bag)
+    return any(values_equal(elem_type, x, y) for y in bag)
+
+def bag_difference(elem_type : Type, bag1, bag2) -> list:
+    """Remove the elements of `bag2` from `bag1`.
+
+    For each element of `bag2`, the first remaining equal element of `bag1`
+    is removed.  The result lists the remaining elements in their original
+    order.
+    """
+    key = normal_equality_key(elem_type)
+    if key is not None:
+        to_remove = Counter(key(x) for x in bag2)
+        res = []
+        for x in bag1:
+            k = key(x)
+            if to_remove[k] > 0:
+                to_remove[k] -= 1
+            else:
+                res.append(x)
+        return res
+    elems = list(bag1)
+    for x in bag2:
+        for i in range(len(elems)):
+            if values_equal(elem_type, x, elems[i]):
+                del elems[i]
+                break
+    return elems
+
+def bag_distinct(elem_type : Type, bag) -> list:
+    """The first element of `bag` from each class of equal elements, in order."""
+    key = normal_equality_key(elem_type)
+    res = []
+    if key is not None:
+        seen = set()
+        for x in bag:
+            k = key(x)
+            if k not in seen:
+                seen.add(k)
+                res.append(x)
+        return res
+    for x in bag:
+        if not any(values_equal(elem_type, x, y) for y in res):
+            res.append(x)
+    return res
+
+def bag_are_unique(elem_type : Type, bag) -> bool:
+    """Determine whether no two elements of `bag` are equal."""
+    key = normal_equality_key(elem_type)
+    if key is not None:
+        keys = [key(x) for x in bag]
+        return len(set(keys)) == len(keys)
+    l = sorted(bag, key=cmp_to_key(lambda v1, v2: compare_values(elem_type, v1, v2)))
+    for i in range(len(l) - 1):
+        if values_equal(elem_type, l[i], l[i+1]):
+            return False
+    return True
@@ -0,0 +1,69 @@
+"""Operation frequency profiles.
+
+A profile says how often each method of a data structure is called.  The
+workload-weighted cost model (--cost-model=4) uses it to trade query time
+against the cost of maintaining state during updates.
+
+Profiles come from two places:
+ - "@frequency N" tags in the doc comments of methods in the specification
+ - the JSON file named by --workload, which overrides the tags.  The file
+   holds either an object mapping method names to call counts, or a trace:
+   a list with one method name per call.
+
+Methods that the profile does not mention are assumed to be called once.
+
+Important functions:
+ - spec_frequencies: read the frequency tags in a specification
+ - read_profile: read a JSON profile
+ - method_frequencies: the frequency of every query in an implementation,
+   including Cozy's private helper queries
+"""
+
+from collections import Counter
+import json
+import re
+
+from cozy.syntax import Spec
+from cozy.opts import Option
+
+workload_file = Option("workload", str, "", metavar="FILE",
+    description="JSON file giving the number of calls to each method, as an "
+        + "object {method: calls} or a list of method names (one per call). "
+        + "Used by --cost-model=4.")
+
+_FREQUENCY_TAG = re.compile(r"@frequency\s+(\d+)")
+
+def spec_frequencies(spec : Spec) -> {str : int}:
+    """Read the "@frequency N" tags in the doc comments of `spec`'s methods."""
+    res = { }
+    for m in spec.methods:
+        match = _FREQUENCY_TAG.search(m.docstring or "")
+        if match:
+            res[m.name] = int(match.group(1))
+    return res
+
+def read_profile(path : str) -> {str : int}:
+    """Read a JSON profile (see the module documentation for the format)."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return dict(Counter(data))
+    if isinstance(data, dict) and all(isinstance(v, int) and v >= 0 for v in data.values()):
+        return dict(data)
+    raise ValueError("{}: expected an object mapping method names to call counts, or a list of method names".format(path))
+
+def method_frequencies(impl) -> {str : int}:
+    """Compute how often each query of an Implementation runs.
+
+    Queries in the specification run as often as the profile says.  Private
+    helper queries run whenever an update that uses them runs.  Update
+    operations are included in the result as well.
+    """
+    profile = spec_frequencies(impl.spec)
+    if workload_file.value:
+        profile.update(read_profile(workload_file.value))
+    res = { m.name : profile.get(m.name, 1) for m in impl.spec.methods }
+    for (_, op_name), stm in list(impl.updates.items()) + list(impl.handle_updates.items()):
+        for q in impl.queries_used_by(stm):
+            res[q] = res.get(q, 0) + res[op_name]
+    return res
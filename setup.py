@@ -24,4 +24,8 @@ setup(
     packages=find_packages(),
     entry_points = { "console_scripts": "cozy=cozy.main:run" },
     install_requires=reqs,
+    extras_require={
+        # faster evaluation of expressions on many inputs (see cozy.evaluation)
+        "numpy": ["numpy (>=1.13)"],
+        },
     )
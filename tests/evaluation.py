@@ -1,15 +1,29 @@
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from cozy.target_syntax import *
 from cozy.syntax_tools import *
-from cozy.value_types import Bag, Map, Handle, compare_values, values_equal, EQ
+from cozy.value_types import Bag, Map, Handle, compare_values, values_equal, hash_value, EQ, bag_difference, bag_distinct, bag_are_unique, bag_contains
 from cozy.structures.heaps import TMinHeap
-from cozy.evaluation import eval, uneval
+from cozy.evaluation import eval, eval_bulk, uneval, python_backend, python_backend_threshold, numpy_backend, numpy_backend_threshold, program_cache
 from cozy.typecheck import retypecheck
 
 zero = ENum(0).with_type(INT)
 one  = ENum(1).with_type(INT)
 
+def _linear_difference(elem_type, v1, v2):
+    elems = list(v1)
+    for x in v2:
+        for i in range(len(elems)):
+            if values_equal(elem_type, x, elems[i]):
+                del elems[i]
+                break
+    return elems
+
 class TestEvaluation(unittest.TestCase):
 
     def test_bag_equality(self):
@@ -49,6 +63,20 @@ class TestEvaluation(unittest.TestCase):
         assert b1 != b2
         assert values_equal(TBag(t), b1, b2)
 
+    def test_hash_respects_normal_eq(self):
+        t = THandle("H", INT)
+        h1 = Handle(address=0, value=0)
+        h2 = Handle(address=0, value=1)
+        h3 = Handle(address=1, value=0)
+        b1 = Bag((h1, h3, h3))
+        b2 = Bag((h3, h2, h3))
+        assert hash_value(TBag(t), b1) == hash_value(TBag(t), b2)
+        mt = TMap(INT, TBag(t))
+        m1 = Map(mt, Bag(), [(0, b1), (1, Bag())])
+        m2 = Map(mt, Bag(), [(1, Bag()), (0, b2)])
+        assert values_equal(mt, m1, m2)
+        assert hash_value(mt, m1) == hash_value(mt, m2)
+
     def test_set_sub(self):
         t = TSet(INT)
         s1 = Bag((0, 1))
@@ -89,3 +117,156 @@ class TestEvaluation(unittest.TestCase):
         m = Map(TMap(INT, INT), 0, [(0, 1), (1, 2), (0, 3)])
         ks = list(m.keys())
         self.assertEqual(ks, [0, 1])
+
+    def test_map_handle_keys(self):
+        t = TMap(THandle("H", INT), INT)
+        m = Map(t, 0, [(Handle(0, 0), 1), (Handle(1, 0), 2), (Handle(0, 1), 3)])
+        self.assertEqual(list(m.items()), [(Handle(0, 0), 3), (Handle(1, 0), 2)])
+        self.assertEqual(m[Handle(1, 5)], 2)
+        self.assertEqual(m[Handle(2, 0)], 0)
+        assert Handle(0, 7) in m
+        assert Handle(2, 0) not in m
+
+    def test_map_collection_keys(self):
+        t = TMap(INT_BAG, INT)
+        m = Map(t, 0, [(Bag((0, 1)), 1), (Bag((1, 0)), 2)])
+        self.assertEqual(list(m.items()), [(Bag((0, 1)), 2)])
+        self.assertEqual(m[Bag((1, 0))], 2)
+
+    def test_bag_operations(self):
+        t = THandle("H", INT)
+        h1 = Handle(0, 0)
+        h2 = Handle(0, 1)
+        h3 = Handle(1, 0)
+        for elem_type, b1, b2 in [
+                (t, (h1, h3, h2, h3), (h2, h3)),
+                (INT, (1, 2, 1, 3), (1, 3, 4)),
+                (INT_BAG, (Bag((0, 1)), Bag((1, 0)), Bag(())), (Bag((1, 0)),))]:
+            self.assertEqual(bag_difference(elem_type, b1, b2), _linear_difference(elem_type, b1, b2))
+        self.assertEqual(bag_difference(t, (h1, h3, h2, h3), (h2, h3)), [h2, h3])
+        self.assertEqual(bag_distinct(t, (h2, h3, h1)), [h2, h3])
+        assert not bag_are_unique(t, (h1, h3, h2))
+        assert bag_are_unique(t, (h1, h3))
+        assert bag_contains(t, (h1, h3), h2)
+        assert not bag_contains(t, (h3,), h2)
+
+    def test_program_cache_reuse(self):
+        x = EVar("x").with_type(INT)
+        e = EBinOp(x, "+", ONE).with_type(INT)
+        program_cache.clear()
+        assert eval(e, {"x": 1}) == 2
+        assert eval(e, {"x": 2}) == 3
+        assert program_cache.misses == 1
+        assert program_cache.hits == 1
+
+    def test_program_cache_interned(self):
+        x = EVar("x").with_type(INT)
+        e1 = hash_cons(EBinOp(x, "+", ONE).with_type(INT))
+        e2 = hash_cons(EBinOp(x, "+", ONE).with_type(INT))
+        e3 = hash_cons(EBinOp(x, "+", ONE).with_type(LONG))
+        assert e1 is e2
+        program_cache.clear()
+        assert program_cache.get(e1) is program_cache.get(e2)
+        assert program_cache.get(e1) is not program_cache.get(e3)
+        assert program_cache.misses == 2
+        assert program_cache.hits == 2
+
+    def test_program_cache_respects_types(self):
+        h1 = Handle(address=0, value=0)
+        h2 = Handle(address=0, value=1)
+        env = {"h1": h1, "h2": h2}
+        e1 = EEq(EVar("h1").with_type(THandle("H", INT)), EVar("h2").with_type(THandle("H", INT)))
+        e2 = EEq(EVar("h1").with_type(TNative("H")), EVar("h2").with_type(TNative("H")))
+        assert e1 == e2
+        assert eval(e1, env) is True
+        assert eval(e2, env) is False
+
+class TestPythonBackend(unittest.TestCase):
+
+    def check_backends_agree(self, e, envs):
+        assert retypecheck(e)
+        old = (python_backend.value, python_backend_threshold.value)
+        try:
+            python_backend.value = False
+            expected = eval_bulk(e, envs)
+            python_backend.value = True
+            python_backend_threshold.value = 1
+            actual = eval_bulk(e, envs)
+        finally:
+            python_backend.value, python_backend_threshold.value = old
+        self.assertEqual(expected, actual)
+
+    def test_filter_map_sum(self):
+        x = EVar("x").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        e = ESum([EMap(EFilter(xs, ELambda(x, EBinOp(x, ">", ONE))), ELambda(x, EBinOp(x, "+", ONE)))])
+        self.check_backends_agree(e, [{"xs": Bag(range(i))} for i in range(5)])
+
+    def test_argmin_picks_first(self):
+        x = EVar("x").with_type(TTuple((INT, INT)))
+        xs = EVar("xs").with_type(TBag(x.type))
+        e = EArgMin(xs, ELambda(x, ETupleGet(x, 0)))
+        self.check_backends_agree(e, [
+            {"xs": Bag(())},
+            {"xs": Bag(((1, 0), (0, 1), (0, 2)))},
+            {"xs": Bag(((2, 0), (2, 1)))}])
+
+    def test_handle_equality(self):
+        t = THandle("H", INT)
+        h1 = EVar("h1").with_type(t)
+        h2 = EVar("h2").with_type(t)
+        e = ETuple((EEq(h1, h2), EBinOp(h1, "===", h2), EBinOp(h1, BOp.In, ESingleton(h2))))
+        self.check_backends_agree(e, [
+            {"h1": Handle(0, 0), "h2": Handle(0, 1)},
+            {"h1": Handle(0, 0), "h2": Handle(0, 0)},
+            {"h1": Handle(0, 0), "h2": Handle(1, 0)}])
+
+    def test_map_and_let(self):
+        x = EVar("x").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        m = EMakeMap2(xs, ELambda(x, EBinOp(x, "+", x)))
+        e = ELet(m, ELambda(EVar("m").with_type(TMap(INT, INT)),
+            ETuple((EMapGet(EVar("m"), ONE), EHasKey(EVar("m"), ZERO), EMapKeys(EVar("m"))))))
+        self.check_backends_agree(e, [{"xs": Bag((0, 1, 1, 2))}, {"xs": Bag()}])
+
+    def test_deep_nesting(self):
+        e = ZERO
+        for i in range(120):
+            e = ECond(EBinOp(e, "<=", ONE), ONE, ZERO).with_type(INT)
+        self.check_backends_agree(e, [{}])
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+
+    def check_backends_agree(self, e, envs):
+        assert retypecheck(e)
+        old = (numpy_backend.value, numpy_backend_threshold.value)
+        try:
+            numpy_backend.value = False
+            expected = eval_bulk(e, envs)
+            numpy_backend.value = True
+            numpy_backend_threshold.value = 1
+            actual = eval_bulk(e, envs)
+        finally:
+            numpy_backend.value, numpy_backend_threshold.value = old
+        self.assertEqual(expected, actual)
+        for (x, y) in zip(expected, actual):
+            self.assertIs(type(x), type(y))
+
+    def test_arithmetic(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        b = EVar("b").with_type(BOOL)
+        e = ECond(EAll([b, EBinOp(x, "<", y)]), EBinOp(EBinOp(x, "*", ENum(3).with_type(INT)), "-", y), EUnaryOp("-", x))
+        self.check_backends_agree(e, [{"x": i, "y": 7 - i, "b": i % 2 == 0} for i in range(-5, 10)])
+
+    def test_comparisons(self):
+        x = EVar("x").with_type(INT)
+        b = EVar("b").with_type(BOOL)
+        e = EAny([EEq(x, ONE), ENot(b), EBinOp(EBinOp(x, ">=", ZERO), "=>", b)])
+        self.check_backends_agree(e, [{"x": i, "b": i > 2} for i in range(-3, 5)])
+
+    def test_overflow_falls_back(self):
+        x = EVar("x").with_type(INT)
+        e = EBinOp(x, "+", x)
+        self.check_backends_agree(e, [{"x": 2**62}, {"x": 2**70}, {"x": -2**62}])
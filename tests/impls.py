@@ -5,7 +5,16 @@ from cozy.parse import parse_spec
 from cozy.typecheck import typecheck
 from cozy.desugar import desugar
 from cozy.syntax_tools import pprint
-from cozy.synthesis.impls import construct_initial_implementation
+from cozy.target_syntax import EStateVar, EMakeMap2, EMapGet, ELen, EFilter, EMap, EBinOp, EUnaryOp, UOp, ENum, ONE
+from cozy.syntax import TMap, INT, EVar, EEq
+from cozy.syntax_tools import mk_lambda, unpack_representation, all_exps
+from cozy.synthesis.impls import construct_initial_implementation, reuse_implementation
+
+def build_impl(spec):
+    spec = parse_spec(spec)
+    errs = typecheck(spec)
+    assert not errs, errs
+    return construct_initial_implementation(desugar(spec))
 
 class TestImplObjects(unittest.TestCase):
 
@@ -32,3 +41,63 @@ class TestImplObjects(unittest.TestCase):
         print(pprint(i1.code))
         i2 = pickle.loads(pickle.dumps(i1))
         assert i1.code == i2.code
+
+    def test_reuse(self):
+        old = build_impl("""
+            Foo:
+                state xs : Bag<Int>
+                query count(x : Int)
+                    len [y | y <- xs, y == x]
+                op add(x : Int)
+                    xs.add(x);
+            """)
+        q = old.query_specs[0]
+        xs = old.abstract_state[0]
+        m = EMakeMap2(xs, mk_lambda(xs.type.elem_type, lambda k: ELen(EFilter(xs, mk_lambda(xs.type.elem_type, lambda y: EEq(y, k))).with_type(xs.type)))).with_type(TMap(INT, INT))
+        rep, ret = unpack_representation(EMapGet(EStateVar(m).with_type(m.type), EVar(q.args[0][0]).with_type(INT)).with_type(INT))
+        old.set_impl(q, rep, ret)
+        old.cleanup()
+
+        new = build_impl("""
+            Foo:
+                state xs : Bag<Int>
+                query count(z : Int)
+                    len [y | y <- xs, z == y]
+                query isEmpty()
+                    len xs == 0
+                op add(x : Int)
+                    xs.add(x);
+                op clear()
+                    xs.remove_all(xs);
+            """)
+        reused = reuse_implementation(new, old)
+        assert "count" in reused
+        assert "isEmpty" not in reused
+        assert any(isinstance(e, EMapGet) for e in all_exps(new.query_impls["count"].ret)), pprint(new.code)
+
+    def test_set_impl_stops_at_first_duplicate(self):
+        impl = build_impl("""
+            Foo:
+                state xs : Bag<Int>
+                query q(x : Int)
+                    len xs + x
+            """)
+        q = impl.query_specs[0]
+        xs = impl.abstract_state[0]
+        x = EVar(q.args[0][0]).with_type(INT)
+        def total(k):
+            return EUnaryOp(UOp.Sum, EMap(xs, mk_lambda(INT, lambda y: EBinOp(y, "*", ENum(k).with_type(INT)).with_type(INT))).with_type(xs.type)).with_type(INT)
+        def use(e):
+            return unpack_representation(EBinOp(EStateVar(e).with_type(INT), "+", x).with_type(INT))
+        ones = EUnaryOp(UOp.Sum, EMap(xs, mk_lambda(INT, lambda y: ONE)).with_type(xs.type)).with_type(INT)
+        for e in [ones] + [total(k) for k in range(1, 8)]:
+            impl.set_impl(q, *use(e))
+        n = len(impl.concretization_functions)
+        batches = []
+        valid_all = impl.state_solver.valid_all
+        impl.state_solver.valid_all = lambda es, **kwargs: batches.append(len(es)) or valid_all(es, **kwargs)
+        # equivalent to the first of eight candidates
+        impl.set_impl(q, *use(ELen(xs)))
+        self.assertEqual(len(impl.concretization_functions), n)
+        self.assertEqual(len(batches), 1)
+        self.assertLess(batches[0], 8)
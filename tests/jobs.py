@@ -0,0 +1,102 @@
+import unittest
+import datetime
+import time
+from multiprocessing import Value
+
+from cozy.jobs import Job, JobScheduler, stop_jobs
+
+class WaitForStopJob(Job):
+    def run(self):
+        while not self.stop_requested:
+            time.sleep(0.01)
+
+class CountingJob(Job):
+    def __init__(self):
+        super().__init__()
+        self.count = Value("i", 0)
+    def run(self):
+        while not self.stop_requested:
+            self.count.value += 1
+            time.sleep(0.001)
+
+class QuickJob(Job):
+    def run(self):
+        pass
+
+class TestJobScheduler(unittest.TestCase):
+
+    def test_unbounded(self):
+        s = JobScheduler(max_running=None)
+        js = [WaitForStopJob() for i in range(3)]
+        for j in js:
+            s.submit(j)
+        assert all(j.started for j in js)
+        s.stop(js)
+        assert all(j.done for j in js)
+
+    def test_bounded(self):
+        s = JobScheduler(max_running=2, timeslice=datetime.timedelta(hours=1))
+        js = [WaitForStopJob() for i in range(3)]
+        for j in js:
+            s.submit(j)
+        assert js[0].started
+        assert js[1].started
+        assert not js[2].started
+        s.stop(js[:1])
+        assert js[2].started
+        s.stop(js)
+        assert not s.jobs
+
+    def test_rotation(self):
+        timeslice = datetime.timedelta(hours=1)
+        s = JobScheduler(max_running=1, timeslice=timeslice)
+        js = [WaitForStopJob() for i in range(2)]
+        try:
+            for j in js:
+                s.submit(j)
+            assert js[0].started and not js[1].started
+            now = datetime.datetime.now() + 2 * timeslice
+            s.check(now=now)
+            assert js[0].paused
+            assert js[1].started and not js[1].paused
+            s.check(now=now + 2 * timeslice)
+            assert not js[0].paused
+            assert js[1].paused
+        finally:
+            s.stop(js)
+        assert all(j.done for j in js)
+
+    def test_paused_job_waits(self):
+        j = CountingJob()
+        j.start()
+        try:
+            while j.count.value == 0:
+                time.sleep(0.01)
+            j.pause()
+            time.sleep(0.1)
+            paused_count = j.count.value
+            time.sleep(0.1)
+            self.assertEqual(j.count.value, paused_count)
+            j.resume()
+            while j.count.value == paused_count:
+                time.sleep(0.01)
+        finally:
+            stop_jobs([j])
+        assert j.successful
+
+    def test_finished_jobs_free_slots(self):
+        s = JobScheduler(max_running=1, timeslice=datetime.timedelta(hours=1))
+        j1 = WaitForStopJob()
+        j2 = QuickJob()
+        s.submit(j1)
+        s.submit(j2)
+        assert not j2.started
+        j1.request_stop()
+        j1.join()
+        s.check()
+        assert j2.started
+        j2.join()
+        assert j1.successful and j2.successful
+
+    def test_stop_unstarted(self):
+        stop_jobs([WaitForStopJob()])
@@ -0,0 +1,75 @@
+import unittest
+import tempfile
+
+from cozy.target_syntax import *
+from cozy.syntax_tools import mk_lambda, alpha_equivalent, pprint
+from cozy.contexts import RootCtx
+from cozy.cost_model import CostModel, asymptotic_runtime
+from cozy.synthesis.result_cache import ResultCache, cache_key
+
+xs = EVar("xs").with_type(INT_BAG)
+
+def mk_query(name, arg, binder):
+    a = EVar(arg).with_type(INT)
+    ret = EFilter(EStateVar(xs).with_type(INT_BAG), ELambda(EVar(binder).with_type(INT), EEq(EVar(binder).with_type(INT), a))).with_type(INT_BAG)
+    return Query(name, Visibility.Public, [(arg, INT)], [], ret, "")
+
+def mk_context(q):
+    return RootCtx(state_vars=[xs], args=[EVar(a).with_type(t) for (a, t) in q.args])
+
+class TestResultCache(unittest.TestCase):
+
+    def test_key_ignores_names(self):
+        q1 = mk_query("q1", "a", "x")
+        q2 = mk_query("q2", "b", "y")
+        self.assertEqual(
+            cache_key(q1, [xs], [], [], {}),
+            cache_key(q2, [xs], [], [], {}))
+
+    def test_key_sees_structure(self):
+        q1 = mk_query("q1", "a", "x")
+        q2 = mk_query("q2", "a", "x")
+        q2.ret = EFilter(q2.ret.e, mk_lambda(INT, lambda x: ENot(EEq(x, EVar("a").with_type(INT))))).with_type(INT_BAG)
+        self.assertNotEqual(
+            cache_key(q1, [xs], [], [], {}),
+            cache_key(q2, [xs], [], [], {}))
+
+    def test_key_sees_frequencies(self):
+        q = mk_query("q", "a", "x")
+        op = Op("add", [("x", INT)], [], SCall(xs, "add", [EVar("x").with_type(INT)]), "")
+        key = cache_key(q, [xs], [], [op], {})
+        self.assertEqual(key, cache_key(q, [xs], [], [op], {}, frequencies={"q" : 1, "other" : 10}))
+        self.assertNotEqual(key, cache_key(q, [xs], [], [op], {}, frequencies={"q" : 10}))
+        self.assertNotEqual(key, cache_key(q, [xs], [], [op], {}, frequencies={"add" : 10}))
+
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as d:
+            q1 = mk_query("q1", "a", "x")
+            q2 = mk_query("q2", "b", "y")
+            key = cache_key(q1, [xs], [], [], {})
+            cache = ResultCache(d)
+            assert cache.lookup(key, q1, mk_context(q1)) is None
+            cache.store(key, q1, q1.ret, CostModel(), mk_context(q1))
+            e = ResultCache(d).lookup(key, q2, mk_context(q2))
+            assert alpha_equivalent(e, q2.ret), pprint(e)
+
+    def test_lookup_ignores_wrong_entries(self):
+        with tempfile.TemporaryDirectory() as d:
+            q = mk_query("q", "a", "x")
+            key = cache_key(q, [xs], [], [], {})
+            cache = ResultCache(d)
+            cache.store(key, q, EStateVar(xs).with_type(INT_BAG), CostModel(), mk_context(q))
+            assert cache.lookup(key, q, mk_context(q)) is None
+
+    def test_store_keeps_smaller_entries(self):
+        with tempfile.TemporaryDirectory() as d:
+            q = mk_query("q", "a", "x")
+            key = cache_key(q, [xs], [], [], {})
+            cache = ResultCache(d)
+            cache.store(key, q, q.ret, CostModel(), mk_context(q))
+            bigger = EFilter(EStateVar(EFilter(xs, mk_lambda(INT, lambda x: ETRUE)).with_type(INT_BAG)).with_type(INT_BAG), q.ret.predicate).with_type(INT_BAG)
+            assert asymptotic_runtime(bigger) == asymptotic_runtime(q.ret)
+            assert bigger.size() > q.ret.size()
+            cache.store(key, q, bigger, CostModel(), mk_context(q))
+            e = cache.lookup(key, q, mk_context(q))
+            assert alpha_equivalent(e, q.ret), pprint(e)
@@ -1,11 +1,11 @@
 import unittest
 
 from cozy.common import OrderedSet
-from cozy.solver import satisfy, valid, satisfiable, IncrementalSolver, ModelCachingSolver
+from cozy.solver import satisfy, valid, satisfiable, IncrementalSolver, ModelCachingSolver, random_testing_budget, example_cache_size
 from cozy.typecheck import typecheck, retypecheck
 from cozy.target_syntax import *
 from cozy.structures.heaps import *
-from cozy.syntax_tools import pprint, equal, implies, mk_lambda, free_vars
+from cozy.syntax_tools import pprint, equal, implies, mk_lambda, free_vars, hash_cons
 
 zero = ENum(0).with_type(TInt())
 one  = ENum(1).with_type(TInt())
@@ -526,3 +526,286 @@ class TestSolver(unittest.TestCase):
 
     def test_regression33(self):
         satisfy(EUnaryOp('not', EBinOp(EBinOp(EUnaryOp('any', EMap(ESingleton(EStateVar(EMapKeys(EMakeMap2(EMap(EVar('lineitem').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), ELambda(EVar('l').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), EGetField(EVar('l').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), 'orderkey').with_type(TInt()))).with_type(TBag(TInt())), ELambda(EVar('_var12660').with_type(TInt()), EEmptyList().with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))))).with_type(TMap(TInt(), TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))))).with_type(TBag(TInt()))).with_type(TBag(TInt()))).with_type(TBag(TBag(TInt()))), ELambda(EVar('_var6061079').with_type(TBag(TInt())), EBinOp(EVar('_var6061079').with_type(TBag(TInt())), '===', EVar('_var5992419').with_type(TBag(TInt()))).with_type(TBool()))).with_type(TBag(TBool()))).with_type(TBool()), 'and', EUnaryOp('any', EMap(EMap(EVar('lineitem').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), ELambda(EVar('l2').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), EGetField(EVar('l2').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), 'partkey').with_type(TInt()))).with_type(TBag(TInt())), ELambda(EVar('_var6061081').with_type(TInt()), EBinOp(EVar('_var6061081').with_type(TInt()), '===', EVar('_var1196738').with_type(TInt())).with_type(TBool()))).with_type(TBag(TBool()))).with_type(TBool())).with_type(TBool()), '=>', EBinOp(EUnaryOp('len', EFilter(EVar('lineitem').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), ELambda(EVar('l2').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), EUnaryOp('not', EBinOp(EGetField(EVar('l2').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), 'partkey').with_type(TInt()), '==', EVar('_var1196738').with_type(TInt())).with_type(TBool())).with_type(TBool()))).with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))))).with_type(TInt()), '<=', ENum(1).with_type(TInt())).with_type(TBool())).with_type(TBool())).with_type(TBool()), vars=OrderedSet([EVar('lineitem').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), EVar('orders').with_type(TBag(TRecord((('orderkey', TInt()), ('custkey', TInt()), ('orderstatus', TNative('char')), ('totalprice', TFloat()), ('orderdate', TNative('uint64_t')), ('orderpriority', TString()), ('clerk', TString()), ('shippriority', TInt()), ('comment', TString()))))), EVar('part').with_type(TBag(TRecord((('partkey', TInt()), ('name', TString()), ('mfgr', TString()), ('brand', TString()), ('part_type', TString()), ('size', TInt()), ('container', TString()), ('retailprice', TFloat()), ('comment', TString()))))), EVar('customer').with_type(TBag(TRecord((('custkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('mktsegment', TString()), ('comment', TString()))))), EVar('supplier').with_type(TBag(TRecord((('suppkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('comment', TString()))))), EVar('partsupp').with_type(TBag(TRecord((('partkey', TInt()), ('suppkey', TInt()), ('availqty', TInt()), ('supplycost', TFloat()), ('comment', TString()))))), EVar('nation').with_type(TBag(TRecord((('nationkey', TInt()), ('name', TString()), ('regionkey', TInt()), ('comment', TString()))))), EVar('region').with_type(TBag(TRecord((('regionkey', TInt()), ('name', TString()), ('comment', TString()))))), EVar('orderkey').with_type(TInt()), EVar('partkey').with_type(TInt()), EVar('suppkey').with_type(TInt()), EVar('linenumber').with_type(TInt()), EVar('quantity').with_type(TFloat()), EVar('extendedprice').with_type(TFloat()), EVar('discount').with_type(TFloat()), EVar('tax').with_type(TFloat()), EVar('returnflag').with_type(TNative('char')), EVar('linestatus').with_type(TNative('char')), EVar('shipdate').with_type(TNative('uint64_t')), EVar('commitdate').with_type(TNative('uint64_t')), EVar('receiptdate').with_type(TNative('uint64_t')), EVar('shipinstruct').with_type(TString()), EVar('shipmode').with_type(TString()), EVar('comment').with_type(TString()), EVar('_var1222522').with_type(TInt()), EVar('_var1222523').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), EVar('_var1640906').with_type(TInt()), EVar('_var1642728').with_type(TInt()), EVar('_var1644438').with_type(TInt()), EVar('_var1646980').with_type(TInt()), EVar('_var1647003').with_type(TInt()), EVar('_var1196738').with_type(TInt()), EVar('ps').with_type(TRecord((('partkey', TInt()), ('suppkey', TInt()), ('availqty', TInt()), ('supplycost', TFloat()), ('comment', TString())))), EVar('c').with_type(TRecord((('custkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('mktsegment', TString()), ('comment', TString())))), EVar('o').with_type(TRecord((('orderkey', TInt()), ('custkey', TInt()), ('orderstatus', TNative('char')), ('totalprice', TFloat()), ('orderdate', TNative('uint64_t')), ('orderpriority', TString()), ('clerk', TString()), ('shippriority', TInt()), ('comment', TString())))), EVar('l').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), EVar('_var1677679').with_type(TInt()), EVar('_var1679277').with_type(TInt()), EVar('_var1680578').with_type(TInt()), EVar('_var1684893').with_type(TInt()), EVar('_var1684923').with_type(TInt()), EVar('_var2582811').with_type(TBool()), EVar('_var2592395').with_type(TInt()), EVar('_var2594688').with_type(TInt()), EVar('_var2597183').with_type(TInt()), EVar('_var2600698').with_type(TInt()), EVar('_var2600701').with_type(TInt()), EVar('_var2625812').with_type(TBool()), EVar('_var2634813').with_type(TInt()), EVar('_var2636412').with_type(TInt()), EVar('_var2638026').with_type(TInt()), EVar('_var2641408').with_type(TInt()), EVar('_var2641425').with_type(TInt()), EVar('_var2662098').with_type(TInt()), EVar('_var2673083').with_type(TInt()), EVar('_var2674910').with_type(TInt()), EVar('_var2677122').with_type(TInt()), EVar('_var2681705').with_type(TInt()), EVar('_var2681710').with_type(TInt()), EVar('_var2708175').with_type(TInt()), EVar('_var2719122').with_type(TInt()), EVar('_var2721499').with_type(TInt()), EVar('_var2723923').with_type(TInt()), EVar('_var2728126').with_type(TInt()), EVar('_var2728134').with_type(TInt()), EVar('_var2754944').with_type(TString()), EVar('_var2767277').with_type(TInt()), EVar('_var2769916').with_type(TInt()), EVar('_var2771962').with_type(TInt()), EVar('_var2776624').with_type(TInt()), EVar('_var2776625').with_type(TInt()), EVar('_var2800780').with_type(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))), EVar('_var2817053').with_type(TInt()), EVar('_var2820093').with_type(TInt()), EVar('_var2823454').with_type(TInt()), EVar('_var2827908').with_type(TInt()), EVar('_var2827914').with_type(TInt()), EVar('_var2853738').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), EVar('_var2866676').with_type(TInt()), EVar('_var2869468').with_type(TInt()), EVar('_var2872196').with_type(TInt()), EVar('_var2875125').with_type(TInt()), EVar('_var2875128').with_type(TInt()), EVar('_var2895907').with_type(TRecord((('orderkey', TInt()), ('custkey', TInt()), ('orderstatus', TNative('char')), ('totalprice', TFloat()), ('orderdate', TNative('uint64_t')), ('orderpriority', TString()), ('clerk', TString()), ('shippriority', TInt()), ('comment', TString())))), EVar('_var2908111').with_type(TInt()), EVar('_var2910612').with_type(TInt()), EVar('_var2913073').with_type(TInt()), EVar('_var2916397').with_type(TInt()), EVar('_var2916416').with_type(TInt()), EVar('_var2936837').with_type(TBag(TRecord((('orderkey', TInt()), ('custkey', TInt()), ('orderstatus', TNative('char')), ('totalprice', TFloat()), ('orderdate', TNative('uint64_t')), ('orderpriority', TString()), ('clerk', TString()), ('shippriority', TInt()), ('comment', TString()))))), EVar('_var2948748').with_type(TInt()), EVar('_var2950011').with_type(TInt()), EVar('_var2952200').with_type(TInt()), EVar('_var2955463').with_type(TInt()), EVar('_var2955479').with_type(TInt()), EVar('_var2978879').with_type(TRecord((('partkey', TInt()), ('name', TString()), ('mfgr', TString()), ('brand', TString()), ('part_type', TString()), ('size', TInt()), ('container', TString()), ('retailprice', TFloat()), ('comment', TString())))), EVar('_var2991958').with_type(TInt()), EVar('_var2994242').with_type(TInt()), EVar('_var2996462').with_type(TInt()), EVar('_var2999833').with_type(TInt()), EVar('_var2999838').with_type(TInt()), EVar('_var3024618').with_type(TBag(TRecord((('partkey', TInt()), ('name', TString()), ('mfgr', TString()), ('brand', TString()), ('part_type', TString()), ('size', TInt()), ('container', TString()), ('retailprice', TFloat()), ('comment', TString()))))), EVar('_var3034414').with_type(TInt()), EVar('_var3036428').with_type(TInt()), EVar('_var3038122').with_type(TInt()), EVar('_var3041416').with_type(TInt()), EVar('_var3041421').with_type(TInt()), EVar('_var3065652').with_type(TRecord((('custkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('mktsegment', TString()), ('comment', TString())))), EVar('_var3076869').with_type(TInt()), EVar('_var3080473').with_type(TInt()), EVar('_var3083840').with_type(TInt()), EVar('_var3087993').with_type(TInt()), EVar('_var3088003').with_type(TInt()), EVar('_var3110882').with_type(TBag(TRecord((('custkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('mktsegment', TString()), ('comment', TString()))))), EVar('_var3120410').with_type(TInt()), EVar('_var3122688').with_type(TInt()), EVar('_var3125289').with_type(TInt()), EVar('_var3127904').with_type(TInt()), EVar('_var3127905').with_type(TInt()), EVar('_var3150430').with_type(TRecord((('suppkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('comment', TString())))), EVar('_var3160336').with_type(TInt()), EVar('_var3163278').with_type(TInt()), EVar('_var3165313').with_type(TInt()), EVar('_var3168237').with_type(TInt()), EVar('_var3168240').with_type(TInt()), EVar('_var3192097').with_type(TBag(TRecord((('suppkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('comment', TString()))))), EVar('_var3200582').with_type(TInt()), EVar('_var3203580').with_type(TInt()), EVar('_var3206309').with_type(TInt()), EVar('_var3210111').with_type(TInt()), EVar('_var3210117').with_type(TInt()), EVar('_var3231499').with_type(TRecord((('partkey', TInt()), ('suppkey', TInt()), ('availqty', TInt()), ('supplycost', TFloat()), ('comment', TString())))), EVar('_var3243466').with_type(TInt()), EVar('_var3246039').with_type(TInt()), EVar('_var3247950').with_type(TInt()), EVar('_var3252196').with_type(TInt()), EVar('_var3252202').with_type(TInt()), EVar('_var3274677').with_type(TBag(TRecord((('partkey', TInt()), ('suppkey', TInt()), ('availqty', TInt()), ('supplycost', TFloat()), ('comment', TString()))))), EVar('_var3284808').with_type(TInt()), EVar('_var3287418').with_type(TInt()), EVar('_var3289761').with_type(TInt()), EVar('_var3293466').with_type(TInt()), EVar('_var3293475').with_type(TInt()), EVar('_var3319878').with_type(TRecord((('nationkey', TInt()), ('name', TString()), ('regionkey', TInt()), ('comment', TString())))), EVar('_var3329519').with_type(TInt()), EVar('_var3331597').with_type(TInt()), EVar('_var3334168').with_type(TInt()), EVar('_var3338009').with_type(TInt()), EVar('_var3338039').with_type(TInt()), EVar('_var3362325').with_type(TBag(TRecord((('nationkey', TInt()), ('name', TString()), ('regionkey', TInt()), ('comment', TString()))))), EVar('_var3370925').with_type(TInt()), EVar('_var3373235').with_type(TInt()), EVar('_var3375565').with_type(TInt()), EVar('_var3379346').with_type(TInt()), EVar('_var3379353').with_type(TInt()), EVar('_var3401447').with_type(TRecord((('regionkey', TInt()), ('name', TString()), ('comment', TString())))), EVar('_var3410685').with_type(TInt()), EVar('_var3413538').with_type(TInt()), EVar('_var3416237').with_type(TInt()), EVar('_var3420115').with_type(TInt()), EVar('_var3420132').with_type(TInt()), EVar('_var3444725').with_type(TBag(TRecord((('regionkey', TInt()), ('name', TString()), ('comment', TString()))))), EVar('_var3454844').with_type(TInt()), EVar('_var3457187').with_type(TInt()), EVar('_var3460634').with_type(TInt()), EVar('_var3464599').with_type(TInt()), EVar('_var3464609').with_type(TInt()), EVar('_var3491345').with_type(TBag(TInt())), EVar('_var3502496').with_type(TInt()), EVar('_var3505657').with_type(TInt()), EVar('_var3508389').with_type(TInt()), EVar('_var3511282').with_type(TInt()), EVar('_var3511286').with_type(TInt()), EVar('_var3531578').with_type(TTuple((TInt(), TInt()))), EVar('_var3544424').with_type(TInt()), EVar('_var3546785').with_type(TInt()), EVar('_var3549343').with_type(TInt()), EVar('_var3552154').with_type(TInt()), EVar('_var3552167').with_type(TInt()), EVar('_var3578319').with_type(TBag(TTuple((TInt(), TInt())))), EVar('_var3587329').with_type(TInt()), EVar('_var3589184').with_type(TInt()), EVar('_var3590988').with_type(TInt()), EVar('_var3594401').with_type(TInt()), EVar('_var3594418').with_type(TInt()), EVar('_var3617344').with_type(TBag(TFloat())), EVar('_var3629368').with_type(TInt()), EVar('_var3631541').with_type(TInt()), EVar('_var3634085').with_type(TInt()), EVar('_var3638059').with_type(TInt()), EVar('_var3638061').with_type(TInt()), EVar('_var3659612').with_type(TBag(TBool())), EVar('_var3673544').with_type(TInt()), EVar('_var3676094').with_type(TInt()), EVar('_var3677841').with_type(TInt()), EVar('_var3680557').with_type(TInt()), EVar('_var3680572').with_type(TInt()), EVar('_var3702708').with_type(TInt()), EVar('_var3713986').with_type(TInt()), EVar('_var3717589').with_type(TInt()), EVar('_var3719966').with_type(TInt()), EVar('_var3723626').with_type(TInt()), EVar('_var3723629').with_type(TInt()), EVar('_var3754113').with_type(TInt()), EVar('_var3765400').with_type(TInt()), EVar('_var3768001').with_type(TInt()), EVar('_var3770273').with_type(TInt()), EVar('_var3774202').with_type(TInt()), EVar('_var3774216').with_type(TInt()), EVar('_var3803923').with_type(TInt()), EVar('_var3815202').with_type(TInt()), EVar('_var3817434').with_type(TInt()), EVar('_var3820249').with_type(TInt()), EVar('_var3824071').with_type(TInt()), EVar('_var3824097').with_type(TInt()), EVar('_var3856383').with_type(TInt()), EVar('_var3867384').with_type(TInt()), EVar('_var3869946').with_type(TInt()), EVar('_var3872656').with_type(TInt()), EVar('_var3876127').with_type(TInt()), EVar('_var3876132').with_type(TInt()), EVar('_var3898820').with_type(TFloat()), EVar('_var3910070').with_type(TInt()), EVar('_var3913642').with_type(TInt()), EVar('_var3917044').with_type(TInt()), EVar('_var3921844').with_type(TInt()), EVar('_var3921845').with_type(TInt()), EVar('_var3945984').with_type(TNative('char')), EVar('_var3958888').with_type(TInt()), EVar('_var3961260').with_type(TInt()), EVar('_var3963643').with_type(TInt()), EVar('_var3966755').with_type(TInt()), EVar('_var3966759').with_type(TInt()), EVar('_var3989505').with_type(TNative('uint64_t')), EVar('_var4002602').with_type(TInt()), EVar('_var4005271').with_type(TInt()), EVar('_var4007361').with_type(TInt()), EVar('_var4010670').with_type(TInt()), EVar('_var4010683').with_type(TInt()), EVar('_var4034567').with_type(TString()), EVar('_var4048686').with_type(TInt()), EVar('_var4051939').with_type(TInt()), EVar('_var4054610').with_type(TInt()), EVar('_var4059247').with_type(TInt()), EVar('_var4059250').with_type(TInt()), EVar('_var4086728').with_type(TString()), EVar('_var4099219').with_type(TInt()), EVar('_var4102151').with_type(TInt()), EVar('_var4105879').with_type(TInt()), EVar('_var4110414').with_type(TInt()), EVar('_var4110424').with_type(TInt()), EVar('_var4135791').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), EVar('_var4149282').with_type(TInt()), EVar('_var4153167').with_type(TInt()), EVar('_var4159035').with_type(TInt()), EVar('_var4164962').with_type(TInt()), EVar('_var4164964').with_type(TInt()), EVar('_var4202816').with_type(TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString()))))), EVar('_var4226438').with_type(TInt()), EVar('_var4233533').with_type(TInt()), EVar('_var4239315').with_type(TInt()), EVar('_var4247977').with_type(TInt()), EVar('_var4248002').with_type(TInt()), EVar('_var4299165').with_type(TBag(TRecord((('suppkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('comment', TString()))))), EVar('_var4317152').with_type(TInt()), EVar('_var4322912').with_type(TInt()), EVar('_var4329190').with_type(TInt()), EVar('_var4337916').with_type(TInt()), EVar('_var4337934').with_type(TInt()), EVar('_var4378416').with_type(TBag(TRecord((('partkey', TInt()), ('suppkey', TInt()), ('availqty', TInt()), ('supplycost', TFloat()), ('comment', TString()))))), EVar('_var4397801').with_type(TInt()), EVar('_var4404076').with_type(TInt()), EVar('_var4411119').with_type(TInt()), EVar('_var4418189').with_type(TInt()), EVar('_var4418190').with_type(TInt()), EVar('_var4457618').with_type(TBag(TRecord((('custkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('mktsegment', TString()), ('comment', TString()))))), EVar('_var4477493').with_type(TInt()), EVar('_var4483050').with_type(TInt()), EVar('_var4488149').with_type(TInt()), EVar('_var4498115').with_type(TInt()), EVar('_var4498141').with_type(TInt()), EVar('_var4538961').with_type(TBag(TRecord((('orderkey', TInt()), ('custkey', TInt()), ('orderstatus', TNative('char')), ('totalprice', TFloat()), ('orderdate', TNative('uint64_t')), ('orderpriority', TString()), ('clerk', TString()), ('shippriority', TInt()), ('comment', TString()))))), EVar('_var4561709').with_type(TInt()), EVar('_var4568046').with_type(TInt()), EVar('_var4573654').with_type(TInt()), EVar('_var4583224').with_type(TInt()), EVar('_var4583241').with_type(TInt()), EVar('_var4626547').with_type(TBag(TRecord((('nationkey', TInt()), ('name', TString()), ('regionkey', TInt()), ('comment', TString()))))), EVar('_var4648204').with_type(TInt()), EVar('_var4652978').with_type(TInt()), EVar('_var4658394').with_type(TInt()), EVar('_var4671623').with_type(TInt()), EVar('_var4671630').with_type(TInt()), EVar('_var4713058').with_type(TBag(TRecord((('regionkey', TInt()), ('name', TString()), ('comment', TString()))))), EVar('_var4731707').with_type(TInt()), EVar('_var4737300').with_type(TInt()), EVar('_var4742487').with_type(TInt()), EVar('_var4750356').with_type(TInt()), EVar('_var4750361').with_type(TInt()), EVar('_var4786149').with_type(TBag(TInt())), EVar('_var4807276').with_type(TInt()), EVar('_var4813951').with_type(TInt()), EVar('_var4819497').with_type(TInt()), EVar('_var4829042').with_type(TInt()), EVar('_var4829051').with_type(TInt()), EVar('_var4868834').with_type(TBag(TInt())), EVar('_var4890745').with_type(TInt()), EVar('_var4897855').with_type(TInt()), EVar('_var4904960').with_type(TInt()), EVar('_var4914851').with_type(TInt()), EVar('_var4914854').with_type(TInt()), EVar('_var4953371').with_type(TBag(TInt())), EVar('_var4976473').with_type(TInt()), EVar('_var4982038').with_type(TInt()), EVar('_var4987144').with_type(TInt()), EVar('_var4996762').with_type(TInt()), EVar('_var4996768').with_type(TInt()), EVar('_var5033285').with_type(TBag(TInt())), EVar('_var5054262').with_type(TInt()), EVar('_var5060027').with_type(TInt()), EVar('_var5066312').with_type(TInt()), EVar('_var5075647').with_type(TInt()), EVar('_var5075656').with_type(TInt()), EVar('_var5117541').with_type(TBag(TInt())), EVar('_var5141261').with_type(TInt()), EVar('_var5149051').with_type(TInt()), EVar('_var5154542').with_type(TInt()), EVar('_var5163923').with_type(TInt()), EVar('_var5163937').with_type(TInt()), EVar('_var5200659').with_type(TBag(TInt())), EVar('_var5220948').with_type(TInt()), EVar('_var5227258').with_type(TInt()), EVar('_var5232693').with_type(TInt()), EVar('_var5241898').with_type(TInt()), EVar('_var5241913').with_type(TInt()), EVar('_var5276208').with_type(TBag(TInt())), EVar('_var5297557').with_type(TInt()), EVar('_var5304289').with_type(TInt()), EVar('_var5311939').with_type(TInt()), EVar('_var5321786').with_type(TInt()), EVar('_var5321792').with_type(TInt()), EVar('_var5363591').with_type(TBag(TRecord((('orderkey', TInt()), ('custkey', TInt()), ('orderstatus', TNative('char')), ('totalprice', TFloat()), ('orderdate', TNative('uint64_t')), ('orderpriority', TString()), ('clerk', TString()), ('shippriority', TInt()), ('comment', TString()))))), EVar('_var5422184').with_type(TInt()), EVar('_var5430103').with_type(TInt()), EVar('_var5444943').with_type(TInt()), EVar('_var5444946').with_type(TInt()), EVar('_var5506824').with_type(TBag(TRecord((('partkey', TInt()), ('name', TString()), ('mfgr', TString()), ('brand', TString()), ('part_type', TString()), ('size', TInt()), ('container', TString()), ('retailprice', TFloat()), ('comment', TString()))))), EVar('_var5556010').with_type(TInt()), EVar('_var5562711').with_type(TInt()), EVar('_var5575493').with_type(TInt()), EVar('_var5575499').with_type(TInt()), EVar('_var5624901').with_type(TBag(TRecord((('suppkey', TInt()), ('name', TString()), ('address', TString()), ('nationkey', TInt()), ('phone', TString()), ('acctbal', TFloat()), ('comment', TString()))))), EVar('_var5686102').with_type(TInt()), EVar('_var5693632').with_type(TInt()), EVar('_var5709676').with_type(TInt()), EVar('_var5709682').with_type(TInt()), EVar('_var5772676').with_type(TBool()), EVar('_var5783031').with_type(TInt()), EVar('_var5785777').with_type(TInt()), EVar('_var5789358').with_type(TInt()), EVar('_var5793487').with_type(TInt()), EVar('_var5793502').with_type(TInt()), EVar('_var5822479').with_type(TMap(TInt(), TBag(TRecord((('orderkey', TInt()), ('partkey', TInt()), ('suppkey', TInt()), ('linenumber', TInt()), ('quantity', TFloat()), ('extendedprice', TFloat()), ('discount', TFloat()), ('tax', TFloat()), ('returnflag', TNative('char')), ('linestatus', TNative('char')), ('shipdate', TNative('uint64_t')), ('commitdate', TNative('uint64_t')), ('receiptdate', TNative('uint64_t')), ('shipinstruct', TString()), ('shipmode', TString()), ('comment', TString())))))), EVar('_var5857917').with_type(TInt()), EVar('_var5872929').with_type(TInt()), EVar('_var5887165').with_type(TInt()), EVar('_var5906662').with_type(TInt()), EVar('_var5906671').with_type(TInt()), EVar('_var5992419').with_type(TBag(TInt())), EVar('_var6017356').with_type(TInt()), EVar('_var6024888').with_type(TInt()), EVar('_var6032466').with_type(TInt()), EVar('_var6045633').with_type(TInt()), EVar('_var6045639').with_type(TInt())]), collection_depth=4, validate_model=True)
+
+    def test_translation_cache_reuse(self):
+        solver = IncrementalSolver()
+        xs = EVar("xs").with_type(INT_BAG)
+        x = EVar("x").with_type(INT)
+        shared = EUnaryOp(UOp.Sum, EFilter(xs, ELambda(x, EGt(x, zero))).with_type(INT_BAG)).with_type(INT)
+        old = random_testing_budget.value
+        try:
+            random_testing_budget.value = 0
+            assert solver.satisfiable(EGt(shared, one))
+            assert solver.visitor.memo_misses > 0
+            assert solver.valid(EGe(shared, zero))
+            assert solver.visitor.memo_hits > 0
+        finally:
+            random_testing_budget.value = old
+
+    def test_translation_cache_survives_one_shot_queries(self):
+        from cozy import solver
+        xs = EVar("xs").with_type(INT_BAG)
+        x = EVar("x").with_type(INT)
+        shared = EUnaryOp(UOp.Sum, EFilter(xs, ELambda(x, EGt(x, zero))).with_type(INT_BAG)).with_type(INT)
+        old = random_testing_budget.value
+        try:
+            random_testing_budget.value = 0
+            solver._solver_pool.clear()
+            assert satisfy(EGt(shared, one)) is not None
+            (s,) = [s for l in solver._solver_pool.values() for s in l]
+            assert s.visitor.memo_misses > 0
+            assert satisfy(ELt(shared, zero)) is None
+            assert [s] == [s for l in solver._solver_pool.values() for s in l]
+            # only the new comparison needed translating
+            assert id(hash_cons(shared)) in s._translations
+            self.assertEqual(s.visitor.memo_misses, 1)
+        finally:
+            random_testing_budget.value = old
+
+    def test_translation_cache_push_pop(self):
+        t = TEnum(("A", "B"))
+        solver = IncrementalSolver()
+        v = EVar("v").with_type(t)
+        is_a = EEq(v, EEnumEntry("A").with_type(t))
+        is_b = EEq(v, EEnumEntry("B").with_type(t))
+        solver.push()
+        assert solver.satisfiable(is_a)
+        solver.pop()
+        assert solver.valid(EAny([is_a, is_b]))
+
+    def test_one_shot_solvers_are_reused(self):
+        from cozy import solver
+        x = EVar("x").with_type(INT)
+        assert valid(EImplies(EGt(x, one), EGt(x, zero)))
+        idle = sum(len(l) for l in solver._solver_pool.values())
+        assert idle > 0
+        assert valid(EImplies(EGt(x, zero), EGe(x, zero)))
+        assert sum(len(l) for l in solver._solver_pool.values()) == idle
+
+    def test_one_shot_solvers_are_dropped_after_errors(self):
+        from cozy import solver
+        def pooled():
+            return [s for l in solver._solver_pool.values() for s in l]
+        with solver._one_shot_solver() as s:
+            pass
+        assert s in pooled()
+        with self.assertRaises(solver.SolverReportedUnknown):
+            with solver._one_shot_solver() as s:
+                raise solver.SolverReportedUnknown("z3 reported unknown")
+        assert s not in pooled()
+        # the next query gets a clean solver
+        x = EVar("x").with_type(INT)
+        assert valid(EImplies(EGt(x, one), EGt(x, zero)))
+
+    def test_one_shot_solvers_forget_queries(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        model = satisfy(EGt(x, one))
+        assert model is not None and model["x"] > 1
+        model = satisfy(EEq(y, zero))
+        assert model is not None and "x" not in model
+        assert satisfiable(ELt(x, zero))
+
+    def test_random_testing_respects_assumptions(self):
+        x = EVar("x").with_type(INT)
+        solver = IncrementalSolver()
+        solver.add_assumption(EGt(x, zero))
+        model = solver.satisfy(ELt(x, ENum(3).with_type(INT)))
+        assert model["x"] in (1, 2)
+        assert solver.random_refutations == 1
+
+    def test_random_testing_falls_back_to_solver(self):
+        x = EVar("x").with_type(INT)
+        solver = IncrementalSolver()
+        model = solver.satisfy(EEq(x, ENum(1000).with_type(INT)))
+        assert model["x"] == 1000
+        assert solver.random_tests == 1
+        assert solver.random_refutations == 0
+        assert solver.valid(EImplies(EGt(x, one), EGt(x, zero)))
+        assert solver.random_tests == 2
+        assert solver.random_refutations == 0
+
+    def test_portfolio(self):
+        from cozy.solver import solver_portfolio
+        xs = EVar("xs").with_type(INT_BAG)
+        x = EVar("x").with_type(INT)
+        old = (solver_portfolio.value, random_testing_budget.value)
+        try:
+            solver_portfolio.value = True
+            random_testing_budget.value = 0
+            # shallow depths answer "unsat" here, which must not be trusted
+            model = satisfy(EAll([EEq(ELen(xs), ENum(3).with_type(INT)), EEq(x, ENum(100).with_type(INT))]), collection_depth=3)
+            assert len(model["xs"]) == 3
+            assert model["x"] == 100
+            assert valid(EImplies(EGt(ELen(xs), one), EGt(ELen(xs), zero)))
+        finally:
+            solver_portfolio.value, random_testing_budget.value = old
+
+    def test_portfolio_workers_persist_and_unknown_is_final(self):
+        from cozy import solver
+        from cozy.solver import solver_portfolio, UNKNOWN
+        x, y, z = [EVar(n).with_type(INT) for n in "xyz"]
+        def cube(v):
+            return EBinOp(EBinOp(v, "*", v).with_type(INT), "*", v).with_type(INT)
+        # too hard to answer within the timeout
+        f = EAll([EGt(x, zero), EGt(y, zero), EGt(z, zero), EEq(EBinOp(cube(x), "+", cube(y)).with_type(INT), cube(z))])
+        old = (solver_portfolio.value, random_testing_budget.value)
+        try:
+            solver_portfolio.value = True
+            random_testing_budget.value = 0
+            s = IncrementalSolver(timeout=0.05)
+            def check_all(*args, **kwargs):
+                raise AssertionError("the portfolio already tried this configuration")
+            s._check_all = check_all
+            self.assertEqual(s.satisfy_all([f], raise_on_unknown=False), [UNKNOWN])
+            pids = [w.process.pid for w in solver._portfolio_pool]
+            self.assertEqual(s.satisfy_all([f], raise_on_unknown=False), [UNKNOWN])
+            self.assertEqual([w.process.pid for w in solver._portfolio_pool], pids)
+        finally:
+            solver_portfolio.value, random_testing_budget.value = old
+
+    def test_independent_solvers_do_not_block_each_other(self):
+        import threading
+        x = EVar("x").with_type(INT)
+        s1 = IncrementalSolver()
+        s2 = IncrementalSolver()
+        results = []
+        with s1._lock:
+            t = threading.Thread(target=lambda: results.append(s2.valid(EImplies(EGt(x, one), EGt(x, zero)))))
+            t.start()
+            t.join(timeout=60)
+        assert results == [True]
+
+    def test_concurrent_solvers(self):
+        import threading
+        xs = EVar("xs").with_type(INT_BAG)
+        results = {}
+        def work(i):
+            s = IncrementalSolver()
+            results[i] = s.satisfy(EEq(ELen(xs), ENum(i).with_type(INT)))
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i in range(4):
+            assert len(results[i]["xs"]) == i
+
+    def test_satisfy_all(self):
+        xs = EVar("xs").with_type(INT_BAG)
+        x = EVar("x").with_type(INT)
+        old = random_testing_budget.value
+        try:
+            random_testing_budget.value = 0
+            s = IncrementalSolver()
+            es = [
+                EEq(ELen(xs), ENum(2).with_type(INT)),
+                EAll([EGt(x, one), ELt(x, zero)]),
+                EAll([EIn(x, xs), EGt(x, ENum(5).with_type(INT))])]
+            m1, m2, m3 = s.satisfy_all(es)
+            assert len(m1["xs"]) == 2
+            assert m2 is None
+            assert m3["x"] in m3["xs"] and m3["x"] > 5
+            # the batch must not leave anything behind
+            assert s.satisfy(ELt(x, zero)) is not None
+        finally:
+            random_testing_budget.value = old
+
+    def test_satisfy_all_keeps_answers_after_unknown(self):
+        import z3
+        from cozy.solver import UNKNOWN, SolverReportedUnknown
+        x = EVar("x").with_type(INT)
+        class FlakyZ3(object):
+            """Reports "unknown" for the second check."""
+            def __init__(self, solver):
+                self.solver = solver
+                self.checks = 0
+            def check(self, *args):
+                self.checks += 1
+                return z3.unknown if self.checks == 2 else self.solver.check(*args)
+            def __getattr__(self, name):
+                return getattr(self.solver, name)
+        es = [EGt(x, one), EAll([EGt(x, one), ELt(x, zero)]), ELt(x, zero)]
+        old = random_testing_budget.value
+        try:
+            random_testing_budget.value = 0
+            s = IncrementalSolver(vars=[x])
+            s.z3_solver = FlakyZ3(s.z3_solver)
+            scopes = s.z3_solver.num_scopes()
+            m1, m2, m3 = s.satisfy_all(es, raise_on_unknown=False)
+            assert m1["x"] > 1
+            assert m2 is UNKNOWN
+            assert m3["x"] < 0
+            self.assertEqual(s.z3_solver.num_scopes(), scopes)
+            s.z3_solver.checks = 0
+            with self.assertRaises(SolverReportedUnknown):
+                s.satisfy_all(es)
+            s.z3_solver.checks = 0
+            self.assertEqual(s.valid_all([ETRUE, EGt(x, one), ETRUE], raise_on_unknown=False), [True, UNKNOWN, True])
+        finally:
+            random_testing_budget.value = old
+
+    def test_valid_all(self):
+        xs = EVar("xs").with_type(INT_BAG)
+        es = [
+            EImplies(EGt(ELen(xs), one), EGt(ELen(xs), zero)),
+            EGt(ELen(xs), zero),
+            EGe(ELen(xs), zero)]
+        s = ModelCachingSolver(vars=[xs], funcs={})
+        assert s.valid_all(es) == [True, False, True]
+        assert IncrementalSolver().valid_all(es) == [valid(e) for e in es]
+
+    def test_example_store_deduplicates(self):
+        x = EVar("x").with_type(INT)
+        s = ModelCachingSolver(vars=[x], funcs={}, examples=[{"x": 1}, {"x": 2}, {"x": 1}])
+        self.assertEqual(s.examples, [{"x": 1}, {"x": 2}])
+
+    def test_example_store_is_bounded(self):
+        x = EVar("x").with_type(INT)
+        old = example_cache_size.value
+        try:
+            example_cache_size.value = 3
+            s = ModelCachingSolver(vars=[x], funcs={}, examples=[{"x": i} for i in range(3)])
+            # make {x=2} useful; it moves to the front
+            self.assertEqual(s.satisfy(EEq(x, ENum(2).with_type(INT))), {"x": 2})
+            self.assertEqual(s.examples[0], {"x": 2})
+            # new models evict the oldest useless ones
+            assert s.satisfy(EEq(x, ENum(10).with_type(INT))) is not None
+            assert s.satisfy(EEq(x, ENum(11).with_type(INT))) is not None
+            self.assertEqual(s.examples, [{"x": 2}, {"x": 10}, {"x": 11}])
+            self.assertEqual(s.evictions, 2)
+        finally:
+            example_cache_size.value = old
+
+    def test_random_testing_in_threads(self):
+        import sys
+        import threading
+        from cozy.evaluation import eval_bulk, program_cache_size
+        from cozy.value_types import Bag
+        xs = EVar("xs").with_type(INT_BAG)
+        exps = [EEq(ELen(xs), ENum(i).with_type(INT)) for i in range(40)]
+        errors = []
+        def work():
+            try:
+                s = IncrementalSolver(vars=[xs])
+                for e in exps:
+                    s._random_model(e)
+                    eval_bulk(e, [{"xs": Bag([1, 2])}])
+            except Exception as e:
+                errors.append(e)
+        old = (program_cache_size.value, random_testing_budget.value, sys.getswitchinterval())
+        try:
+            # a tiny cache means lots of evictions, and a tiny switch
+            # interval means lots of interleaving
+            program_cache_size.value = 2
+            random_testing_budget.value = 5
+            sys.setswitchinterval(1e-6)
+            threads = [threading.Thread(target=work) for i in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            program_cache_size.value, random_testing_budget.value, interval = old
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
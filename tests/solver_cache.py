@@ -0,0 +1,58 @@
+import unittest
+import tempfile
+
+from cozy.target_syntax import *
+from cozy.solver import ModelCachingSolver
+from cozy.solver_cache import SolverCache, context_key, query_key, solver_cache_dir
+
+xs = EVar("xs").with_type(INT_BAG)
+r = EVar("r").with_type(TRecord((("a", INT), ("b", BOOL))))
+
+def mk_formula(binder):
+    x = EVar(binder).with_type(INT)
+    return EEq(ELen(EFilter(xs, ELambda(x, EGt(x, ZERO))).with_type(INT_BAG)), ONE)
+
+class TestSolverCache(unittest.TestCase):
+
+    def setUp(self):
+        self.old_dir = solver_cache_dir.value
+
+    def tearDown(self):
+        solver_cache_dir.value = self.old_dir
+
+    def test_key_ignores_binder_names(self):
+        ctx = context_key([xs], {}, ETRUE, 4)
+        self.assertEqual(
+            query_key(ctx, mk_formula("x")),
+            query_key(ctx, mk_formula("y")))
+
+    def test_key_sees_context(self):
+        e = mk_formula("x")
+        self.assertNotEqual(
+            query_key(context_key([xs], {}, ETRUE, 4), e),
+            query_key(context_key([xs], {}, ETRUE, 3), e))
+        self.assertNotEqual(
+            query_key(context_key([xs], {}, ETRUE, 4), e),
+            query_key(context_key([xs], {}, EGt(ELen(xs), ONE), 4), e))
+
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = SolverCache(d)
+            assert cache.lookup("k") is None
+            cache.store("k", None)
+            assert SolverCache(d).lookup("k") == { "model" : None }
+
+    def test_model_caching_solver_uses_cache(self):
+        sat = EAll([mk_formula("x"), EEq(EGetField(r, "a").with_type(INT), ONE)])
+        unsat = EAll([sat, ENot(EEq(ELen(xs), ELen(xs)))])
+        with tempfile.TemporaryDirectory() as d:
+            solver_cache_dir.value = d
+            s1 = ModelCachingSolver(vars=[xs, r], funcs={})
+            assert s1.satisfy(sat) is not None
+            assert s1.satisfy(unsat) is None
+            assert s1.disk_hits == 0
+
+            s2 = ModelCachingSolver(vars=[xs, r], funcs={})
+            assert s2.satisfy(sat) is not None
+            assert s2.satisfy(unsat) is None
+            assert s2.disk_hits == 2
@@ -0,0 +1,80 @@
+import unittest
+import tempfile
+import os
+
+from cozy.target_syntax import *
+from cozy.logging import task, current_tasks
+from cozy.solver import IncrementalSolver, satisfiable, random_testing_budget
+from cozy.solver_trace import solver_trace_dir, load_records
+from cozy.bench import solver_replay
+from cozy.bench.solver_replay import replay_smtlib, replay_query
+
+xs = EVar("xs").with_type(INT_BAG)
+x = EVar("x").with_type(INT)
+
+class TestSolverTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.old = (solver_trace_dir.value, random_testing_budget.value)
+        random_testing_budget.value = 0
+
+    def tearDown(self):
+        solver_trace_dir.value, random_testing_budget.value = self.old
+
+    def test_trace_and_replay(self):
+        sat = EAll([EIn(x, xs), EEq(ELen(xs), ENum(2).with_type(INT))])
+        unsat = EAll([EGt(x, ONE), ELt(x, ZERO)])
+        with tempfile.TemporaryDirectory() as d:
+            solver_trace_dir.value = d
+            s = IncrementalSolver()
+            s.add_assumption(EGt(x, ZERO))
+            with task("testing"):
+                assert s.satisfy(sat) is not None
+                assert s.satisfy_all([unsat, sat])[0] is None
+            solver_trace_dir.value = ""
+            assert s.satisfy(sat) is not None
+
+            records = load_records(d)
+            self.assertEqual([r["result"] for r in records], ["sat", "unsat", "sat"])
+            for r in records:
+                assert r["tasks"][-1] == "testing"
+                assert r["size"] > 0 and r["cse_size"] > 0
+                assert os.path.exists(os.path.join(d, r["smtlib"]))
+                self.assertEqual(replay_smtlib(d, r)[0], r["result"])
+                self.assertEqual(replay_query(d, r)[0], r["result"])
+
+    def test_replay_includes_variable_constraints(self):
+        # The enum has two cases; the encoding of `e` is unsatisfiable only
+        # because of the range constraint created along with `e`.
+        t = TEnum(("A", "B"))
+        e = EVar("e").with_type(t)
+        formula = EAll([ENot(EEq(e, EEnumEntry("A").with_type(t))), ENot(EEq(e, EEnumEntry("B").with_type(t)))])
+        with tempfile.TemporaryDirectory() as d:
+            solver_trace_dir.value = d
+            assert not satisfiable(formula)
+            solver_trace_dir.value = ""
+            records = load_records(d)
+            self.assertEqual([r["result"] for r in records], ["unsat"])
+            self.assertEqual(replay_smtlib(d, records[0])[0], "unsat")
+            self.assertEqual(solver_replay.main(["--smtlib", d]), 0)
+
+    def test_task_stacks_are_per_thread(self):
+        import threading
+        barrier = threading.Barrier(2)
+        seen = { }
+        def work(name):
+            with task(name):
+                barrier.wait()
+                with task("inner"):
+                    barrier.wait()
+                    seen[name] = current_tasks()
+                    barrier.wait()
+                barrier.wait()
+        with task("main"):
+            threads = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(current_tasks(), ["main"])
+        self.assertEqual(seen, { "a" : ["a", "inner"], "b" : ["b", "inner"] })
@@ -1227,3 +1227,90 @@ class TestConditionals(unittest.TestCase):
         assert isinstance(s, SIf)
         assert "let a = 2;" in new_form
         assert "let g = 3;" in new_form
+
+    def test_hash_cons_shares_identical_exps(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        e1 = hash_cons(EBinOp(EBinOp(x, "+", y).with_type(INT), "+", ONE).with_type(INT))
+        e2 = hash_cons(EBinOp(EBinOp(EVar("x").with_type(INT), "+", EVar("y").with_type(INT)).with_type(INT), "+", ENum(1).with_type(INT)).with_type(INT))
+        assert e1 is e2
+        assert e1.size() == EBinOp(EBinOp(x, "+", y), "+", ONE).size()
+        assert hash_cons(e1) is e1
+
+    def test_hash_cons_respects_types(self):
+        e1 = hash_cons(EVar("x").with_type(INT))
+        e2 = hash_cons(EVar("x").with_type(FLOAT))
+        assert e1 is not e2
+        assert e1 == e2
+        assert e1.type == INT
+        assert e2.type == FLOAT
+
+    def test_hash_cons_free_vars(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        body = hash_cons(EBinOp(x, "+", y).with_type(INT))
+        e = EMap(xs, ELambda(x, body)).with_type(INT_BAG)
+        self.assertEqual(list(free_vars(hash_cons(e))), [xs, y])
+        self.assertEqual(list(free_vars(e)), [xs, y])
+        self.assertEqual(list(free_vars(body)), [x, y])
+
+    def test_hash_cons_alpha_equivalence(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        body = hash_cons(EBinOp(x, "+", y).with_type(INT))
+        assert alpha_equivalent(EMap(xs, ELambda(x, body)), EMap(xs, ELambda(x, body)))
+        assert not alpha_equivalent(EMap(xs, ELambda(x, body)), EMap(xs, ELambda(y, body)))
+
+    def test_alpha_hash_respects_alpha_equivalence(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        z = EVar("z").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        e1 = EMap(xs, ELambda(x, EBinOp(x, "+", z).with_type(INT)))
+        e2 = EMap(xs, ELambda(y, EBinOp(y, "+", z).with_type(INT)))
+        assert alpha_equivalent(e1, e2)
+        assert alpha_hash(e1) == alpha_hash(e2)
+        assert Aeq(e1) in set([Aeq(e2)])
+
+    def test_alpha_hash_distinguishes_bound_and_free_vars(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        e1 = EMap(xs, ELambda(x, EBinOp(x, "+", y).with_type(INT)))
+        e2 = EMap(xs, ELambda(x, EBinOp(y, "+", x).with_type(INT)))
+        e3 = EMap(xs, ELambda(y, EBinOp(y, "+", y).with_type(INT)))
+        assert not alpha_equivalent(e1, e2)
+        assert alpha_hash(e1) != alpha_hash(e2)
+        assert alpha_hash(e1) != alpha_hash(e3)
+
+    def test_alpha_hash_nested_binders(self):
+        x = EVar("x").with_type(INT)
+        y = EVar("y").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        def mk(a, b, use):
+            return EFlatMap(xs, ELambda(a, EMap(xs, ELambda(b, use(a, b)).with_type(INT_BAG)))).with_type(INT_BAG)
+        outer = mk(x, y, lambda a, b: EBinOp(a, "+", b).with_type(INT))
+        swapped = mk(y, x, lambda a, b: EBinOp(a, "+", b).with_type(INT))
+        inner = mk(x, y, lambda a, b: EBinOp(b, "+", a).with_type(INT))
+        assert alpha_equivalent(outer, swapped)
+        assert alpha_hash(outer) == alpha_hash(swapped)
+        assert not alpha_equivalent(outer, inner)
+        assert alpha_hash(outer) != alpha_hash(inner)
+
+    def test_hash_cons_unhashable_type(self):
+        t = TEnum(["A", "B"])
+        e = EEq(EEnumEntry("A").with_type(t), EEnumEntry("B").with_type(t)).with_type(BOOL)
+        assert hash_cons(e) == e
+
+    def test_hash_cons_does_not_adopt_input(self):
+        x = EVar("x").with_type(INT)
+        e = EBinOp(x, "+", ONE).with_type(INT)
+        interned = hash_cons(e)
+        assert interned is not e
+        assert not e._interned
+        # the caller may still retype its own expression
+        e.with_type(FLOAT)
+        self.assertEqual(interned.type, INT)
+        assert hash_cons(EBinOp(x, "+", ONE).with_type(INT)) is interned
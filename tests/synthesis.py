@@ -10,7 +10,7 @@ from cozy.evaluation import mkval
 from cozy.cost_model import CostModel
 from cozy.synthesis import construct_initial_implementation, improve_implementation
 from cozy.synthesis.core import improve
-from cozy.synthesis.enumeration import Enumerator, Fingerprint
+from cozy.synthesis.enumeration import Enumerator, Fingerprint, max_shadowed_exps
 from cozy.parse import parse_spec
 from cozy.solver import valid, satisfy
 from cozy.pools import RUNTIME_POOL, STATE_POOL
@@ -77,6 +77,27 @@ class TestSynthesisCore(unittest.TestCase):
         assert retypecheck(spec)
         assert check_discovery(spec=spec, expected=lambda e: (isinstance(e, EMapGet) or isinstance(e, EHasKey)) and isinstance(e.map, EStateVar) and valid(EEq(e, spec)), args=[y], state_vars=[xs])
 
+    def test_improve_closes_abandoned_searches(self):
+        from cozy.synthesis import core
+        searches = []
+        search_for_improvements = core.search_for_improvements
+        def keep_alive(*args, **kwargs):
+            # hold a reference, so abandoned searches are not finalized by
+            # reference counting
+            search = search_for_improvements(*args, **kwargs)
+            searches.append(search)
+            return search
+        xs = EVar("xs").with_type(INT_BAG)
+        y = EVar("y").with_type(INT)
+        spec = EIn(y, EStateVar(xs))
+        assert retypecheck(spec)
+        core.search_for_improvements = keep_alive
+        try:
+            assert check_discovery(spec=spec, expected=lambda e: (isinstance(e, EMapGet) or isinstance(e, EHasKey)) and isinstance(e.map, EStateVar) and valid(EEq(e, spec)), args=[y], state_vars=[xs])
+        finally:
+            core.search_for_improvements = search_for_improvements
+        assert len(searches) > 1
+
     def test_let_discovery(self):
         x = EVar("x").with_type(INT)
         spec = ESum([x, x, x, x])
@@ -107,6 +128,58 @@ class TestSynthesisCore(unittest.TestCase):
             print(info)
         assert len(fingerprint_lens) == 1, fingerprint_lens
 
+    def test_enumerator_add_examples(self):
+        """
+        An enumerator that learns about new examples should behave as if it
+        had known about them from the start.
+        """
+        x = EVar("x").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        ctx = RootCtx(args=(x,), state_vars=(xs,))
+        examples = [{"x":5, "xs":Bag((1, 2))}, {"x":1, "xs":Bag((1,))}]
+        def fingerprints(enumerator, max_size):
+            return set(info.fingerprint
+                for size in range(max_size + 1)
+                for info in enumerator.enumerate_with_info(ctx, size, RUNTIME_POOL))
+        incremental = Enumerator(
+            examples=examples[:1],
+            cost_model=CostModel(),
+            incremental=True)
+        fingerprints(incremental, 2)
+        incremental.add_examples(examples[1:])
+        fresh = Enumerator(
+            examples=examples,
+            cost_model=CostModel())
+        self.assertEqual(fingerprints(incremental, 2), fingerprints(fresh, 2))
+
+    def test_enumerator_add_examples_with_few_shadows(self):
+        """
+        An enumerator that ran out of room for shadowed expressions should
+        still behave as if it had known about new examples from the start.
+        """
+        x = EVar("x").with_type(INT)
+        xs = EVar("xs").with_type(INT_BAG)
+        ctx = RootCtx(args=(x,), state_vars=(xs,))
+        examples = [{"x":5, "xs":Bag((1, 2))}, {"x":1, "xs":Bag((1,))}]
+        def fingerprints(enumerator, max_size):
+            return set(info.fingerprint
+                for size in range(max_size + 1)
+                for info in enumerator.enumerate_with_info(ctx, size, RUNTIME_POOL))
+        with save_property(max_shadowed_exps, "value"):
+            max_shadowed_exps.value = 1
+            incremental = Enumerator(
+                examples=examples[:1],
+                cost_model=CostModel(),
+                incremental=True)
+            fingerprints(incremental, 2)
+            assert incremental.shadows_dropped
+            assert incremental.cache.shadowed_count <= 1
+            incremental.add_examples(examples[1:])
+            fresh = Enumerator(
+                examples=examples,
+                cost_model=CostModel())
+            self.assertEqual(fingerprints(incremental, 2), fingerprints(fresh, 2))
+
 
 class TestEnumeration(unittest.TestCase):
 
@@ -121,6 +194,16 @@ class TestEnumeration(unittest.TestCase):
         self.assertEqual(fp1, fp2)
         self.assertNotEqual(fp1, 1)
 
+    def test_fingerprint_hash_for_equal_to(self):
+        inp = { "x": Bag([1, 2]), "y": Bag([2, 1]) }
+        e1 = EVar("x").with_type(INT_BAG)
+        e2 = EVar("y").with_type(INT_BAG)
+        fp1 = Fingerprint.of(e1, [inp])
+        fp2 = Fingerprint.of(e2, [inp])
+        self.assertNotEqual(fp1, fp2)
+        assert fp1.equal_to(fp2)
+        self.assertEqual(fp1.hash_for_equal_to(), fp2.hash_for_equal_to())
+
     def test_fingerprint_subset(self):
         inp = { "x": Bag([1]) }
         e1 = EVar("x").with_type(INT_BAG)
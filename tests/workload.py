@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+import json
+import os
+
+from cozy.parse import parse_spec
+from cozy.typecheck import typecheck
+from cozy.desugar import desugar
+from cozy.synthesis.impls import construct_initial_implementation
+from cozy.workload import spec_frequencies, read_profile, method_frequencies, workload_file
+
+SPEC = """
+    Counter:
+        state xs : Bag<Int>
+
+        /** How many elements there are. @frequency 500 */
+        query size()
+            len xs
+
+        /** @frequency 20 */
+        op add(x : Int)
+            xs.add(x);
+
+        op remove(x : Int)
+            xs.remove(x);
+"""
+
+class TestWorkload(unittest.TestCase):
+
+    def setUp(self):
+        self.old = workload_file.value
+
+    def tearDown(self):
+        workload_file.value = self.old
+
+    def test_spec_frequencies(self):
+        spec = parse_spec(SPEC)
+        self.assertEqual(spec_frequencies(spec), {"size": 500, "add": 20})
+
+    def test_read_profile(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "profile.json")
+            with open(path, "w") as f:
+                json.dump(["size", "add", "size"], f)
+            self.assertEqual(read_profile(path), {"size": 2, "add": 1})
+            with open(path, "w") as f:
+                json.dump({"size": 7}, f)
+            self.assertEqual(read_profile(path), {"size": 7})
+            with open(path, "w") as f:
+                json.dump({"size": "often"}, f)
+            with self.assertRaises(ValueError):
+                read_profile(path)
+
+    def test_method_frequencies(self):
+        spec = parse_spec(SPEC)
+        errs = typecheck(spec)
+        assert not errs, errs
+        impl = construct_initial_implementation(desugar(spec))
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "profile.json")
+            with open(path, "w") as f:
+                json.dump({"remove": 3}, f)
+            workload_file.value = path
+            freqs = method_frequencies(impl)
+        self.assertEqual(freqs["size"], 500)
+        self.assertEqual(freqs["add"], 20)
+        self.assertEqual(freqs["remove"], 3)
+        # helper queries run as often as the updates that call them
+        helpers = [q.name for q in impl.query_specs if q.name not in ("size", "add", "remove")]
+        assert helpers
+        for q in helpers:
+            assert freqs[q] in (20, 3, 23), (q, freqs[q])